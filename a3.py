@@ -16,20 +16,15 @@ from tkinter import messagebox
 from tkinter import simpledialog
 from tkinter import ttk
 
-import gc
 import os
 import math
 
 from model import TowerGame
-from range_ import AbstractRange, CircularRange, PlusRange, DonutRange
-from tower import SimpleTower, MissileTower, AbstractTower, PulseTower, AbstractObstacle, IceTower
-from typing import Union
-from enemy import SimpleEnemy, AbstractEnemy, AdvanceEnemy
-from utilities import Stepper, rectangles_intersect, get_delta_through_centre
-from utilities import Countdown, euclidean_distance, rotate_toward, angle_between, polar_to_rectangular, \
-    rectangles_intersect
+from tower import SimpleTower, MissileTower, IceTower
+from utilities import Stepper, Countdown
 from view import GameView, TowerView
-from level import AbstractLevel
+from advanced_view import EnemyView
+from levels import BigEnemy, EnergyTower, MyLevel
 from high_score_manager import HighScoreManager
 
 # task 7 sound effect
@@ -41,166 +36,10 @@ HIGHLIGHTED = "#4b3b4a"
 __author__ = "DeShin Li"
 __copyright__ = "44925817"
 
+# renderers for the units introduced by MyLevel
+TowerView.register(EnergyTower, '_draw_simple')
+EnemyView.register(BigEnemy, '_draw_simple')
 
-class BigEnemy(AbstractEnemy):
-    """Enemy that is immune to projectile & explosive damage """
-    name = "Big Enemy"
-    colour = '#0000ff'
-
-    points = 10
-
-    def __init__(self, grid_size=(.4, .4), grid_speed=4/60, health=150):
-        super().__init__(grid_size, grid_speed, health)
-
-    def damage(self, damage, type_):
-        """Inflict damage on the enemy
-
-        Parameters:
-            damage (int): The amount of damage to inflict
-            type_ (str): The type of damage to do i.e. projectile, explosive, energy
-        """
-        if type_ != "projectile" and type_ != "explosive":
-            self.health -= damage
-        if self.health < 0:
-            self.health = 0
-
-    def step(self, data):
-        """Move the enemy forward a single time-step
-
-        Parameters:
-            grid (GridCoordinateTranslator): Grid the enemy is currently on
-            path (Path): The path the enemy is following
-
-        Returns:
-            bool: True iff the new location of the enemy is within the grid
-        """
-        grid = data.grid
-        path = data.path
-
-        # Repeatedly move toward next cell centre as much as possible
-        movement = self.grid_speed
-        while movement > 0:
-            cell_offset = grid.pixel_to_cell_offset(self.position)
-
-            # Assuming cell_offset is along an axis!
-            offset_length = abs(cell_offset[0] + cell_offset[1])
-
-            if offset_length == 0:
-                partial_movement = movement
-            else:
-                partial_movement = min(offset_length, movement)
-
-            cell_position = grid.pixel_to_cell(self.position)
-            delta = path.get_best_delta(cell_position)
-
-            # Ensures enemy will move to the centre before moving toward delta
-            dx, dy = get_delta_through_centre(cell_offset, delta)
-
-            speed = partial_movement * self.cell_size
-            self.move_by((speed * dx, speed * dy))
-            self.position = tuple(int(i) for i in self.position)
-
-            movement -= partial_movement
-
-        intersects = rectangles_intersect(*self.get_bounding_box(), (0, 0), grid.pixels)
-        return intersects or grid.pixel_to_cell(self.position) in path.deltas
-
-class EnergyTower(AbstractTower):
-    """A energy tower that deals energy damage"""
-    name = 'Energy Tower'
-    colour = '#FEC40A'
-
-    range = CircularRange(2)
-    cool_down_steps = 0
-
-    base_cost = 50
-    level_cost = 15
-
-    rotation_threshold = (1 / 6) * math.pi
-
-    def __init__(self, cell_size: int, grid_size=(.7, .7), rotation=math.pi * .25, base_damage=15, level: int = 1):
-        super().__init__(cell_size, grid_size, rotation, base_damage, level)
-
-    def step(self, data):
-        """Rotates toward 'target' and attacks if possible"""
-        self.cool_down.step()
-
-        target = self.get_unit_in_range(data.enemies)
-
-        if target is None:
-            return
-
-        angle = angle_between(self.position, target.position)
-        partial_angle = rotate_toward(self.rotation, angle, self.rotation_threshold)
-        self.rotation = partial_angle
-
-        if partial_angle == angle:
-            target.damage(self.get_damage(), 'energy')
-
-
-# Could be moved to a separate file, perhaps levels/simple.py, and imported
-class MyLevel(AbstractLevel):
-    """A simple game level containing examples of how to generate a wave"""
-    waves = 20
-
-    def get_wave(self, wave):
-        """Returns enemies in the 'wave_n'th wave
-
-        Parameters:
-            wave_n (int): The nth wave
-
-        Return:
-            list[tuple[int, AbstractEnemy]]: A list of (step, enemy) pairs in the
-                                             wave, sorted by step in ascending order 
-        """
-        enemies = []
-
-        if wave == 1:
-            # A hardcoded singleton list of (step, enemy) pairs
-
-            enemies = [(10, SimpleEnemy())]
-        elif wave == 2:
-            # A hardcoded list of multiple (step, enemy) pairs
-
-            enemies = [(10, SimpleEnemy()), (15, SimpleEnemy()), (30, SimpleEnemy())]
-        elif 3 <= wave < 10:
-            # List of (step, enemy) pairs spread across an interval of time (steps)
-
-            steps = int(40 * (wave ** .5))  # The number of steps to spread the enemies across
-            count = wave * 2  # The number of enemies to spread across the (time) steps
-
-            for step in self.generate_intervals(steps, count):
-                enemies.append((step, SimpleEnemy()))
-
-        elif wave == 10:
-            # Generate sub waves
-            sub_waves = [
-                # (steps, number of enemies, enemy constructor, args, kwargs)
-                (50, 10, SimpleEnemy, (), {}),  # 10 enemies over 50 steps
-                (100, None, None, None, None),  # then nothing for 100 steps
-                (50, 10, SimpleEnemy, (), {}),  # then another 10 enemies over 50 steps
-                (50, 5, BigEnemy, (), {}) # enemies that only take energy damage
-            ]
-
-            enemies = self.generate_sub_waves(sub_waves)
-
-        else:  # 11 <= wave <= 20
-            # Now it's going to get hectic
-
-            sub_waves = [
-                (
-                    int(13 * wave),  # total steps
-                    int(25 * wave ** (wave / 50)),  # number of enemies
-                    SimpleEnemy,  # enemy constructor
-                    (),  # positional arguments to provide to enemy constructor
-                    {},  # keyword arguments to provide to enemy constructor
-                ),
-                (50, 1, AdvanceEnemy, (), {}) # advance enemy
-                # ...
-            ]
-            enemies = self.generate_sub_waves(sub_waves)
-
-        return enemies
 
 class StatusBar(tk.Frame):
     """A frame that shows status of the game"""
@@ -232,12 +71,16 @@ class StatusBar(tk.Frame):
         self._lb_lives.image = heart_photo
         self._lb_lives.pack(side=tk.LEFT, expand=True, fill=tk.BOTH, padx=20)
 
-    def set_wave(self, wave):
+    def set_wave(self, wave, pending=0):
         """ Update the wave label
             Parameter: 
                 wave(int): the current wave
+                pending(int): the number of enemies yet to spawn
         """
-        self._lb_wave.config(text=f"Wave: {wave}/20")
+        if pending:
+            self._lb_wave.config(text=f"Wave: {wave}/20 ({pending} incoming)")
+        else:
+            self._lb_wave.config(text=f"Wave: {wave}/20")
 
     def set_score(self, score):
         """ Update the score label
@@ -367,13 +210,20 @@ class TowerGameApp(Stepper):
         # window close
         master.protocol("WM_DELETE_WINDOW", self._exit)
 
-        self._game = game = TowerGame()
-
-        self.setup_menu()
-
         # Add SoundHandler 
         self._sound_handler = SoundHandler()
 
+        self._game = game = TowerGame(sound_sink=self._sound_handler)
+
+        # journal changes to units, so that only units that have changed are redrawn
+        game.enable_journal()
+        self._revision = 0
+
+        # the number of enemies yet to spawn, as last shown on the status bar
+        self._pending = 0
+
+        self.setup_menu()
+
         # if there's no high_scores.json in the current directory, create one and write a empth curly bracket
         if not os.path.exists("high_scores.json"):
             with open('high_scores.json', 'w+') as json_file:
@@ -500,14 +350,10 @@ class TowerGameApp(Stepper):
 
     def update_volume(self, event):
         """Update the sound volume according to the scale bar
-            use gc to get all SoundHandler instance and execute the update_volume method
             Parameter:
                 event (tk.Event): Tkinter mouse event
         """
-        
-        for obj in gc.get_objects():
-            if isinstance(obj, SoundHandler):
-                obj.update_volume(self.scale.get())
+        self._sound_handler.update_volume(self.scale.get())
 
     def coin_sound(self):
         """Coin sound effect"""
@@ -630,6 +476,9 @@ class TowerGameApp(Stepper):
         """start a new game redraw every thing"""
 
         self._setup_game()
+
+        # none of the units drawn for the previous game remain
+        self._view.clear_units()
         self.refresh_view(True)
 
 
@@ -678,12 +527,24 @@ class TowerGameApp(Stepper):
 
     def refresh_view(self, force=False):
         """Refreshes the game view
-            redraw enemies, towers and obstacles
+            redraw enemies, towers and obstacles, skipping any that haven't changed since the last refresh
         """
-        if self._step_number % 2 == 0 or force:
+        changes = self._game.changes_since(self._revision)
+
+        if changes is None or force:
+            kinds = ('enemies', 'towers', 'obstacles')
+        else:
+            kinds = changes.kinds
+
+        if changes is not None:
+            self._revision = changes.revision
+
+        if 'enemies' in kinds:
             self._view.draw_enemies(self._game.enemies)
-        self._view.draw_towers(self._game.towers)
-        self._view.draw_obstacles(self._game.obstacles)
+        if 'towers' in kinds:
+            self._view.draw_towers(self._game.towers)
+        if 'obstacles' in kinds:
+            self._view.draw_obstacles(self._game.obstacles)
 
     def _step(self):
         """
@@ -697,6 +558,11 @@ class TowerGameApp(Stepper):
         self._game.step()
         self.refresh_view()
 
+        pending = self._game.spawn_scheduler.get_pending()
+        if pending != self._pending:
+            self._pending = pending
+            self._statusbar.set_wave(self._wave, pending)
+
         return not self._won
 
     # Task 1.2 (Tower Placement): Complete event handlers here (including docstrings!)
@@ -808,9 +674,6 @@ class TowerGameApp(Stepper):
 
         # Generate wave and enqueue
         wave = self._level.get_wave(self._wave)
-        for step, enemy in wave:
-            enemy.set_cell_size(self._game.grid.cell_size)
-
         self._game.queue_wave(wave)
         self.wave_sound()
 
@@ -964,6 +827,9 @@ class TowerGameApp(Stepper):
             self.current_upgrade_tower.level += 1
             self._upgrade_label.config(text=f"{self.current_upgrade_tower.name} lv.{self.current_upgrade_tower.level}")
 
+        self._game.mark_upgraded(self.current_upgrade_tower)
+        self._game.record_changes()
+
         self._coins -= self.current_upgrade_tower.level_cost
         self.affordable()
         self._upgrade_frame.pack_forget()
@@ -74,24 +74,64 @@ class SimpleView:
     """Single class to manage drawing instances of a variety of (sub)classes on a canvas"""
     draw_methods = sort_draw_methods([])  # list of (class, draw_method) pairs
 
+    # (draw_methods, dict<type: Callable>) draw methods resolved for each concrete class, per view class
+    _draw_cache = None
+
     @classmethod
     def get_draw_method(cls, instance):
         """(Callable) Returns the draw method for instance
-        
-        Draw method is determined by finding first class that instance is an instance of"""
 
-        method = None
+        Draw method is determined by finding first class that instance is an instance of
+        Results are cached by class, until draw_methods is replaced or invalidate_draw_cache is called"""
+        key = instance if isinstance(instance, type) else type(instance)
 
-        for key, method_name in cls.draw_methods:
-            if isinstance(instance, key) or instance == key:
-                method = getattr(cls, method_name)
-                break
+        # the cache belongs to this class alone, & is stale once draw_methods has been replaced
+        cache = cls.__dict__.get('_draw_cache')
+        if cache is None or cache[0] is not cls.draw_methods:
+            cache = cls._draw_cache = (cls.draw_methods, {})
+
+        methods = cache[1]
+        method = methods.get(key)
 
         if method is None:
-            raise KeyError(f"Unable to find draw method for {instance}")
+            for unit_class, method_name in cls.draw_methods:
+                if issubclass(key, unit_class):
+                    method = methods[key] = getattr(cls, method_name)
+                    break
+            else:
+                raise KeyError(f"Unable to find draw method for {instance}")
 
         return method
 
+    @classmethod
+    def invalidate_draw_cache(cls):
+        """Discards the draw methods cached for this class
+
+        Must be called after modifying draw_methods in place (replacing it invalidates the cache automatically)
+        """
+        cls._draw_cache = None
+
+    @classmethod
+    def register(cls, unit_class, method):
+        """Registers a draw method for instances of 'unit_class' & its subclasses (unless they have their own)
+
+        Replaces any draw method previously registered for 'unit_class' on this class
+
+        Parameters:
+            unit_class (type): The class of unit to draw
+            method (str|Callable): The name of a draw method of this class, or a function to add to this
+                                   class as a draw method, accepting (cls, canvas, unit, *args, **kwargs)
+        """
+        if callable(method):
+            name = method.__name__
+            setattr(cls, name, classmethod(method))
+            method = name
+
+        draw_methods = [(key, name) for key, name in cls.draw_methods if key is not unit_class]
+        draw_methods.append((unit_class, method))
+
+        cls.draw_methods = sort_draw_methods(draw_methods)
+
 
 class RangeView(SimpleView):
     """Manages view logic for ranges"""
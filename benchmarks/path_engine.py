@@ -0,0 +1,94 @@
+"""
+Benchmark of path generation, comparing GridPath against the generic Path search
+
+Run from the repository root:
+    python -m benchmarks.path_engine [--sizes 6 50 200 1000] [--reference-limit 200]
+"""
+
+import argparse
+import time
+
+from modules.matrix import get_adjacent_cells
+from path import GridPath, Path
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2018, The University of Queensland"
+__license__ = "MIT"
+
+DEFAULT_SIZES = (6, 25, 50, 100, 200, 500, 1000)
+
+
+def generate_walls(size):
+    """(set<tuple<int, int>>) Returns blocked cells forming a serpentine maze across a square grid
+
+    Every fourth column is a wall, with a gap at alternating ends, so the path from start to end
+    always exists and winds through most of the grid
+
+    Parameters:
+        size (int): The number of cells along each side of the grid
+    """
+    walls = set()
+    for i, column in enumerate(range(2, size - 1, 4)):
+        gap = size - 1 if i % 2 == 0 else 0
+        walls.update((column, row) for row in range(size) if row != gap)
+
+    return walls
+
+
+def create_reference_path(start, end, size, blocked):
+    """(Path) Returns a path found by the generic search, as TowerGame previously generated it"""
+    columns, rows = size
+
+    def get_neighbours(cell, from_=True):  # pylint: disable=unused-argument
+        for node in get_adjacent_cells(cell):
+            if (0 <= node[0] < columns and 0 <= node[1] < rows and node not in blocked) \
+                    or node == start or node == end:
+                yield node
+
+    return Path(start, end, get_neighbours)
+
+
+def time_path(factory, repeats):
+    """(float) Returns the best time, in seconds, of 'repeats' calls to 'factory'"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        factory()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main():  # pylint: disable=cell-var-from-loop
+    """Runs the benchmark and prints a table of results"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="side lengths of the square grids to benchmark")
+    parser.add_argument('--reference-limit', type=int, default=200,
+                        help="largest side length to also time the generic Path search on")
+    parser.add_argument('--repeats', type=int, default=3, help="number of timed runs per grid, best is reported")
+    args = parser.parse_args()
+
+    print(f"{'grid':>11} {'cells':>9} {'GridPath (s)':>13} {'Path (s)':>10} {'speed-up':>9}")
+
+    for size in args.sizes:
+        grid = size, size
+        start, end = (-1, 0), (size, size - 1)
+        walls = generate_walls(size)
+
+        # fewer repeats for large grids, where a single run is already long enough to time
+        repeats = args.repeats if size <= 200 else 1
+
+        grid_time = time_path(lambda: GridPath(start, end, grid, walls), repeats)
+
+        if size <= args.reference_limit:
+            reference_time = time_path(lambda: create_reference_path(start, end, grid, walls), repeats)
+            reference = f"{reference_time:>10.4f} {reference_time / grid_time:>8.1f}x"
+        else:
+            reference = f"{'-':>10} {'-':>9}"
+
+        print(f"{size:>5}x{size:<5} {size * size:>9} {grid_time:>13.4f} {reference}")
+
+
+if __name__ == '__main__':
+    main()
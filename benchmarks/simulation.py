@@ -0,0 +1,217 @@
+"""
+End-to-end benchmark of headless game simulation, across scripted scenarios
+
+Each scenario places towers on a grid, spawns enemies (with enough health to stay in play, &
+respawned whenever they escape, so the number in play stays constant) & steps the game, reporting time-steps per second, the latency of each update & peak memory.
+Results can be saved as JSON, & compared against a saved baseline to catch regressions.
+
+Run from the repository root:
+    python -m benchmarks.simulation [--scenarios NAME ...] [--output results.json]
+                                    [--baseline baseline.json] [--threshold 0.2]
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from enemy import SimpleEnemy
+from level import EnemySpawn
+from levels import EnergyTower
+from model import TowerGame
+from tower import SimpleTower, MissileTower, PulseTower, IceTower
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2018, The University of Queensland"
+__license__ = "MIT"
+
+TOWER_TYPES = (SimpleTower, MissileTower, PulseTower, IceTower, EnergyTower)
+
+# Health of benchmark enemies, high enough that they remain in play for the whole scenario
+ENEMY_HEALTH = 10 ** 9
+
+# (name, grid size, number of enemies, number of towers of each type, number of updates)
+SCENARIOS = (
+    ('grid-6', (6, 6), 10, 1, 400),
+    ('grid-25', (25, 25), 100, 10, 200),
+    ('grid-100', (100, 100), 100, 10, 100),
+    ('enemies-10', (40, 40), 10, 20, 200),
+    ('enemies-100', (40, 40), 100, 20, 200),
+    ('enemies-1000', (40, 40), 1000, 20, 100),
+    ('enemies-10000', (40, 40), 10000, 20, 20),
+    ('towers-0', (60, 60), 500, 0, 100),
+    ('towers-50', (60, 60), 500, 50, 100),
+    ('towers-200', (60, 60), 500, 200, 50),
+)
+
+# Metrics compared against the baseline, & whether higher values are better
+METRICS = {
+    'steps_per_second': True,
+    'p50_ms': False,
+    'p95_ms': False,
+    'p99_ms': False,
+}
+
+
+def create_game(size, enemies, towers, seed=0):
+    """(TowerGame, int) Returns a new game for a scenario, & the number of towers placed
+
+    Towers are placed at random cells, skipping any that would block the path
+
+    Parameters:
+        size (tuple<int, int>): The number of (column, row) cells in the grid
+        enemies (int): The number of enemies to spawn
+        towers (int): The number of towers of each type to place
+        seed (int): Seed for the placement of towers
+    """
+    game = TowerGame(size=size)
+    rng = random.Random(seed)
+
+    cells = [(column, row) for column in range(size[0]) for row in range(size[1])]
+    rng.shuffle(cells)
+
+    placed = 0
+    for tower_type in TOWER_TYPES:
+        count = 0
+        while count < towers and cells:
+            if game.place(cells.pop(), tower_type):
+                count += 1
+        placed += count
+
+    # spawn every enemy within the first few updates
+    enemy = EnemySpawn(SimpleEnemy, kwargs={'health': ENEMY_HEALTH})
+    game.queue_wave([(2 * (i % 5), enemy) for i in range(enemies)])
+
+    # enemies reach the end of short paths well before the end of a scenario, so are respawned
+    game.on('enemy_escape', lambda escaped: game.queue_wave([(0, enemy)] * len(escaped)))
+
+    return game, placed
+
+
+def run_scenario(size, enemies, towers, updates, memory=True):
+    """(dict) Returns the results of running a scenario
+
+    Parameters:
+        size (tuple<int, int>): The number of (column, row) cells in the grid
+        enemies (int): The number of enemies to spawn
+        towers (int): The number of towers of each type to place
+        updates (int): The number of updates (pairs of time-steps) to time
+        memory (bool): Also measures peak memory, in a separate run, iff True
+    """
+    game, placed = create_game(size, enemies, towers)
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(updates):
+        update_start = time.perf_counter()
+        game.step()
+        game.step()
+        latencies.append(time.perf_counter() - update_start)
+    total = time.perf_counter() - start
+
+    # otherwise the scenario timed an empty game
+    assert game.enemies, f"No enemies left in play after {updates} updates"
+
+    percentiles = statistics.quantiles(latencies, n=100, method='inclusive')
+
+    results = {
+        'grid': list(size),
+        'enemies': enemies,
+        'towers': placed,
+        'updates': updates,
+        'steps_per_second': 2 * updates / total,
+        'p50_ms': percentiles[49] * 1000,
+        'p95_ms': percentiles[94] * 1000,
+        'p99_ms': percentiles[98] * 1000,
+    }
+
+    # tracing allocations slows the game considerably, so memory is measured separately
+    if memory:
+        tracemalloc.start()
+        game, _ = create_game(size, enemies, towers)
+        for _ in range(updates):
+            game.step()
+            game.step()
+        results['peak_memory_kb'] = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+
+    return results
+
+
+def compare(results, baseline, threshold):
+    """(list<str>) Returns a description of each metric that regressed from the baseline by more than 'threshold'
+
+    Parameters:
+        results (dict<str: dict>): Results for each scenario, by name
+        baseline (dict<str: dict>): Baseline results for each scenario, by name
+        threshold (float): The proportion by which a metric may worsen before it is a regression
+    """
+    regressions = []
+
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        for metric, higher_is_better in METRICS.items():
+            old, new = baseline[name][metric], result[metric]
+            if higher_is_better:
+                regressed = new < old * (1 - threshold)
+            else:
+                regressed = new > old * (1 + threshold)
+
+            if regressed:
+                regressions.append(f"{name}: {metric} {old:.3f} -> {new:.3f}")
+
+    return regressions
+
+
+def main():
+    """Runs the benchmark, returning the exit status (1 iff there were regressions)"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', nargs='+', choices=[scenario[0] for scenario in SCENARIOS],
+                        help="names of the scenarios to run, defaults to all")
+    parser.add_argument('--output', help="file to save results to, as JSON")
+    parser.add_argument('--baseline', help="file of saved results to compare against")
+    parser.add_argument('--threshold', type=float, default=.2,
+                        help="proportion by which a metric may worsen before it is a regression")
+    parser.add_argument('--no-memory', action='store_true', help="skip measuring peak memory")
+    args = parser.parse_args()
+
+    results = {}
+
+    print(f"{'scenario':<15} {'towers':>7} {'steps/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KiB':>10}")
+
+    for name, size, enemies, towers, updates in SCENARIOS:
+        if args.scenarios and name not in args.scenarios:
+            continue
+
+        result = results[name] = run_scenario(size, enemies, towers, updates, memory=not args.no_memory)
+
+        memory = f"{result['peak_memory_kb']:>10.0f}" if 'peak_memory_kb' in result else f"{'-':>10}"
+        print(f"{name:<15} {result['towers']:>7} {result['steps_per_second']:>10.1f} {result['p50_ms']:>9.2f} "
+              f"{result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} {memory}")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'python': platform.python_version(), 'scenarios': results}, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)['scenarios']
+
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"Regression in {regression}")
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
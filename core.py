@@ -2,15 +2,74 @@
 
 import math
 from abc import ABC
+from functools import lru_cache
+
+from utilities import clip_segment
 
 __author__ = "Benjamin Martin"
 __copyright__ = "Copyright 2018, The University of Queensland"
 __license__ = "MIT"
 __version__ = "1.1.0"
 
+# The maximum number of bucket search orders to remember
+SEARCH_ORDER_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=None)
+def get_slots(cls):
+    """(dict<str: member_descriptor>) Returns the descriptor of every slot of 'cls' & its bases, by name"""
+    slots = {}
+    for base in reversed(cls.__mro__):
+        for name in base.__dict__.get('__slots__', ()):
+            if name not in ('__dict__', '__weakref__'):
+                slots[name] = base.__dict__[name]
+    return slots
+
+
+def get_attributes(obj):
+    """(dict<str: *>) Returns the attributes of 'obj', from both its slots & its instance dictionary, if any
+
+    Slots are read directly, even where a subclass shadows them (e.g. with a property)
+    """
+    attributes = {}
+    for name, slot in get_slots(type(obj)).items():
+        try:
+            attributes[name] = slot.__get__(obj)
+        except AttributeError:
+            pass  # unset
+
+    attributes.update(getattr(obj, '__dict__', ()))
+    return attributes
+
+
+def set_attributes(obj, attributes):
+    """Sets the attributes of 'obj' to those returned by get_attributes"""
+    slots = get_slots(type(obj))
+    for name, value in attributes.items():
+        slot = slots.get(name)
+        if slot is None:
+            obj.__dict__[name] = value
+        else:
+            slot.__set__(obj, value)
+
+
+@lru_cache(maxsize=1024)
+def _get_size(grid_size, cell_size):
+    """(tuple<num, num>) Returns the pixel size of a unit, shared between units of the same size"""
+    return tuple(i * cell_size for i in grid_size)
+
 
 class Unit(ABC):
-    """A basic unit on the game field"""
+    """A basic unit on the game field
+
+    Units use __slots__, as they are created in large numbers; subclasses without their own
+    __slots__ (e.g. towers) have an instance dictionary as usual
+
+    Subclasses with __slots__ declare a slot for position, unless they store it elsewhere
+    (e.g. enemies, in an EnemyTable, through a property)
+    """
+    __slots__ = ('grid_size', 'cell_size', 'size')
+
     name: str
     colour: str
 
@@ -28,7 +87,7 @@ class Unit(ABC):
 
     def set_cell_size(self, cell_size: int):
         """Sets the cell size for this unit to 'cell_size'"""
-        self.size = tuple(i * cell_size for i in self.grid_size)
+        self.size = _get_size(tuple(self.grid_size), cell_size)
         self.cell_size = cell_size
 
     def move_by(self, delta):
@@ -135,15 +194,23 @@ class Point2D:
 
 class BucketManager:
     """Collection of values mapped from two dimensional positions in a grid, the grid
-    divided into multiple buckets (sub-regions)"""
+    divided into multiple buckets (sub-regions)
+
+    Each bucket is a dict of its values (mapped to None), so values are found in the order they
+    were added to their bucket, which is the same from run to run (unlike a set of objects)"""
 
     def __init__(self, max_position, buckets=(10, 10)):
         bucket_size = tuple(int(i / buckets_i + .5) for i, buckets_i in zip(max_position, buckets))
 
         self._max = max_position
-        self._buckets = [[set() for i in range(buckets[1])] for i in range(buckets[0])]
+        self._buckets = [[{} for i in range(buckets[1])] for i in range(buckets[0])]
+        self._bucket_counts = tuple(buckets)
         self._bucket_size = bucket_size
 
+        # search orders are reused by stationary searchers (i.e. towers), so are cached,
+        # keyed by either (centre index, index bounds) or (position, radius)
+        self._search_orders = {}
+
     def clear(self):
         """Removes all value & position mappings"""
         for column in self._buckets:
@@ -156,7 +223,9 @@ class BucketManager:
         Parameters:
             position (tuple<int, int>): The position in the grid
         """
-        return tuple(int(i // i_bucket_size) for i, i_bucket_size in zip(position, self._bucket_size))
+        x, y = position
+        width, height = self._bucket_size
+        return int(x // width), int(y // height)
 
     def add(self, position, value):
         """(tuple<int, int>) Adds 'value' at 'position'
@@ -166,7 +235,42 @@ class BucketManager:
             value (*): The value to add
         """
         x_i, y_i = self.position_to_index(position)
-        self._buckets[x_i][y_i].add(value)
+        self._buckets[x_i][y_i][value] = None
+
+    def remove(self, position, value):
+        """Removes 'value' from 'position'
+
+        Parameters:
+            position (tuple<int, int>): The position in the grid that 'value' was added at
+            value (*): The value to remove
+
+        Raises:
+            KeyError if 'value' is not at 'position'
+        """
+        x_i, y_i = self.position_to_index(position)
+        del self._buckets[x_i][y_i][value]
+
+    def move(self, value, old_position, new_position):
+        """Moves 'value' from 'old_position' to 'new_position'
+
+        The value is only re-bucketed if the positions lie in different buckets
+
+        Parameters:
+            value (*): The value to move
+            old_position (tuple<int, int>): The position in the grid that 'value' was added at
+            new_position (tuple<int, int>): The position in the grid to move 'value' to
+        """
+        old_index = self.position_to_index(old_position)
+        new_index = self.position_to_index(new_position)
+
+        if old_index == new_index:
+            return
+
+        x_i, y_i = old_index
+        del self._buckets[x_i][y_i][value]
+
+        x_i, y_i = new_index
+        self._buckets[x_i][y_i][value] = None
 
     def get_bucket_for_position(self, position):
         """(tuple<int, int>) Returns the bucket corresponding to 'position'
@@ -177,7 +281,216 @@ class BucketManager:
         x_i, y_i = self.position_to_index(position)
         return self._buckets[x_i][y_i]
 
-        # def get_nearby_buckets(self):
+    def _clamp_index(self, index):
+        """(tuple<int, int>) Returns 'index', moved to the nearest bucket if it lies outside the grid"""
+        x_i, y_i = index
+        columns, rows = self._bucket_counts
+        return min(max(x_i, 0), columns - 1), min(max(y_i, 0), rows - 1)
+
+    def _get_index_bounds(self, box):
+        """Returns the inclusive range of bucket indices overlapped by 'box', as a pair of
+        ((min_column, min_row), (max_column, max_row)) index pairs, else None if 'box' lies
+        entirely outside the grid
+
+        Parameters:
+            box (tuple<tuple<num, num>, tuple<num, num>>): The ((left, top), (right, bottom)) box
+        """
+        top_left, bottom_right = box
+
+        lower = self.position_to_index(top_left)
+        upper = self.position_to_index(bottom_right)
+
+        for low, high, count in zip(lower, upper, self._bucket_counts):
+            if high < 0 or low >= count:
+                return None
+
+        return self._clamp_index(lower), self._clamp_index(upper)
+
+    def _get_ring_indices(self, centre, bounds):
+        """Yields bucket indices in square rings of increasing distance from 'centre',
+        restricted to those within 'bounds'
+
+        Parameters:
+            centre (tuple<int, int>): The (column, row) index of the bucket to search outwards from
+            bounds (tuple<tuple<int, int>, tuple<int, int>>): Inclusive bucket index range,
+                                                              as returned by _get_index_bounds
+        """
+        (x_min, y_min), (x_max, y_max) = bounds
+        x_c, y_c = centre
+
+        # centre must lie within the bounds for the rings to cover them
+        x_c = min(max(x_c, x_min), x_max)
+        y_c = min(max(y_c, y_min), y_max)
+
+        yield x_c, y_c
+
+        rings = max(x_c - x_min, x_max - x_c, y_c - y_min, y_max - y_c)
+        for ring in range(1, rings + 1):
+            left, right = max(x_c - ring, x_min), min(x_c + ring, x_max)
+
+            # top & bottom edges of the ring, including corners
+            for y_i in (y_c - ring, y_c + ring):
+                if y_min <= y_i <= y_max:
+                    for x_i in range(left, right + 1):
+                        yield x_i, y_i
+
+            # left & right edges of the ring, excluding corners
+            top, bottom = max(y_c - ring + 1, y_min), min(y_c + ring - 1, y_max)
+            for x_i in (x_c - ring, x_c + ring):
+                if x_min <= x_i <= x_max:
+                    for y_i in range(top, bottom + 1):
+                        yield x_i, y_i
+
+    def _get_search_order(self, centre, bounds):
+        """(tuple<dict>) Returns the buckets within 'bounds', nearest to 'centre' first
+
+        Parameters:
+            centre (tuple<int, int>): The (column, row) index of the bucket to search outwards from
+            bounds (tuple<tuple<int, int>, tuple<int, int>>): Inclusive bucket index range
+        """
+        key = centre, bounds
+        order = self._search_orders.get(key)
+
+        if order is None:
+            if len(self._search_orders) >= SEARCH_ORDER_CACHE_SIZE:
+                self._search_orders.clear()
+
+            order = self._search_orders[key] = tuple(self._buckets[x_i][y_i]
+                                                     for x_i, y_i in self._get_ring_indices(centre, bounds))
+
+        return order
+
+    def get_buckets_in_box(self, box, centre=None):
+        """(tuple<dict>) Returns every bucket that overlaps 'box', nearest to 'centre' first
+
+        Parameters:
+            box (tuple<tuple<num, num>, tuple<num, num>>): The ((left, top), (right, bottom)) box
+            centre (tuple<num, num>): The position to search outwards from,
+                                      defaults to the centre of 'box'
+        """
+        bounds = self._get_index_bounds(box)
+        if bounds is None:
+            return ()
+
+        if centre is None:
+            (left, top), (right, bottom) = box
+            centre = (left + right) / 2, (top + bottom) / 2
+
+        return self._get_search_order(self.position_to_index(centre), bounds)
+
+    def get_buckets_in_radius(self, position, radius):
+        """(tuple<dict>) Returns every bucket that could contain a position within 'radius' of
+        'position', nearest first
+
+        Parameters:
+            position (tuple<num, num>): The centre of the search
+            radius (num): The maximum distance from 'position' along either axis
+        """
+        key = position, radius
+        order = self._search_orders.get(key)
+
+        if order is None:
+            x, y = position
+            box = (x - radius, y - radius), (x + radius, y + radius)
+            order = self.get_buckets_in_box(box, centre=position)
+
+            if len(self._search_orders) >= SEARCH_ORDER_CACHE_SIZE:
+                self._search_orders.clear()
+            self._search_orders[key] = order
+
+        return order
+
+    def get_buckets_on_segment(self, start, end, thickness=0):
+        """(list<dict>) Returns every bucket that could contain a position within 'thickness' of the
+        segment from 'start' to 'end' (along either axis), in order along the segment
+
+        The buckets crossed by the segment are found by traversing the grid of buckets (DDA), so
+        the cost is proportional to the number of buckets crossed, rather than the segment's length
+
+        Parameters:
+            start (tuple<num, num>): The start position of the segment
+            end (tuple<num, num>): The end position of the segment
+            thickness (num): The distance from the segment to include buckets within
+        """
+        width, height = self._bucket_size
+        columns, rows = self._bucket_counts
+        max_x, max_y = self._max
+
+        # only the part of the segment within (thickness of) the grid is traversed
+        clipped = clip_segment(start, end, (-thickness, -thickness), (max_x + thickness, max_y + thickness))
+        if clipped is None:
+            return []
+
+        (x, y), (end_x, end_y) = start, end
+        dx, dy = end_x - x, end_y - y
+        t_start, t_end = clipped
+
+        x_i, y_i = self.position_to_index((x + t_start * dx, y + t_start * dy))
+
+        # the value of t at which the segment next crosses a column/row boundary, & the change in t between boundaries
+        if dx:
+            step_x = 1 if dx > 0 else -1
+            next_x = ((x_i + (step_x > 0)) * width - x) / dx
+            delta_x = width / abs(dx)
+        else:
+            step_x, next_x, delta_x = 0, math.inf, math.inf
+
+        if dy:
+            step_y = 1 if dy > 0 else -1
+            next_y = ((y_i + (step_y > 0)) * height - y) / dy
+            delta_y = height / abs(dy)
+        else:
+            step_y, next_y, delta_y = 0, math.inf, math.inf
+
+        indices = [(x_i, y_i)]
+        while min(next_x, next_y) <= t_end:
+            if next_x < next_y:
+                x_i += step_x
+                next_x += delta_x
+            else:
+                y_i += step_y
+                next_y += delta_y
+            indices.append((x_i, y_i))
+
+        # include the buckets within thickness of those crossed
+        x_range = range(-math.ceil(thickness / width), math.ceil(thickness / width) + 1)
+        y_range = range(-math.ceil(thickness / height), math.ceil(thickness / height) + 1)
+
+        buckets = {}
+        for x_i, y_i in indices:
+            for x_j in x_range:
+                for y_j in y_range:
+                    index = x_i + x_j, y_i + y_j
+                    if index not in buckets and 0 <= index[0] < columns and 0 <= index[1] < rows:
+                        buckets[index] = self._buckets[index[0]][index[1]]
+
+        return list(buckets.values())
+
+    def query_aabb(self, box):
+        """Yields values in every bucket that overlaps 'box', nearest to its centre first
+
+        Values are candidates only; their positions may lie outside of 'box'
+
+        Parameters:
+            box (tuple<tuple<num, num>, tuple<num, num>>): The ((left, top), (right, bottom)) box
+        """
+        for bucket in self.get_buckets_in_box(box):
+            if bucket:
+                yield from bucket
+
+    def query_radius(self, position, radius):
+        """Yields values in every bucket that could contain a position within 'radius' of
+        'position', nearest first
+
+        Values are candidates only; their positions may lie further than 'radius' away
+
+        Parameters:
+            position (tuple<num, num>): The centre of the search
+            radius (num): The maximum distance from 'position' along either axis
+        """
+        for bucket in self.get_buckets_in_radius(position, radius):
+            if bucket:
+                yield from bucket
 
     def get_closish(self, position, nearby_buckets=None):
         """Yields positions, roughly prioritised by proximity to 'position'"""
@@ -186,25 +499,205 @@ class BucketManager:
 
 class UnitManager(BucketManager):
     """Collection of Units mapped from their two dimensional positions in a grid, the grid
-    divided into multiple buckets (sub-regions)"""
+    divided into multiple buckets (sub-regions)
+
+    The position each unit was last indexed at is remembered, so units can be updated in-place
+    as they move, and are only re-bucketed when they cross a bucket boundary"""
+
+    def __init__(self, max_position, buckets=(10, 10), cell_size=None):
+        """Constructor
+
+        Parameters:
+            max_position (tuple<int, int>): The (width, height) of the grid, in pixels
+            buckets (tuple<int, int>): The number of (column, row) buckets to divide the grid into
+            cell_size (int): If provided, units are also mapped from the grid cell they occupy,
+                             where each cell is cell_size pixels wide & high
+        """
+        super().__init__(max_position, buckets=buckets)
+
+        self._positions = {}  # unit: position it was indexed at
+        self._cell_size = cell_size
+        self._cells = {}  # cell: dict of units (mapped to None), in the order they entered the cell
+
+        self._boxes = {}  # unit: (left, top, right, bottom) bounding box at the position it was indexed at
+        self._extent = 0  # the greatest distance from any unit's position to the edge of its bounding box
+
+    def __contains__(self, unit):
+        """(bool) Returns True iff 'unit' is in this UnitManager"""
+        return unit in self._positions
+
+    def __len__(self):
+        """(int) Returns the number of units in this UnitManager"""
+        return len(self._positions)
+
+    def clear(self):
+        """Removes all units"""
+        super().clear()
+        self._positions.clear()
+        self._cells.clear()
+        self._boxes.clear()
+        self._extent = 0
+
+    def _position_to_cell(self, position):
+        """(tuple<int, int>) Returns the grid cell that contains 'position'"""
+        return tuple(int(i // self._cell_size) for i in position)
 
     def add_unit(self, unit: Unit):
         """Adds 'unit' to this UnitManager"""
-        self.add(unit.position, unit)
+        position = unit.position
+
+        self.add(position, unit)
+        self._positions[unit] = position
+
+        if unit.size is not None:
+            width, height = unit.size
+            self._extent = max(self._extent, width - width // 2, height - height // 2)
+
+        if self._cell_size is not None:
+            self._cells.setdefault(self._position_to_cell(position), {})[unit] = None
+
+    def remove_unit(self, unit: Unit):
+        """Removes 'unit' from this UnitManager
+
+        Raises:
+            KeyError if 'unit' is not in this UnitManager
+        """
+        position = self._positions.pop(unit)
+        self._boxes.pop(unit, None)
+
+        self.remove(position, unit)
+
+        if self._cell_size is not None:
+            cell = self._position_to_cell(position)
+            units = self._cells[cell]
+            del units[unit]
+            if not units:
+                del self._cells[cell]
+
+    def update_unit(self, unit: Unit):
+        """Updates the position of 'unit' to its current position, adding it if it does not
+        already exist in this UnitManager
+
+        Returns:
+            bool: True iff 'unit' was added or moved
+        """
+        old_position = self._positions.get(unit)
+
+        if old_position is None:
+            self.add_unit(unit)
+            return True
+
+        new_position = unit.position
+        if old_position == new_position:
+            return False
+
+        self.move(unit, old_position, new_position)
+        self._positions[unit] = new_position
+        self._boxes.pop(unit, None)
+
+        if self._cell_size is not None:
+            old_cell = self._position_to_cell(old_position)
+            new_cell = self._position_to_cell(new_position)
+
+            if old_cell != new_cell:
+                units = self._cells[old_cell]
+                del units[unit]
+                if not units:
+                    del self._cells[old_cell]
+
+                self._cells.setdefault(new_cell, {})[unit] = None
+
+        return True
+
+    def get_order(self):
+        """(tuple<list<Unit>, list<Unit>>) Returns the units in the order they are found in their
+        buckets, & in their cells (empty if cells aren't mapped), to be reinstated by set_order
+        """
+        buckets = [unit for column in self._buckets for bucket in column for unit in bucket]
+        cells = [unit for units in self._cells.values() for unit in units]
+        return buckets, cells
+
+    def set_order(self, buckets, cells):
+        """Reorders the units within their buckets & cells, so they are found in the same order as
+        when get_order returned 'buckets' & 'cells' (e.g. when restoring a game)
+
+        Parameters:
+            buckets (list<Unit>): Every unit in this UnitManager, in bucket order
+            cells (list<Unit>): Every unit in this UnitManager in cell order, if cells are mapped
+        """
+        BucketManager.clear(self)
+        for unit in buckets:
+            self.add(self._positions[unit], unit)
+
+        if self._cell_size is not None:
+            self._cells.clear()
+            for unit in cells:
+                self._cells.setdefault(self._position_to_cell(self._positions[unit]), {})[unit] = None
+
+    def get_units_in_cell(self, cell):
+        """(iter<Unit>) Returns the units occupying 'cell', in the order they entered it
+
+        Requires this UnitManager to have been constructed with a cell_size.
+        The result must not be modified.
+
+        Parameters:
+            cell (tuple<int, int>): The (column, row) position of the cell
+        """
+        return self._cells.get(cell, {}).keys()
+
+    def query_segment(self, start, end, thickness=0):
+        """(list<tuple<Unit, tuple<num, num, num, num>>>) Returns (unit, box) pairs for every unit
+        whose bounding box could lie within 'thickness' of the segment from 'start' to 'end'
+        (along either axis), in order along the segment
+
+        Units are candidates only; boxes are the (left, top, right, bottom) bounding boxes of the
+        units at the positions they were indexed at, for callers to test exactly
+
+        Parameters:
+            start (tuple<num, num>): The start position of the segment
+            end (tuple<num, num>): The end position of the segment
+            thickness (num): The distance from the segment to include units within
+        """
+        boxes = self._boxes
+        candidates = []
+
+        for bucket in self.get_buckets_on_segment(start, end, thickness + self._extent):
+            for unit in bucket:
+                box = boxes.get(unit)
+                if box is None:
+                    x, y = self._positions[unit]
+                    width, height = unit.size
+                    left, top = x - width // 2, y - height // 2
+                    box = boxes[unit] = left, top, left + width, top + height
+
+                candidates.append((unit, box))
+
+        return candidates
 
     def get_closish(self, position, nearby_buckets=None):
-        """Yields positions, roughly prioritised by proximity to 'position'"""
-        # naive implementation, performance could be improved by searching outwards from nearby buckets
+        """Yields units, roughly prioritised by proximity to 'position'
 
-        # if nearby_buckets is None:
-        #     nearby_buckets = {(0, 0)}
+        Buckets are searched outwards from the bucket containing 'position', in square rings
 
-        # x_i, y_i = self.position_to_index(position)
+        Parameters:
+            position (tuple<num, num>): The position to search outwards from
+            nearby_buckets (iter<tuple<int, int>>): If provided, only the buckets offset from the
+                                                    bucket containing 'position' by these
+                                                    (column, row) deltas are searched, in order
+        """
+        x_i, y_i = self._clamp_index(self.position_to_index(position))
 
-        for column in self._buckets:
-            for values in column:
-                for value in values:
-                    yield value
+        if nearby_buckets is None:
+            bounds = (0, 0), tuple(count - 1 for count in self._bucket_counts)
+            buckets = self._get_search_order((x_i, y_i), bounds)
+        else:
+            columns, rows = self._bucket_counts
+            buckets = (self._buckets[x_i + dx][y_i + dy] for dx, dy in nearby_buckets
+                       if 0 <= x_i + dx < columns and 0 <= y_i + dy < rows)
+
+        for bucket in buckets:
+            if bucket:
+                yield from bucket
 
 
 class GameData:
@@ -212,7 +705,9 @@ class GameData:
     modelling class directly"""
 
     enemies = None
+    enemy_table = None
     obstacles = None
     towers = None
+    targets = None  # dict<AbstractTower, list<AbstractEnemy>> of enemies in range of each tower
     grid = None
     path = None
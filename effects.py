@@ -0,0 +1,214 @@
+"""
+Status effects applied to enemies by towers (e.g. slowing them) for a limited time
+
+Effects are keyed by (source, enemy), so re-applying an effect is O(1), and are expired by a
+binary heap of their end time-steps. An enemy's speed is recomputed from its base speed only
+when the effects on it change, so speeds don't drift as effects come & go.
+"""
+
+import heapq
+from itertools import count
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2018, The University of Queensland"
+__license__ = "MIT"
+__version__ = "1.1.0"
+
+
+class StatusEffect:
+    """A kind of effect that can be applied to enemies
+
+    Effects of the same class don't stack; only the strongest applies to each enemy
+    """
+    name = "Effect"
+
+    speed_multiplier = 1  # The factor an enemy's speed is multiplied by while affected
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(speed_multiplier={self.speed_multiplier})"
+
+    def applies_to(self, enemy):
+        """(bool) Returns True iff this effect can be applied to 'enemy'"""
+        return True
+
+
+class Slow(StatusEffect):
+    """Slows enemies, unless they are immune to slowing"""
+    name = "Slow"
+
+    def __init__(self, speed_multiplier=.5):
+        """
+        Parameters:
+            speed_multiplier (float): The factor an enemy's speed is multiplied by while slowed
+        """
+        self.speed_multiplier = speed_multiplier
+
+    def applies_to(self, enemy):
+        """(bool) Returns True iff this effect can be applied to 'enemy'"""
+        return not enemy.immune_slow
+
+
+class EffectManager:
+    """Manages the status effects applied to enemies by sources (e.g. towers)
+
+    Each source can apply one effect to each enemy at a time, lasting until a given time-step
+    """
+
+    def __init__(self):
+        self.time = 0  # The current time-step
+
+        self._effects = {}  # (source, enemy): [effect, end time-step]
+        self._enemy_effects = {}  # enemy: {source: effect}
+        self._source_enemies = {}  # source: set of enemies affected by the source
+        self._base_speeds = {}  # enemy: grid speed of the enemy, unaffected by effects
+
+        # heap of (end, sequence, source, enemy), with at most one live entry for each (source, enemy)
+        # effects that are extended are rescheduled lazily, once their entry is reached, while effects
+        # that are shortened (i.e. replaced) get a new entry, leaving the old one stale
+        self._expiries = []
+        self._scheduled = {}  # (source, enemy): (end, sequence) of its live entry
+        self._sequence = count()
+
+    def __len__(self):
+        """(int) Returns the number of effects applied"""
+        return len(self._effects)
+
+    def apply(self, source, enemy, effect: StatusEffect, duration):
+        """Applies 'effect' to 'enemy' from 'source', replacing any effect already applied by 'source'
+
+        Parameters:
+            source (*): The source of the effect (e.g. a tower)
+            enemy (AbstractEnemy): The enemy to apply the effect to
+            effect (StatusEffect): The effect to apply
+            duration (int): The number of time-steps after the current one that the effect lasts for
+
+        Returns:
+            bool: True iff the effect was applied (see StatusEffect.applies_to)
+        """
+        if not effect.applies_to(enemy):
+            return False
+
+        key = source, enemy
+        end = self.time + duration
+
+        applied = self._effects.get(key)
+        if applied is not None and applied[0] is effect:
+            applied[1] = end
+        else:
+            self._effects[key] = [effect, end]
+            self._enemy_effects.setdefault(enemy, {})[source] = effect
+            self._source_enemies.setdefault(source, set()).add(enemy)
+            self._update(enemy)
+
+        scheduled = self._scheduled.get(key)
+        if scheduled is None or end < scheduled[0]:
+            self._schedule(source, enemy, end)
+
+        return True
+
+    def _schedule(self, source, enemy, end):
+        """Pushes the live expiry entry of the effect applied to 'enemy' by 'source'"""
+        sequence = next(self._sequence)
+        self._scheduled[source, enemy] = end, sequence
+        heapq.heappush(self._expiries, (end, sequence, source, enemy))
+
+    def advance(self, step):
+        """Sets the current time-step to 'step', removing every effect that ended before it
+
+        Parameters:
+            step (int): The current time-step
+        """
+        self.time = step
+
+        expiries = self._expiries
+        while expiries and expiries[0][0] < step:
+            _, sequence, source, enemy = heapq.heappop(expiries)
+            key = source, enemy
+
+            # stale, as a shorter effect has been applied since it was pushed
+            scheduled = self._scheduled.get(key)
+            if scheduled is None or scheduled[1] != sequence:
+                continue
+            del self._scheduled[key]
+
+            applied = self._effects.get(key)
+            if applied is None:
+                continue
+
+            # the effect has been re-applied since it was scheduled
+            if applied[1] >= step:
+                self._schedule(source, enemy, applied[1])
+                continue
+
+            self._remove(source, enemy)
+
+    def _remove(self, source, enemy):
+        """Removes the effect applied to 'enemy' by 'source'"""
+        del self._effects[source, enemy]
+
+        effects = self._enemy_effects[enemy]
+        del effects[source]
+        if not effects:
+            del self._enemy_effects[enemy]
+
+        enemies = self._source_enemies[source]
+        enemies.discard(enemy)
+        if not enemies:
+            del self._source_enemies[source]
+
+        self._update(enemy)
+
+    def _update(self, enemy):
+        """Recomputes the speed of 'enemy' from its base speed & the effects applied to it"""
+        effects = self._enemy_effects.get(enemy)
+
+        if not effects:
+            base_speed = self._base_speeds.pop(enemy, None)
+            if base_speed is not None:
+                enemy.grid_speed = base_speed
+                enemy.if_slowed = False
+            return
+
+        base_speed = self._base_speeds.get(enemy)
+        if base_speed is None:
+            base_speed = self._base_speeds[enemy] = enemy.grid_speed
+
+        # only the strongest effect of each class applies
+        multipliers = {}
+        for effect in effects.values():
+            kind = type(effect)
+            multipliers[kind] = min(multipliers.get(kind, 1), effect.speed_multiplier)
+
+        multiplier = 1
+        for kind_multiplier in multipliers.values():
+            multiplier *= kind_multiplier
+
+        enemy.grid_speed = base_speed * multiplier
+        enemy.if_slowed = multiplier < 1
+
+    def remove_enemy(self, enemy):
+        """Removes every effect applied to 'enemy' (e.g. once it has left the game), restoring its speed"""
+        for source in self._enemy_effects.get(enemy, {}).copy():
+            self._remove(source, enemy)
+
+    def remove_source(self, source):
+        """Removes every effect applied by 'source' (e.g. once it has been removed from the game)"""
+        for enemy in self._source_enemies.get(source, set()).copy():
+            self._remove(source, enemy)
+
+    def clear(self):
+        """Removes every effect, restoring the speeds of the enemies affected"""
+        for enemy in list(self._enemy_effects):
+            self.remove_enemy(enemy)
+
+        self._expiries = []
+        self._scheduled.clear()
+
+    def get_effects(self):
+        """(list<tuple<*, AbstractEnemy, StatusEffect, int>>) Returns (source, enemy, effect, end)
+        for every effect applied, where end is the last time-step the effect lasts for"""
+        return [(source, enemy, effect, end) for (source, enemy), (effect, end) in self._effects.items()]
+
+    def get_base_speed(self, enemy):
+        """(float) Returns the grid speed of 'enemy', unaffected by effects"""
+        return self._base_speeds.get(enemy, enemy.grid_speed)
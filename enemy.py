@@ -3,7 +3,9 @@
 All enemies should inherit from AbstractEnemy (either directly or from one of its subclasses)
 """
 
-from core import Unit
+from array import array
+
+from core import Unit, get_attributes, set_attributes
 from utilities import rectangles_intersect, get_delta_through_centre
 
 __author__ = "Benjamin Martin and Brae Webb"
@@ -13,8 +15,13 @@ __version__ = "1.1.0"
 
 
 class AbstractEnemy(Unit):
-    """An enemy for the towers to defend against"""
-    speed = None
+    """An enemy for the towers to defend against
+
+    While in play, an enemy's state is stored in a row of an EnemyTable, and the enemy acts
+    as a handle to that row. Otherwise, state is stored on the enemy itself.
+    """
+    __slots__ = ('speed', 'immune_slow', '_table', '_row',
+                 '_position', '_health', '_max_health', '_grid_speed', '_if_slowed')
 
     # Must be overridden/implemented!
     name: str
@@ -31,6 +38,10 @@ class AbstractEnemy(Unit):
             grid_speed (float): The relative speed within a grid cell
             health (int): The maximum health of the enemy
         """
+        self._table = None  # The EnemyTable storing this enemy's state, else None
+        self._row = None  # The row of _table storing this enemy's state
+
+        self.speed = None
         self.grid_speed = grid_speed
         self.health = self.max_health = health
 
@@ -40,6 +51,113 @@ class AbstractEnemy(Unit):
 
         super().__init__(None, grid_size, 0)  # allow enemy's to be position- & sizeless initially
 
+    # state that is stored in a row of an EnemyTable while in play
+    _TABLE_FIELDS = ('position', 'health', 'max_health', 'grid_speed', 'if_slowed')
+
+    def __getstate__(self):
+        """(dict) Returns the state of this enemy, detached from any EnemyTable"""
+        state = get_attributes(self)
+        state.pop('_table', None)
+        state.pop('_row', None)
+
+        for name in self._TABLE_FIELDS:
+            state['_' + name] = getattr(self, name)
+
+        return state
+
+    def __setstate__(self, state):
+        """Sets the state of this enemy, which is detached from any EnemyTable, to 'state'"""
+        self._table = self._row = None
+        set_attributes(self, state)
+
+    @property
+    def position(self):
+        """(tuple<int, int>) The (x, y) pixel position of this enemy, else None if it has no position"""
+        table = self._table
+        if table is None:
+            return self._position
+
+        row = self._row
+        return table.x[row], table.y[row]
+
+    @position.setter
+    def position(self, position):
+        table = self._table
+        if table is None:
+            self._position = position
+            return
+
+        x, y = position
+        row = self._row
+        table.x[row] = int(x)
+        table.y[row] = int(y)
+
+    @property
+    def health(self):
+        """(num) The current health of this enemy"""
+        table = self._table
+        if table is None:
+            return self._health
+        return table.health[self._row]
+
+    @health.setter
+    def health(self, health):
+        table = self._table
+        if table is None:
+            self._health = health
+        else:
+            table.health[self._row] = health
+            if table.damaged is not None:
+                table.damaged.add(self)
+
+    @property
+    def max_health(self):
+        """(num) The maximum health of this enemy"""
+        table = self._table
+        if table is None:
+            return self._max_health
+        return table.max_health[self._row]
+
+    @max_health.setter
+    def max_health(self, max_health):
+        table = self._table
+        if table is None:
+            self._max_health = max_health
+        else:
+            table.max_health[self._row] = max_health
+
+    @property
+    def grid_speed(self):
+        """(float) The relative speed of this enemy within a grid cell"""
+        table = self._table
+        if table is None:
+            return self._grid_speed
+        return table.speed[self._row]
+
+    @grid_speed.setter
+    def grid_speed(self, grid_speed):
+        table = self._table
+        if table is None:
+            self._grid_speed = grid_speed
+        else:
+            table.speed[self._row] = grid_speed
+
+    @property
+    def if_slowed(self):
+        """(bool) True iff this enemy has been slowed by an ice tower"""
+        table = self._table
+        if table is None:
+            return self._if_slowed
+        return bool(table.slowed[self._row])
+
+    @if_slowed.setter
+    def if_slowed(self, if_slowed):
+        table = self._table
+        if table is None:
+            self._if_slowed = if_slowed
+        else:
+            table.slowed[self._row] = bool(if_slowed)
+
     def set_cell_size(self, cell_size: int):
         """Sets the cell size for this unit to 'cell_size'"""
         super().set_cell_size(cell_size)
@@ -63,8 +181,147 @@ class AbstractEnemy(Unit):
         raise NotImplementedError("damage method must be implemented by subclass")
 
 
+class EnemyTable:
+    """Struct-of-arrays storage for the state of enemies in play
+
+    Each enemy added to the table occupies a row across a number of contiguous, typed columns:
+        x, y (int32): The pixel position of the enemy
+        health, max_health (float64): The current & maximum health of the enemy
+        speed (float64): The relative speed of the enemy within a grid cell
+        slowed (uint8): 1 iff the enemy has been slowed, else 0
+        type_id (uint16): Identifies the class of the enemy (see get_type)
+
+    Rows are kept dense; only the first len(table) rows of each column are in use.
+    Columns support the buffer protocol, so can be read in bulk without copying
+    (i.e. via memoryview).
+    """
+    COLUMNS = (
+        ('x', 'i'),
+        ('y', 'i'),
+        ('health', 'd'),
+        ('max_health', 'd'),
+        ('speed', 'd'),
+        ('slowed', 'B'),
+        ('type_id', 'H'),
+    )
+
+    def __init__(self, capacity=64):
+        """Constructor
+
+        Parameters:
+            capacity (int): The number of rows to initially allocate
+        """
+        self._size = 0
+        self._capacity = capacity
+
+        for name, typecode in self.COLUMNS:
+            setattr(self, name, array(typecode, [0]) * capacity)
+
+        self.enemies = []  # The enemy occupying each row
+        self._types = []
+        self._type_ids = {}
+
+        self.damaged = None  # set of enemies whose health changed, if tracked (see TowerGame.record_changes)
+
+    def __len__(self):
+        """(int) Returns the number of enemies in this table"""
+        return self._size
+
+    def __contains__(self, enemy):
+        """(bool) Returns True iff 'enemy' is a handle to a row of this table"""
+        return getattr(enemy, '_table', None) is self
+
+    def _grow(self):
+        """Doubles the number of allocated rows"""
+        extra = self._capacity
+
+        for name, typecode in self.COLUMNS:
+            getattr(self, name).extend(array(typecode, [0]) * extra)
+
+        self._capacity += extra
+
+    def get_type_id(self, enemy_class):
+        """(int) Returns the type id of 'enemy_class', allocating a new one if necessary"""
+        type_id = self._type_ids.get(enemy_class)
+
+        if type_id is None:
+            type_id = self._type_ids[enemy_class] = len(self._types)
+            self._types.append(enemy_class)
+
+        return type_id
+
+    def get_type(self, type_id):
+        """(Class<AbstractEnemy>) Returns the enemy class corresponding to 'type_id'"""
+        return self._types[type_id]
+
+    def add(self, enemy: AbstractEnemy):
+        """Moves the state of 'enemy' into a new row, making 'enemy' a handle to it
+
+        Precondition:
+            'enemy' has a position & is not already in a table
+        """
+        # pylint: disable=protected-access
+        if self._size == self._capacity:
+            self._grow()
+
+        row = self._size
+        x, y = enemy.position
+
+        self.x[row] = int(x)
+        self.y[row] = int(y)
+        self.health[row] = enemy.health
+        self.max_health[row] = enemy.max_health
+        self.speed[row] = enemy.grid_speed
+        self.slowed[row] = bool(enemy.if_slowed)
+        self.type_id[row] = self.get_type_id(type(enemy))
+
+        self.enemies.append(enemy)
+        self._size += 1
+
+        enemy._table = self
+        enemy._row = row
+
+    def remove(self, enemy: AbstractEnemy):
+        """Moves the state of 'enemy' out of this table, back onto 'enemy'
+
+        The last row is moved into the row that is vacated.
+
+        Raises:
+            ValueError if 'enemy' is not in this table
+        """
+        # pylint: disable=protected-access
+        if enemy._table is not self:
+            raise ValueError(f"{enemy} is not in this table")
+
+        row = enemy._row
+        position, health, max_health = enemy.position, enemy.health, enemy.max_health
+        grid_speed, if_slowed = enemy.grid_speed, enemy.if_slowed
+
+        enemy._table = enemy._row = None
+        enemy.position, enemy.health, enemy.max_health = position, health, max_health
+        enemy.grid_speed, enemy.if_slowed = grid_speed, if_slowed
+
+        last = self._size - 1
+        if row != last:
+            for name, _ in self.COLUMNS:
+                column = getattr(self, name)
+                column[row] = column[last]
+
+            moved = self.enemies[row] = self.enemies[last]
+            moved._row = row
+
+        self.enemies.pop()
+        self._size -= 1
+
+    def clear(self):
+        """Removes every enemy from this table"""
+        while self.enemies:
+            self.remove(self.enemies[-1])
+
+
 class SimpleEnemy(AbstractEnemy):
     """Basic type of enemy"""
+    __slots__ = ()
     name = "Simple Enemy"
     colour = '#E23152'  # Amaranth
 
@@ -128,6 +385,7 @@ class SimpleEnemy(AbstractEnemy):
 
 class InvincibleEnemy(SimpleEnemy):
     """An enemy that cannot be killed; not useful, just a proof of concept"""
+    __slots__ = ()
     name = "Invincible Enemy"
     colour = '#4D4C5B'  # Porpoise
 
@@ -142,6 +400,7 @@ class InvincibleEnemy(SimpleEnemy):
 
 class AdvanceEnemy(AbstractEnemy):
     """Advance type of enemy immune to ice tower, become faster when health ls low and change color"""
+    # no __slots__, since colour changes per instance
     name = "Advance Enemy"
     colour = 'black'
 
@@ -0,0 +1,152 @@
+"""
+Headless evaluation of tower layouts against the waves of a level, across multiple processes
+
+Layouts & levels are described by references to their classes, rather than live objects, so that
+they can be shipped to worker processes cheaply, e.g.
+
+    layouts = [[((1, 0), 'tower:SimpleTower'), ((2, 2), 'tower:MissileTower')], ...]
+
+    for result in evaluate_layouts(layouts, 'levels:MyLevel', range(1, 21)):
+        print(result.layout, result.wave, result.kills, result.leaks)
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import os
+
+from model import TowerGame, GRID_SIZE
+from snapshot import get_class_reference, resolve_class_reference
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2018, The University of Queensland"
+__license__ = "MIT"
+__version__ = "1.1.0"
+
+# The number of simulations queued per worker, so that workers aren't left idle between results
+QUEUED_PER_WORKER = 4
+
+
+class WaveResult:
+    """The outcome of playing a single wave against a tower layout"""
+
+    def __init__(self, layout, wave, kills, leaks, coins, score, steps):
+        """
+        Parameters:
+            layout (int): The index of the layout that was evaluated
+            wave (int): The wave that was played
+            kills (int): The number of enemies killed
+            leaks (int): The number of enemies that escaped
+            coins (int): The coins earned from killing enemies
+            score (int): The score earned from killing enemies
+            steps (int): The number of time-steps the wave lasted
+        """
+        self.layout = layout
+        self.wave = wave
+        self.kills = kills
+        self.leaks = leaks
+        self.coins = coins
+        self.score = score
+        self.steps = steps
+
+    def __repr__(self):
+        return (f"{self.__class__.__name__}(layout={self.layout}, wave={self.wave}, kills={self.kills}, "
+                f"leaks={self.leaks}, coins={self.coins}, score={self.score}, steps={self.steps})")
+
+
+def _get_reference(descriptor):
+    """(str) Returns the "module:name" reference for a class, or a reference"""
+    return descriptor if isinstance(descriptor, str) else get_class_reference(descriptor)
+
+
+def evaluate_wave(layout, level, wave, size=GRID_SIZE, step_limit=None):
+    """Plays a single wave of a level against a tower layout, in a new headless game
+
+    Coins & score are earned as in the game application, with a bonus for each enemy killed in
+    the same step as others
+
+    Parameters:
+        layout (list<tuple<tuple<int, int>, str>>): (cell, tower reference) pairs for each tower
+        level (str): Reference to the level class, which is constructed without arguments
+        wave (int): The wave to play
+        size (tuple<int, int>): The number of (column, row) cells in the grid
+        step_limit (int): The maximum number of time-steps to play, else None for no limit
+
+    Returns:
+        tuple<int, int, int, int, int>: (kills, leaks, coins, score, steps)
+
+    Raises:
+        ValueError: If a tower in the layout cannot be placed
+    """
+    game = TowerGame(size=size)
+
+    for cell, tower in layout:
+        if not game.place(tuple(cell), resolve_class_reference(tower)):
+            raise ValueError(f"Cannot place {tower} at {cell}")
+
+    game.queue_wave(resolve_class_reference(level)().get_wave(wave))
+
+    result = game.run_until("wave_cleared", limit=step_limit)
+
+    coins = score = 0
+    for dead_enemies in result.deaths:
+        bonus = len(dead_enemies) ** .5
+        for enemy in dead_enemies:
+            coins += enemy.points
+            score += int(enemy.points * bonus)
+
+    return result.kills, result.escapes, coins, score, result.steps
+
+
+def evaluate_layouts(layouts, level, waves, workers=None, size=GRID_SIZE, step_limit=None):
+    """Yields the result of playing each wave against each layout, as the results complete
+
+    Every (layout, wave) pair is simulated independently, in a pool of worker processes, so
+    results are yielded in the order they complete, rather than the order of layouts & waves
+
+    Parameters:
+        layouts (iter<list<tuple<tuple<int, int>, type|str>>>): The layouts to evaluate, each a
+                                                                  list of (cell, tower) pairs, where
+                                                                  tower is a tower class or a
+                                                                  "module:name" reference to one
+        level (type|str): The level class, or a "module:name" reference to one, which is
+                          constructed without arguments
+        waves (iter<int>): The waves to play against each layout
+        workers (int): The number of worker processes, else None for one per CPU
+        size (tuple<int, int>): The number of (column, row) cells in the grid
+        step_limit (int): The maximum number of time-steps to play each wave, else None for no limit
+
+    Yield:
+        WaveResult: The result of each (layout, wave) pair
+
+    Raises:
+        ValueError: If a tower in a layout cannot be placed
+    """
+    level = _get_reference(level)
+    waves = list(waves)
+    workers = workers or os.cpu_count() or 1
+
+    def get_jobs():
+        for index, layout in enumerate(layouts):
+            layout = [(tuple(cell), _get_reference(tower)) for cell, tower in layout]
+            for wave in waves:
+                yield index, layout, wave
+
+    jobs = get_jobs()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+
+        while True:
+            # keep enough simulations queued to occupy every worker
+            for index, layout, wave in jobs:
+                future = executor.submit(evaluate_wave, layout, level, wave, size, step_limit)
+                pending[future] = index, wave
+                if len(pending) >= workers * QUEUED_PER_WORKER:
+                    break
+
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, wave = pending.pop(future)
+                yield WaveResult(index, wave, *future.result())
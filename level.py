@@ -6,6 +6,34 @@ __license__ = "MIT"
 __version__ = "1.1.0"
 
 
+class EnemySpawn:
+    """Describes an enemy to be spawned, which is only constructed when it is spawned
+
+    A single spawn may be shared by any number of (step, spawn) pairs in a wave
+    """
+    __slots__ = ('enemy_class', 'args', 'kwargs')
+
+    def __init__(self, enemy_class, args=(), kwargs=None):
+        """
+        Parameters:
+            enemy_class (Class<AbstractEnemy>): The enemy constructor
+            args (tuple): Positional arguments to pass to the enemy's constructor
+            kwargs (dict): Keyword arguments to pass to the enemy's constructor
+        """
+        self.enemy_class = enemy_class
+        self.args = tuple(args)
+        self.kwargs = kwargs or None
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.enemy_class.__name__}, {self.args!r}, {self.kwargs!r})"
+
+    def create(self):
+        """(AbstractEnemy) Returns a new enemy, as described by this spawn"""
+        if self.kwargs is None:
+            return self.enemy_class(*self.args)
+        return self.enemy_class(*self.args, **self.kwargs)
+
+
 class AbstractLevel:
     """A level in the game, with multiple waves of enemies"""
     EASY = 0
@@ -24,8 +52,9 @@ class AbstractLevel:
             wave_n (int): The nth wave
 
         Return:
-            list[tuple[int, AbstractEnemy]]: A list of (step, enemy) pairs in the
-                                             wave, sorted by step in ascending order 
+            iter<tuple<int, EnemySpawn|AbstractEnemy>>: (step, spawn) pairs for the enemies in the
+                                                        wave, in ascending order of step
+                                                        (see TowerGame.queue_wave)
         """
         raise NotImplementedError("get_wave must be implemented by a subclass")
 
@@ -54,6 +83,8 @@ class AbstractLevel:
     @classmethod
     def generate_sub_wave(cls, steps, count, enemy_class, args=None, kwargs=None, offset=0):
         """Generates a sub-wave compatible with TowerGame.queue_wave
+
+        Enemies are described by a single EnemySpawn, so are only constructed when spawned
         
         Parameters:
             steps (int): The number of steps over which to spawn this sub-wave
@@ -62,30 +93,79 @@ class AbstractLevel:
             args: Positional arguments to pass to the enemy's constructor
             kwargs: Keyword arguments to pass to the enemy's constructor
             offset (int): The first step (i.e. positive offset for each step)
+
+        Yield:
+            tuple<int, EnemySpawn>: (step, spawn) pair for each enemy
         """
-        if args is None:
-            args = ()
-        if kwargs is None:
-            kwargs = {}
+        spawn = EnemySpawn(enemy_class, args or (), kwargs)
 
         for step in cls.generate_intervals(steps, count):
-            yield step + offset, enemy_class(*args, **kwargs)
+            yield step + offset, spawn
 
     @classmethod
     def generate_sub_waves(cls, sub_waves):
-        """Generates successive sub-waves compatible with TowerGame.queue_wave
+        """(SubWaves) Returns successive sub-waves compatible with TowerGame.queue_wave
+
+        Sub-waves are generated lazily, as the wave is spawned, but the number of enemies is known up front
         
         Parameters:
             sub_waves: list of (steps, count, enemy_class, args, kwargs) tuples, where
                        parameters align with AbstractLevel.generate_sub_wave
         """
-        enemies = []
+        return SubWaves(cls, sub_waves)
+
+
+class SubWaves:
+    """Successive sub-waves of (step, spawn) pairs, generated lazily each time they are iterated
+
+    See AbstractLevel.generate_sub_waves
+    """
+
+    def __init__(self, level_class, sub_waves):
+        """
+        Parameters:
+            level_class (Class<AbstractLevel>): The level generating each sub-wave
+            sub_waves (list<tuple>): (steps, count, enemy_class, args, kwargs) tuples for each sub-wave
+        """
+        self._level_class = level_class
+        self._sub_waves = list(sub_waves)
+
+    def __len__(self):
+        """(int) Returns the number of enemies across all sub-waves"""
+        return sum(count for _, count, _, _, _ in self._sub_waves if count is not None)
+
+    def __iter__(self):
+        """Yields (step, spawn) pairs for each enemy, in ascending order of step"""
         offset = 0
-        for steps, count, enemy_class, args, kwargs in sub_waves:
+        for steps, count, enemy_class, args, kwargs in self._sub_waves:
             if count is not None:
-                enemies.extend(cls.generate_sub_wave(steps, count, enemy_class,
-                                                     args=args, kwargs=kwargs, offset=offset))
+                yield from self._level_class.generate_sub_wave(steps, count, enemy_class,
+                                                               args=args, kwargs=kwargs, offset=offset)
 
             offset += steps
 
-        return enemies
+
+class RepeatingWave:
+    """An endless wave, repeating a pattern of (step, spawn) pairs every 'period' steps
+
+    Unlike a generator, each iteration starts from the beginning, so the wave can be re-created
+    (e.g. when a snapshot is restored)
+    """
+
+    def __init__(self, pattern, period):
+        """
+        Parameters:
+            pattern (list<tuple<int, EnemySpawn|AbstractEnemy>>): (step, spawn) pairs, in ascending order of
+                                                                  step, all of which are less than period
+            period (int): The number of steps between each repetition of the pattern
+        """
+        self.pattern = list(pattern)
+        self.period = period
+
+    def __iter__(self):
+        """Yields (step, spawn) pairs for each enemy, endlessly, in ascending order of step"""
+        offset = 0
+        while True:
+            for step, spawn in self.pattern:
+                yield step + offset, spawn
+            offset += self.period
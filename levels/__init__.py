@@ -0,0 +1,5 @@
+"""
+Levels for the tower defence game, with the enemies & towers they introduce
+"""
+
+from levels.simple import BigEnemy, EnergyTower, MyLevel
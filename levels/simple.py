@@ -0,0 +1,176 @@
+"""
+A simple level, with the enemies & towers it introduces
+"""
+
+import math
+
+from enemy import SimpleEnemy, AbstractEnemy, AdvanceEnemy
+from level import AbstractLevel, EnemySpawn
+from range_ import CircularRange
+from tower import AbstractTower
+from utilities import rectangles_intersect, get_delta_through_centre, rotate_toward, angle_between
+
+__author__ = "DeShin Li"
+__copyright__ = "44925817"
+
+
+class BigEnemy(AbstractEnemy):
+    """Enemy that is immune to projectile & explosive damage """
+    name = "Big Enemy"
+    colour = '#0000ff'
+
+    points = 10
+
+    def __init__(self, grid_size=(.4, .4), grid_speed=4/60, health=150):
+        super().__init__(grid_size, grid_speed, health)
+
+    def damage(self, damage, type_):
+        """Inflict damage on the enemy
+
+        Parameters:
+            damage (int): The amount of damage to inflict
+            type_ (str): The type of damage to do i.e. projectile, explosive, energy
+        """
+        if type_ != "projectile" and type_ != "explosive":
+            self.health -= damage
+        if self.health < 0:
+            self.health = 0
+
+    def step(self, data):
+        """Move the enemy forward a single time-step
+
+        Parameters:
+            grid (GridCoordinateTranslator): Grid the enemy is currently on
+            path (Path): The path the enemy is following
+
+        Returns:
+            bool: True iff the new location of the enemy is within the grid
+        """
+        grid = data.grid
+        path = data.path
+
+        # Repeatedly move toward next cell centre as much as possible
+        movement = self.grid_speed
+        while movement > 0:
+            cell_offset = grid.pixel_to_cell_offset(self.position)
+
+            # Assuming cell_offset is along an axis!
+            offset_length = abs(cell_offset[0] + cell_offset[1])
+
+            if offset_length == 0:
+                partial_movement = movement
+            else:
+                partial_movement = min(offset_length, movement)
+
+            cell_position = grid.pixel_to_cell(self.position)
+            delta = path.get_best_delta(cell_position)
+
+            # Ensures enemy will move to the centre before moving toward delta
+            dx, dy = get_delta_through_centre(cell_offset, delta)
+
+            speed = partial_movement * self.cell_size
+            self.move_by((speed * dx, speed * dy))
+            self.position = tuple(int(i) for i in self.position)
+
+            movement -= partial_movement
+
+        intersects = rectangles_intersect(*self.get_bounding_box(), (0, 0), grid.pixels)
+        return intersects or grid.pixel_to_cell(self.position) in path.deltas
+
+class EnergyTower(AbstractTower):
+    """A energy tower that deals energy damage"""
+    name = 'Energy Tower'
+    colour = '#FEC40A'
+
+    range = CircularRange(2)
+    cool_down_steps = 0
+
+    base_cost = 50
+    level_cost = 15
+
+    target_limit = 1
+
+    rotation_threshold = (1 / 6) * math.pi
+
+    def __init__(self, cell_size: int, grid_size=(.7, .7), rotation=math.pi * .25, base_damage=15, level: int = 1):
+        super().__init__(cell_size, grid_size, rotation, base_damage, level)
+
+    def step(self, data):
+        """Rotates toward 'target' and attacks if possible"""
+        self.cool_down.step()
+
+        target = self.get_target(data)
+
+        if target is None:
+            return
+
+        angle = angle_between(self.position, target.position)
+        partial_angle = rotate_toward(self.rotation, angle, self.rotation_threshold)
+        self.rotation = partial_angle
+
+        if partial_angle == angle:
+            target.damage(self.get_damage(), 'energy')
+
+
+class MyLevel(AbstractLevel):
+    """A simple game level containing examples of how to generate a wave"""
+    waves = 20
+
+    def get_wave(self, wave):
+        """Returns enemies in the 'wave_n'th wave
+
+        Parameters:
+            wave_n (int): The nth wave
+
+        Return:
+            iter<tuple<int, EnemySpawn>>: (step, spawn) pairs for the enemies in the
+                                          wave, in ascending order of step
+        """
+        enemies = []
+        simple_enemy = EnemySpawn(SimpleEnemy)
+
+        if wave == 1:
+            # A hardcoded singleton list of (step, spawn) pairs
+
+            enemies = [(10, simple_enemy)]
+        elif wave == 2:
+            # A hardcoded list of multiple (step, spawn) pairs
+
+            enemies = [(10, simple_enemy), (15, simple_enemy), (30, simple_enemy)]
+        elif 3 <= wave < 10:
+            # (step, spawn) pairs spread across an interval of time (steps)
+
+            steps = int(40 * (wave ** .5))  # The number of steps to spread the enemies across
+            count = wave * 2  # The number of enemies to spread across the (time) steps
+
+            enemies = [(step, simple_enemy) for step in self.generate_intervals(steps, count)]
+
+        elif wave == 10:
+            # Generate sub waves
+            sub_waves = [
+                # (steps, number of enemies, enemy constructor, args, kwargs)
+                (50, 10, SimpleEnemy, (), {}),  # 10 enemies over 50 steps
+                (100, None, None, None, None),  # then nothing for 100 steps
+                (50, 10, SimpleEnemy, (), {}),  # then another 10 enemies over 50 steps
+                (50, 5, BigEnemy, (), {}) # enemies that only take energy damage
+            ]
+
+            enemies = self.generate_sub_waves(sub_waves)
+
+        else:  # 11 <= wave <= 20
+            # Now it's going to get hectic
+
+            sub_waves = [
+                (
+                    int(13 * wave),  # total steps
+                    int(25 * wave ** (wave / 50)),  # number of enemies
+                    SimpleEnemy,  # enemy constructor
+                    (),  # positional arguments to provide to enemy constructor
+                    {},  # keyword arguments to provide to enemy constructor
+                ),
+                (50, 1, AdvanceEnemy, (), {}) # advance enemy
+                # ...
+            ]
+            enemies = self.generate_sub_waves(sub_waves)
+
+        return enemies
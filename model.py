@@ -2,15 +2,21 @@
 High-level modelling classes for tower defence game
 """
 
+import time
+from collections import deque
+from itertools import compress, groupby
+from operator import itemgetter
 from typing import Tuple, List
 
+import snapshot
 from core import UnitManager, GameData
+from effects import EffectManager
 from modules.ee import EventEmitter
-from modules.matrix import get_adjacent_cells
 
-from tower import AbstractTower
-from enemy import AbstractEnemy
-from path import Path
+from tower import AbstractTower, MissileTable
+from enemy import AbstractEnemy, EnemyTable
+from path import GridPath
+from spawning import SpawnScheduler
 
 __author__ = "Benjamin Martin and Brae Webb"
 __copyright__ = "Copyright 2018, The University of Queensland"
@@ -119,14 +125,268 @@ class GridCoordinateTranslator:
 
 
 
+class BatchResult:
+    """Aggregated results of running many steps of a game at once"""
+
+    def __init__(self):
+        self.steps = 0  # The number of time-steps advanced
+        self.kills = 0  # The number of enemies that died
+        self.escapes = 0  # The number of enemies that escaped
+        self.damage_dealt = 0  # The total health lost by enemies, excluding health carried by escaping enemies
+        self.cleared = False  # True iff all enemies were cleared at some step
+
+        # enemies that died/escaped in each step in which any did (list<list<AbstractEnemy>>)
+        self.deaths = []
+        self.escaped = []
+
+        # (event name, enemies) for each of the above, in the order they occurred, & the order the
+        # game emits them in a single step ("enemy_escape" before "enemy_death")
+        self.events = []
+
+        # health of enemies entering & leaving play, for calculating damage dealt
+        self._health_in = 0
+        self._health_out = 0
+
+    def record(self, dead_enemies, escaped_enemies):
+        """Records the enemies removed from the game in a single step
+
+        Parameters:
+            dead_enemies (list<AbstractEnemy>): The enemies which died
+            escaped_enemies (list<AbstractEnemy>): The enemies which escaped
+        """
+        if escaped_enemies:
+            self.escaped.append(escaped_enemies)
+            self.events.append(("enemy_escape", escaped_enemies))
+            self.escapes += len(escaped_enemies)
+            self._health_out += sum(enemy.health for enemy in escaped_enemies)
+        if dead_enemies:
+            self.deaths.append(dead_enemies)
+            self.events.append(("enemy_death", dead_enemies))
+            self.kills += len(dead_enemies)
+            self._health_out += sum(enemy.health for enemy in dead_enemies)
+
+    def enter(self, health):
+        """Records 'health' entering play, either at the start of the batch or when an enemy spawns"""
+        self._health_in += health
+
+    def finish(self, health):
+        """Completes the batch, with 'health' remaining in play"""
+        self.damage_dealt = self._health_in - self._health_out - health
+
+
+class PhaseStats:
+    """Rolling statistics for each phase of a game's updates"""
+
+    def __init__(self, phases, window):
+        """
+        Parameters:
+            phases (iter<str>): The names of the phases
+            window (int): The number of most recent updates to keep statistics for
+        """
+        phases = tuple(phases)
+
+        self.window = window
+        self.updates = 0
+        self.calls = {phase: 0 for phase in phases}
+        self._times = {phase: deque(maxlen=window) for phase in phases}
+        self._units = {phase: deque(maxlen=window) for phase in phases}
+
+    def record(self, phase, elapsed, units):
+        """Records a single call of a phase
+
+        Parameters:
+            phase (str): The name of the phase
+            elapsed (float): The wall time taken by the phase, in seconds
+            units (int): The number of units the phase processed
+        """
+        self.calls[phase] += 1
+        self._times[phase].append(elapsed)
+        self._units[phase].append(units)
+
+    def summary(self):
+        """(dict<str: dict<str: float>>) Returns statistics for each phase, over the window
+
+        For each phase: the total number of calls, & the mean & maximum wall time in milliseconds
+        & mean number of units processed per call, over the window
+        """
+        summary = {}
+        for phase, times in self._times.items():
+            count = len(times) or 1
+            summary[phase] = {
+                'calls': self.calls[phase],
+                'mean_ms': 1000 * sum(times) / count,
+                'max_ms': 1000 * max(times, default=0),
+                'units': sum(self._units[phase]) / count,
+            }
+        return summary
+
+
+class Changes:
+    """The changes to the units of a game between two revisions of its change journal
+
+    Changes are compacted: units added within the diff appear only in added, regardless of any
+    other changes to them, & units both added & removed within the diff are omitted entirely.
+
+    Obstacles are reused once released (see AbstractObstacle.acquire), so a unit may be removed &
+    later added again within a diff, in which case it appears in both removed & added. Consumers
+    must apply removals before additions, so any state kept for the unit's previous use is dropped.
+    """
+    # The sets of units changed in particular ways
+    CHANGE_TYPES = ('added', 'removed', 'moved', 'rotated', 'upgraded', 'damaged')
+
+    def __init__(self, revision):
+        """
+        Parameters:
+            revision (int): The revision of the change journal the diff brings consumers up to
+        """
+        self.revision = revision
+        self.kinds = set()  # The kinds of units ('towers', 'enemies', 'obstacles') with any changes
+
+        self.added = set()
+        self.removed = set()
+        self.moved = set()
+        self.rotated = set()  # towers only
+        self.upgraded = set()  # towers only
+        self.damaged = set()  # enemies only, whose health changed
+
+    def __bool__(self):
+        """(bool) Returns True iff any units changed"""
+        return bool(self.kinds)
+
+    def __repr__(self):
+        counts = ", ".join(f"{name}={len(getattr(self, name))}" for name in self.CHANGE_TYPES)
+        return f"{self.__class__.__name__}(revision={self.revision}, {counts})"
+
+    def add(self, kind, unit):
+        """Records that 'unit', of 'kind', was added"""
+        self.kinds.add(kind)
+        self.added.add(unit)
+
+    def remove(self, kind, unit):
+        """Records that 'unit', of 'kind', was removed"""
+        self.kinds.add(kind)
+        self._remove(unit)
+
+    def _remove(self, unit):
+        """Records that 'unit' was removed, compacting away any other changes to it"""
+        if unit in self.added:
+            # if the unit was removed before it was added, it remains in removed
+            self.added.remove(unit)
+        else:
+            self.removed.add(unit)
+
+        self.moved.discard(unit)
+        self.rotated.discard(unit)
+        self.upgraded.discard(unit)
+        self.damaged.discard(unit)
+
+    def change(self, kind, change_type, unit):
+        """Records that 'unit', of 'kind', changed
+
+        Parameters:
+            kind (str): The kind of the unit ('towers', 'enemies' or 'obstacles')
+            change_type (str): One of 'moved', 'rotated', 'upgraded' or 'damaged'
+            unit (Unit): The unit that changed
+        """
+        if unit in self.added:
+            return
+
+        self.kinds.add(kind)
+        getattr(self, change_type).add(unit)
+
+    def update(self, changes):
+        """Folds a later diff into this one
+
+        Parameters:
+            changes (Changes): The diff immediately following this one
+        """
+        self.revision = changes.revision
+        self.kinds |= changes.kinds
+
+        # a unit in both removed & added was removed first (see class docstring)
+        for unit in changes.removed:
+            self._remove(unit)
+        self.added |= changes.added
+
+        for name in ('moved', 'rotated', 'upgraded', 'damaged'):
+            getattr(self, name).update(getattr(changes, name) - self.added)
+
+
+class ChangeJournal:
+    """Journal of the changes to the units of a game, as a sequence of compact diffs
+
+    Changes are reported as they are made, & accumulate in a pending diff until recorded, which
+    creates a new revision iff there were any. The cost of journaling is therefore proportional to
+    the number of changes, not the number of units. Only the most recent diffs are retained.
+    """
+
+    def __init__(self, limit=256):
+        """
+        Parameters:
+            limit (int): The number of most recent revisions to retain diffs for
+        """
+        self.revision = 0
+        self._diffs = deque(maxlen=limit)
+        self._pending = Changes(1)
+
+    def add(self, kind, unit):
+        """Reports that 'unit', of 'kind' ('towers', 'enemies' or 'obstacles'), was added"""
+        self._pending.add(kind, unit)
+
+    def remove(self, kind, unit):
+        """Reports that 'unit', of 'kind' ('towers', 'enemies' or 'obstacles'), was removed"""
+        self._pending.remove(kind, unit)
+
+    def change(self, kind, change_type, unit):
+        """Reports that 'unit', of 'kind', changed, as for Changes.change"""
+        self._pending.change(kind, change_type, unit)
+
+    def record(self):
+        """Records the changes reported since the last recording, creating a new revision iff there were any"""
+        if self._pending:
+            self.revision += 1
+            self._diffs.append(self._pending)
+            self._pending = Changes(self.revision + 1)
+
+    def changes_since(self, revision):
+        """(Changes) Returns the changes recorded after 'revision', compacted into a single diff,
+        else None if they are no longer retained
+
+        Parameters:
+            revision (int): A revision previously returned as Changes.revision, or 0 for all changes
+        """
+        changes = Changes(self.revision)
+        if revision >= self.revision:
+            return changes
+
+        first = self._diffs[0].revision
+        if revision < first - 1:
+            return None
+
+        changes.revision = revision
+        for index in range(revision - first + 1, len(self._diffs)):
+            changes.update(self._diffs[index])
+
+        return changes
+
+
 class TowerGame(EventEmitter):
     """Model for a game of tower defence"""
     _current_step = -1
 
-    def __init__(self, size=GRID_SIZE, cell_size=CELL_SIZE):
-        """Construct a new tower defence game"""
+    def __init__(self, size=GRID_SIZE, cell_size=CELL_SIZE, sound_sink=None):
+        """Construct a new tower defence game
+
+        Parameters:
+            size (tuple<int, int>): The number of (column, row) cells in the grid
+            cell_size (int): The side length of each cell, in pixels
+            sound_sink (object): Plays sound effects by name through a play_sound(name) method,
+                                 else None to run silently (e.g. headless)
+        """
         super().__init__()
 
+        self.sound_sink = sound_sink
+
         self.grid = GridCoordinateTranslator(cells=size, cell_size=cell_size)
 
         self.towers = {}
@@ -140,13 +400,43 @@ class TowerGame(EventEmitter):
         self.obstacles = []
 
         self.enemies = []
-        self._unspawned_enemies = []
+
+        # waves of enemies yet to spawn
+        self.spawn_scheduler = SpawnScheduler()
+
+        # state of enemies in play
+        self._enemy_table = EnemyTable()
+
+        # state of missiles in play, which are stepped in bulk
+        self._missile_table = MissileTable()
+
+        # status effects applied to enemies by towers
+        self.effects = EffectManager()
+
+        # results of the batch being run, if any
+        self._batch = None
+
+        # statistics for each phase of updates, if enabled
+        self._stats = None
+        self._stats_interval = None
+
+        # journal of changes to units, if enabled
+        self.journal = None
+
+        # (path, cell, result) of the last placement attempt, for the tower layout of path
+        self._placement_preview = None
+
+        # units removed from the game since the spatial indices were last updated
+        self._removed_enemies = []
+        self._removed_obstacles = []
 
         # Game data to be passed to units when stepped
         # It's poor form to pass entire game model, so distinct object is
         # used without special methods (i.e. step methods)
         self._data = GameData()
-        self._data.enemies = UnitManager(self.grid.pixels)
+        self._data.enemies = UnitManager(self.grid.pixels, cell_size=self.grid.cell_size)
+        self._data.enemy_table = self._enemy_table
+        self._data.effects = self.effects
         self._data.obstacles = UnitManager(self.grid.pixels)
         self._data.towers = self.towers
         self._data.path = self.path
@@ -154,7 +444,7 @@ class TowerGame(EventEmitter):
 
     def is_wave_over(self):
         """(bool) Returns True iff there is no wave in progress"""
-        return len(self._unspawned_enemies) == 0 and len(self.enemies) == 0
+        return self.spawn_scheduler.get_wave_count() == 0 and len(self.enemies) == 0
 
     def generate_path(self, *extra_towers):
         """
@@ -170,21 +460,8 @@ class TowerGame(EventEmitter):
         towers = set(self.towers.keys())
         towers.update(extra_towers)
 
-        def get_neighbours(cell, from_=True):  # pylint: disable=unused-argument
-            """Yields all the positions neighbouring cell
-
-            Parameters:
-                cell (tuple<int, int>): The cell to check for neighbours
-                from_ (bool): If true, searches from cell to neighbour, else from neighbour to cell
-                              *not used in this implementation*
-            """
-            for node in get_adjacent_cells(cell):
-                if (self.grid.is_cell_valid(node) and node not in towers) \
-                        or node == self._start or node == self._end:
-                    yield node
-
         # create a path from start to end avoiding towers
-        path = Path(self._start, self._end, get_neighbours)
+        path = GridPath(self._start, self._end, self.grid.cells, towers)
         self._start, self._end = path.start, path.end
 
         return path
@@ -205,7 +482,13 @@ class TowerGame(EventEmitter):
             raise KeyError(f"No tower exists at {cell}")
 
         tower = self.towers.pop(cell)
-        self._data.path = self.path = self.generate_path()
+        self._data.path = self.path = self.path.with_unblocked(cell)
+        self.effects.remove_source(tower)
+
+        if self.journal is not None:
+            self.journal.remove('towers', tower)
+
+        self.record_changes()
 
         return tower
 
@@ -238,16 +521,21 @@ class TowerGame(EventEmitter):
 
         # check a path can still be made
         try:
-            self.generate_path(cell)
+            path = self.path.with_blocked(cell)
         except KeyError:
             return False
 
         self.towers[cell] = tower
         old_path = self.path
-        self._data.path = self.path = self.generate_path()
+        self._data.path = self.path = path
+
+        if self.journal is not None:
+            self.journal.add('towers', tower)
 
         self._resolve_problems_after_placement(cell, old_path)
 
+        self.record_changes()
+
         return True
 
     def _resolve_problems_after_placement(self, cell, old_path):
@@ -260,11 +548,7 @@ class TowerGame(EventEmitter):
             old_path (Path): The previous path, before the tower was placed        
         """
         # find enemies in this cell
-        problems: List[AbstractEnemy] = []
-        for enemy in self.enemies:
-            enemy_cell = self.grid.pixel_to_cell(enemy.position)
-            if cell == enemy_cell:
-                problems.append(enemy)
+        problems: List[AbstractEnemy] = list(self._data.enemies.get_units_in_cell(cell))
 
         if len(problems):
             sources = set(old_path.get_sources(cell))
@@ -282,16 +566,68 @@ class TowerGame(EventEmitter):
                 relative_cell = tuple(c + 10 / 12 * d / 2 for c, d in zip(source, delta))
                 position = self.grid.cell_to_pixel_centre(relative_cell)
                 enemy.position = position
+                self._data.enemies.update_unit(enemy)
+
+                if self.journal is not None:
+                    self.journal.change('enemies', 'moved', enemy)
+
+    def _add_obstacles(self, obstacles, remaining_obstacles=None):
+        """Adds new obstacles to the game, storing the state of supported missiles in the missile table
+
+        Parameters:
+            obstacles (list<AbstractObstacle>): The obstacles to add
+            remaining_obstacles (list<AbstractObstacle>): The list to add obstacles to, if not self.obstacles
+        """
+        if remaining_obstacles is None:
+            remaining_obstacles = self.obstacles
+        remaining_obstacles.extend(obstacles)
+
+        for obstacle in obstacles:
+            if self._missile_table.supports(obstacle):
+                self._missile_table.add(obstacle)
+
+            if self.journal is not None:
+                self.journal.add('obstacles', obstacle)
+
+    def _remove_obstacle(self, obstacle):
+        """Removes an obstacle that has expired, to be released once it is out of the spatial index"""
+        self._removed_obstacles.append(obstacle)
+
+        if self.journal is not None:
+            self.journal.remove('obstacles', obstacle)
+
+    def _step_effects(self):
+        """Removes the status effects that have ended, as of the current time-step"""
+        self.effects.advance(self._current_step)
 
     def _step_obstacles(self):
-        """Performs a single time step for all obstacles"""
+        """Performs a single time step for all obstacles
+
+        Consecutive runs of missiles in the missile table are stepped together, so obstacles are
+        still stepped in order
+        """
+        missiles = self._missile_table
         remaining_obstacles = []
-        for obstacle in self.obstacles:
-            persist, new_obstacles = obstacle.step(self._data)
-            if persist:
-                remaining_obstacles.append(obstacle)
-            if new_obstacles:
-                remaining_obstacles.extend(new_obstacles)
+
+        for in_table, run in groupby(self.obstacles, key=missiles.__contains__):
+            if in_table:
+                run = list(run)
+                for missile, persist in zip(run, missiles.step(run)):
+                    if persist:
+                        remaining_obstacles.append(missile)
+                    else:
+                        missiles.remove(missile)
+                        self._remove_obstacle(missile)
+                continue
+
+            for obstacle in run:
+                persist, new_obstacles = obstacle.step(self._data)
+                if persist:
+                    remaining_obstacles.append(obstacle)
+                else:
+                    self._remove_obstacle(obstacle)
+                if new_obstacles:
+                    self._add_obstacles(new_obstacles, remaining_obstacles)
 
         self.obstacles = remaining_obstacles
 
@@ -313,40 +649,141 @@ class TowerGame(EventEmitter):
             else:
                 escaped_enemies.append(enemy)
 
+        for enemy in dead_enemies + escaped_enemies:
+            self.effects.remove_enemy(enemy)
+            self._enemy_table.remove(enemy)
+
+            if self.journal is not None:
+                self.journal.remove('enemies', enemy)
+
+        self._removed_enemies.extend(dead_enemies)
+        self._removed_enemies.extend(escaped_enemies)
+
+        self.enemies = remaining_enemies
+        cleared = len(remaining_enemies) == 0 and self.spawn_scheduler.get_wave_count() == 0
+
+        # defer enemy events to the end of the batch, if running one
+        if self._batch is not None:
+            self._batch.record(dead_enemies, escaped_enemies)
+            self._batch.cleared |= cleared
+            return
+
         # emit enemy events
         if len(escaped_enemies) > 0:
             self.emit("enemy_escape", escaped_enemies)
         self.emit("enemy_death", dead_enemies)
 
-        self.enemies = remaining_enemies
-        if len(remaining_enemies) == 0 and len(self._unspawned_enemies) == 0:
+        if cleared:
             self.emit("cleared")
 
+    def _target_towers(self):
+        """Finds the enemies in range of every tower for the current step
+
+        Towers that share a range (& cell size) are targeted together. In each round, every
+        tower still in need of targets contributes the candidates from its next nearest
+        non-empty bucket, & all of them are checked against the range in a single batch.
+        Towers stop searching once they have found AbstractTower.target_limit targets.
+
+        The results are passed to towers via GameData.targets.
+        """
+        targets = self._data.targets = {tower: [] for tower in self.towers.values()}
+
+        enemies = self._data.enemies
+        if not len(enemies):
+            return
+
+        # read every enemy's position once, in bulk from the enemy table where possible
+        table = self._enemy_table
+        positions = dict(zip(table.enemies, zip(table.x, table.y)))
+        for enemy in self._removed_enemies:
+            positions[enemy] = enemy.position
+
+        groups = {}
+        for tower in self.towers.values():
+            groups.setdefault((tower.range, tower.cell_size), []).append(tower)
+
+        for (range_, cell_size), towers in groups.items():
+            extent = range_.get_extent()
+
+            searches = []
+            for tower in towers:
+                if extent is None:
+                    buckets = [list(enemies.get_closish(tower.position))]
+                else:
+                    buckets = enemies.get_buckets_in_radius(tower.position, extent * cell_size)
+
+                searches.append((tower, iter(buckets)))
+
+            while searches:
+                batch = []
+                offsets = []
+
+                for tower, buckets in searches:
+                    for bucket in buckets:
+                        if bucket:
+                            break
+                    else:
+                        continue  # search exhausted
+
+                    units = list(bucket)
+                    x, y = tower.position
+                    offsets.extend(((unit_x - x) / cell_size, (unit_y - y) / cell_size)
+                                   for unit_x, unit_y in map(positions.__getitem__, units))
+                    batch.append((tower, buckets, units))
+
+                in_range = range_.contains_many(offsets)
+
+                searches = []
+                start = 0
+                for tower, buckets, units in batch:
+                    end = start + len(units)
+                    found = targets[tower]
+                    found.extend(compress(units, in_range[start:end]))
+                    start = end
+
+                    limit = tower.target_limit
+                    if not limit or len(found) < limit:
+                        searches.append((tower, buckets))
+                    elif len(found) > limit:
+                        del found[limit:]
+
     def _step_towers(self):
         """Performs a single time step for all towers"""
         # process tower abilities (attacks, etc.)
+        journal = self.journal
         for tower in self.towers.values():
+            rotation = tower.rotation
             obstacles = tower.step(self._data)
 
+            if journal is not None and tower.rotation != rotation:
+                journal.change('towers', 'rotated', tower)
+
             if obstacles:
-                self.obstacles.extend(obstacles)
+                self._add_obstacles(obstacles)
+
+                if self.sound_sink is not None:
+                    for obstacle in obstacles:
+                        if obstacle.sound is not None:
+                            self.sound_sink.play_sound(obstacle.sound)
 
     def _spawn_enemies(self):
         """Spawn all the enemies to be spawned in the current time-step"""
-        while len(self._unspawned_enemies):
-            # gather next enemy to be spawned
-            start_step, enemy = self._unspawned_enemies[-1]
-
-            # ensure they are meant to be spawned in this step
-            if start_step > self._current_step:
-                break
-
-            self._unspawned_enemies.pop()
+        for spawn in self.spawn_scheduler.pop_due(self._current_step):
+            # enemies are constructed from their descriptions as late as possible
+            enemy = spawn if isinstance(spawn, AbstractEnemy) else spawn.create()
+            enemy.set_cell_size(self.grid.cell_size)
 
             # move enemy to spawn
             enemy.position = self.grid.cell_to_pixel_centre(self.path.start)
+            self._enemy_table.add(enemy)
             self.enemies.append(enemy)
 
+            if self.journal is not None:
+                self.journal.add('enemies', enemy)
+
+            if self._batch is not None:
+                self._batch.enter(enemy.health)
+
     def step(self):
         """Performs a single time step of the game
 
@@ -356,55 +793,428 @@ class TowerGame(EventEmitter):
         self._current_step += 1
 
         if self._current_step % 2 == 0:
-            self._data.enemies.clear()
-            self._data.obstacles.clear()
+            self._advance()
 
-            for enemy in self.enemies:
-                if self.grid.is_pixel_valid(enemy.position):
-                    self._data.enemies.add_unit(enemy)
-            
-            for obstacle in self.obstacles:
-                if self.grid.is_pixel_valid(obstacle.position):
-                    self._data.obstacles.add_unit(obstacle)
+        return self.spawn_scheduler.get_wave_count() > 0 or len(self.enemies) > 0
+
+    def _advance(self):
+        """Performs all step actions, for a time-step in which the game is updated"""
+        for _, method, _ in self._PHASES:
+            getattr(self, method)()
+
+        self.record_changes()
+
+    def _advance_with_stats(self):
+        """Performs all step actions, as _advance, recording statistics for each phase"""
+        stats = self._stats
+        clock = time.perf_counter
+
+        for name, method, count_units in self._PHASES:
+            phase = getattr(self, method)
+            start = clock()
+            phase()
+            stats.record(name, clock() - start, count_units(self))
+
+        self.record_changes()
+
+        stats.updates += 1
+        if stats.updates % self._stats_interval == 0:
+            self.emit("stats", stats.summary())
+
+    def enable_stats(self, window=120, interval=60):
+        """Starts recording timing statistics for each phase of the game's updates
+
+        Statistics are available from stats, & are emitted as a "stats" event periodically
+
+        Parameters:
+            window (int): The number of most recent updates to keep statistics for
+            interval (int): The number of updates between "stats" events
+        """
+        self._stats = PhaseStats((phase for phase, _, _ in self._PHASES), window)
+        self._stats_interval = interval
+
+        # replace the update method, so that nothing is recorded (or costs anything) while disabled
+        self._advance = self._advance_with_stats
+
+    def disable_stats(self):
+        """Stops recording statistics"""
+        self.__dict__.pop('_advance', None)
+        self._stats = None
+
+    def stats(self):
+        """(dict<str: dict<str: float>>) Returns statistics for each phase of the game's updates,
+        else None if statistics are not enabled
+
+        See PhaseStats.summary
+        """
+        if self._stats is None:
+            return None
+        return self._stats.summary()
+
+    def enable_journal(self, limit=256):
+        """Starts journaling changes to units, which can then be read as diffs by changes_since
+
+        Parameters:
+            limit (int): The number of most recent revisions to retain changes for
+        """
+        self.journal = ChangeJournal(limit)
+        self._enemy_table.damaged = set()
+
+        self._report_units(self.journal.add)
+        self.record_changes()
+
+    def disable_journal(self):
+        """Stops journaling changes"""
+        self.journal = None
+        self._enemy_table.damaged = None
+
+    def _report_units(self, report):
+        """Reports every unit in the game to the change journal
 
-            # perform all step actions
-            self._step_obstacles()
-            self._step_enemies()
-            self._step_towers()
-            self._spawn_enemies()
+        Parameters:
+            report (callable): The method of the journal to report each unit to (add or remove)
+        """
+        for kind, units in (('towers', self.towers.values()), ('enemies', self.enemies),
+                            ('obstacles', self.obstacles)):
+            for unit in units:
+                report(kind, unit)
+
+    def record_changes(self):
+        """Records the changes to units since they were last recorded, if journaling is enabled
+
+        Changes are reported to the journal as the game makes them, & recorded automatically after
+        each update, & when towers are placed or removed or the game is reset or restored. Changes
+        made to units by other means must be reported (e.g. by mark_upgraded) & recorded explicitly.
+        """
+        if self.journal is None:
+            return
+
+        # enemies' health is changed by towers & obstacles, so is tracked by the enemy table
+        table = self._enemy_table
+        for enemy in table.damaged:
+            if enemy in table:
+                self.journal.change('enemies', 'damaged', enemy)
+        table.damaged.clear()
+
+        self.journal.record()
+
+    def mark_upgraded(self, tower):
+        """Reports to the change journal that 'tower' has been upgraded, if journaling is enabled
+
+        The change is recorded by the next call to record_changes
+        """
+        if self.journal is not None:
+            self.journal.change('towers', 'upgraded', tower)
+
+    def changes_since(self, revision):
+        """(Changes) Returns the changes to units after 'revision' of the journal, as a single diff,
+        else None if journaling is disabled or the changes are no longer retained
+
+        Parameters:
+            revision (int): The revision of a diff previously returned, or 0 for all changes since
+                            journaling was enabled
+        """
+        if self.journal is None:
+            return None
+        return self.journal.changes_since(revision)
 
-        return len(self._unspawned_enemies) or len(self.enemies)
+    def run(self, steps):
+        """Performs 'steps' time steps of the game, as a single batch
+
+        Parameters:
+            steps (int): The number of time steps to perform
+
+        Returns:
+            BatchResult: The aggregated results of the steps
+        """
+        return self.run_until(None, limit=steps)
+
+    def run_until(self, predicate="wave_cleared", limit=None):
+        """Performs time steps of the game, as a single batch, until 'predicate' is satisfied
+
+        Only time steps in which the game is updated are performed; the idle steps in between are
+        skipped. Enemy events are not emitted during the batch, but once it completes, for each
+        step in which enemies died or escaped (in the order of those steps), followed by "cleared"
+        if all enemies were cleared
+
+        Parameters:
+            predicate (callable<TowerGame>|str): Returns True iff the batch should stop, checked
+                                                 before the first step and after each update, or
+                                                 "wave_cleared" to stop once the wave is over,
+                                                 else None to stop only at the limit
+            limit (int): The maximum number of time steps to perform, else None for no limit
+
+        Returns:
+            BatchResult: The aggregated results of the steps
+        """
+        if predicate == "wave_cleared":
+            predicate = TowerGame.is_wave_over
+        elif predicate is None and limit is None:
+            raise ValueError("A predicate or limit is required")
+
+        batch = self._batch = BatchResult()
+        batch.enter(sum(enemy.health for enemy in self.enemies))
+
+        try:
+            while predicate is None or not predicate(self):
+                # advance directly to the next step in which the game is updated
+                steps = 2 - self._current_step % 2
+                if limit is not None and batch.steps + steps > limit:
+                    self._current_step += limit - batch.steps
+                    batch.steps = limit
+                    break
+
+                self._current_step += steps
+                batch.steps += steps
+                self._advance()
+        finally:
+            self._batch = None
+            batch.finish(sum(enemy.health for enemy in self.enemies))
+
+        for event, enemies in batch.events:
+            self.emit(event, enemies)
+        if batch.cleared:
+            self.emit("cleared")
+
+        return batch
+
+    def _update_index(self, index, units, removed_units, kind):
+        """Brings a spatial index up to date with the current positions of units, reporting units
+        that moved to the change journal
+
+        Units outside the grid aren't indexed, so are reported as moved every update
+
+        Parameters:
+            index (UnitManager): The spatial index to update
+            units (list<Unit>): The units currently in the game
+            removed_units (list<Unit>): The units removed from the game since the last update
+                                        (cleared by this method)
+            kind (str): The kind of the units ('enemies' or 'obstacles')
+        """
+        for unit in removed_units:
+            if unit in index:
+                index.remove_unit(unit)
+        removed_units.clear()
+
+        journal = self.journal
+        for unit in units:
+            if self.grid.is_pixel_valid(unit.position):
+                moved = index.update_unit(unit)
+            else:
+                moved = True
+                if unit in index:
+                    index.remove_unit(unit)
+
+            if moved and journal is not None:
+                journal.change(kind, 'moved', unit)
+
+    def _update_indices(self):
+        """Brings the enemy & obstacle spatial indices up to date for the next step"""
+        self._update_index(self._data.enemies, self.enemies, self._removed_enemies, 'enemies')
+
+        # removed obstacles can be reused once they are out of the index
+        removed_obstacles = list(self._removed_obstacles)
+        self._update_index(self._data.obstacles, self.obstacles, self._removed_obstacles, 'obstacles')
+        for obstacle in removed_obstacles:
+            obstacle.release()
+
+    # (name, method name, unit count) for each phase of an update, in the order they are performed
+    # Both _advance & _advance_with_stats perform the phases from this list, so they can't disagree;
+    # methods are looked up by name, so subclasses can override them
+    _PHASES = (
+        ('effects', '_step_effects', lambda game: len(game.effects)),
+        ('obstacles', '_step_obstacles', lambda game: len(game.obstacles)),
+        ('enemies', '_step_enemies', lambda game: len(game.enemies)),
+        ('targeting', '_target_towers', lambda game: len(game.towers)),
+        ('towers', '_step_towers', lambda game: len(game.towers)),
+        ('spawn', '_spawn_enemies', lambda game: game.spawn_scheduler.get_pending()),
+        ('indices', '_update_indices', lambda game: len(game.enemies) + len(game.obstacles)),
+    )
 
     def reset(self):
         """Resets the game"""
+        if self.journal is not None:
+            self._report_units(self.journal.remove)
+
         self.towers.clear()
         self.enemies = []
         self.obstacles = []
-        self._unspawned_enemies = []
+        self.spawn_scheduler.clear()
+        self._removed_enemies.clear()
+        self._removed_obstacles.clear()
+        self.effects.clear()
+        self._enemy_table.clear()
+        self._missile_table.clear()
         self._data.path = self.path = self.generate_path()
         self._data.enemies.clear()
         self._data.obstacles.clear()
 
+        self.record_changes()
+
     def queue_wave(self, wave, clear=False):
         """Queues a wave of enemies to spawn into the game
 
+        Waves are consumed lazily, one enemy at a time as it is spawned, so a wave may be a generator,
+        or endless (e.g. RepeatingWave). Only waves that can be iterated more than once (e.g. lists,
+        or AbstractLevel.generate_sub_waves) can be snapshotted while in progress. Enemies may be
+        described by an EnemySpawn, in which case they are only constructed when spawned.
+        Enemies' cell size is set when spawned.
+
         Parameters:
-            wave (iter<tuple<int, AbstractEnemy>>):
+            wave (iter<tuple<int, EnemySpawn|AbstractEnemy>>):
                 The wave of enemies to spawn
-                A list of tuples for each enemy to spawn
+                A tuple for each enemy to spawn
                 The first tuple element is the step number to spawn the enemy
-                The second tuple element is the enemy object
+                The second tuple element is the enemy, or a description of it
+                Lists are sorted by step; other iterables must be in ascending order of step
             clear (bool): Clears existing wave, iff True
+
+        Returns:
+            Wave: A handle to the wave, for querying its progress or cancelling it (see cancel_wave)
         """
-        wave = [(step + self._current_step, enemy) for step, enemy in wave]
+        if isinstance(wave, list):
+            wave = sorted(wave, key=itemgetter(0))
 
-        if not clear:
-            wave += self._unspawned_enemies
+        if clear:
+            self.spawn_scheduler.clear()
 
-        self._unspawned_enemies = sorted(wave, key=lambda x: x[0], reverse=True)
+        handle = self.spawn_scheduler.queue(wave, self._current_step)
 
         if clear:
+            if self.journal is not None:
+                for enemy in self.enemies:
+                    self.journal.remove('enemies', enemy)
+
             self.enemies = []
+            self._removed_enemies.clear()
+            self.effects.clear()
+            self._enemy_table.clear()
+            self._data.enemies.clear()
+
+        return handle
+
+    def cancel_wave(self, wave):
+        """Cancels the enemies of a wave that are yet to spawn
+
+        Parameters:
+            wave (Wave): The handle to the wave, as returned by queue_wave
+        """
+        self.spawn_scheduler.cancel(wave)
+
+    def snapshot(self):
+        """(bytes) Returns a compact snapshot of the state of the game, which can be restored by restore
+
+        The tower layout, enemies (spawned or not), obstacles, status effects & time-step are included,
+        along with the references between them (e.g. towers' & missiles' targets). Waves in progress
+        are included by their source & the number of enemies spawned from them, so are not expanded.
+
+        Raises:
+            ValueError: If a wave in progress can't be re-created, since it was queued as an iterator
+                        (e.g. a generator)
+        """
+        encoder = snapshot.StateEncoder()
+
+        waves = []
+        for wave in self.spawn_scheduler.get_waves():
+            if wave.source is None:
+                raise ValueError(f"{wave} can't be snapshotted, since it was queued as an iterator; "
+                                 f"queue a wave that can be iterated more than once (e.g. a list or RepeatingWave)")
+            waves.append((wave.source, wave.offset, wave.spawned))
+
+        # towers aren't shared by reference, so effects refer to their sources by cell
+        cells = {tower: cell for cell, tower in self.towers.items()}
+        effects = [(cells[source], enemy, effect, end, self.effects.get_base_speed(enemy))
+                   for source, enemy, effect, end in self.effects.get_effects() if source in cells]
+
+        # the order units are found in the spatial indices (which can break ties between targets)
+        # depends on when they moved between buckets, so is kept as indices into their lists
+        indices = []
+        for index, units in ((self._data.enemies, self.enemies), (self._data.obstacles, self.obstacles)):
+            positions = {unit: i for i, unit in enumerate(units)}
+            indices.append(tuple([positions[unit] for unit in order] for order in index.get_order()))
+
+        game = (
+            self.grid.cells,
+            self.grid.cell_size,
+            self._current_step,
+            encoder.encode(self.towers),
+            encoder.encode(self.enemies),
+            encoder.encode(waves),
+            encoder.encode(self.obstacles),
+            encoder.encode(effects),
+            indices,
+        )
+
+        return snapshot.pack((game, encoder.encode_enemies()))
+
+    def restore(self, blob):
+        """Restores the game to the state of a snapshot
+
+        Listeners are unaffected, & no events are emitted
+
+        Parameters:
+            blob (bytes): A snapshot, as returned by snapshot
+
+        Raises:
+            ValueError: If 'blob' is not a valid snapshot for this game's grid
+        """
+        game, enemies = snapshot.unpack(blob)
+        cells, cell_size, current_step, towers, spawned, unspawned, obstacles, effects, indices = game
+
+        if (tuple(cells), cell_size) != (tuple(self.grid.cells), self.grid.cell_size):
+            raise ValueError(f"Snapshot is of a {cells} grid with cell size {cell_size}")
+
+        decoder = snapshot.StateDecoder(enemies)
+
+        if self.journal is not None:
+            self._report_units(self.journal.remove)
+
+        self._current_step = current_step
+
+        self.towers.clear()
+        self.towers.update(decoder.decode(towers))
+        self._data.path = self.path = self.generate_path()
+
+        self.effects.clear()
+        self._enemy_table.clear()
+        self.enemies = decoder.decode(spawned)
+        for enemy in self.enemies:
+            self._enemy_table.add(enemy)
+
+        # effects are re-applied from enemies' base speeds
+        effects = decoder.decode(effects)
+        for _, enemy, _, _, base_speed in effects:
+            enemy.grid_speed = base_speed
+        self.effects.time = current_step
+        for cell, enemy, effect, end, _ in effects:
+            self.effects.apply(self.towers[cell], enemy, effect, end - current_step)
+        self.spawn_scheduler.clear()
+        for source, offset, spawned in decoder.decode(unspawned):
+            self.spawn_scheduler.queue(source, offset, spawned)
+        self._missile_table.clear()
+        self.obstacles = []
+        self._add_obstacles(decoder.decode(obstacles))
+
+        # obstacles were reported as they were added
+        if self.journal is not None:
+            for tower in self.towers.values():
+                self.journal.add('towers', tower)
+            for enemy in self.enemies:
+                self.journal.add('enemies', enemy)
+
+        # rebuild the spatial indices
+        self._removed_enemies.clear()
+        self._removed_obstacles.clear()
+        self._data.enemies.clear()
+        self._data.obstacles.clear()
+        self._update_indices()
+        for index, units, (buckets, cells) in zip((self._data.enemies, self._data.obstacles),
+                                                  (self.enemies, self.obstacles), indices):
+            index.set_order([units[i] for i in buckets], [units[i] for i in cells])
+
+        self._placement_preview = None
+
+        self.record_changes()
 
     def attempt_placement(self, position):
         """Checks legality of potentially placing a tower at 'position'
@@ -418,15 +1228,18 @@ class TowerGame(EventEmitter):
         # convert mouse position to grid coordinates
         grid_position = self.grid.pixel_to_cell(position)
 
-        # make a path and determine whether it is possible
-        try:
-            path = self.generate_path(grid_position)
-            legal = True
-        except KeyError:
-            path = self.path
-            legal = False
+        # reuse the previous result while the hovered cell & tower layout are unchanged
+        if self._placement_preview is not None:
+            path, cell, result = self._placement_preview
+            if path is self.path and cell == grid_position:
+                return result
+
+        # a tower can't be placed where one exists, or where it would disconnect start from end
+        if grid_position in self.towers or grid_position in self.path.get_cut_cells():
+            result = False, self.path
+        else:
+            result = True, self.path.with_blocked(grid_position)
 
-        if grid_position in self.towers:
-            legal = False
+        self._placement_preview = self.path, grid_position, result
 
-        return legal, path
+        return result
@@ -50,6 +50,9 @@ class EventEmitter(object):
 
         self.__tree = self.__new_branch()
 
+        # resolved listeners per emitted event, see __resolve
+        self.__cache = {}
+
     @property
     def delimiter(self):
         """
@@ -123,6 +126,7 @@ class EventEmitter(object):
 
             listener = Listener(func, event, ttl)
             listeners.append(listener)
+            self.__cache.clear()
 
             if self.new_listener:
                 self.emit("new_listener", func, event)
@@ -161,6 +165,7 @@ class EventEmitter(object):
 
             listener = Listener(func, None, -1)
             listeners.append(listener)
+            self.__cache.clear()
 
             if self.new_listener:
                 self.emit("new_listener", func)
@@ -183,6 +188,7 @@ class EventEmitter(object):
                 return func
 
             self.__remove_listener(branch, func)
+            self.__cache.clear()
 
             return func
 
@@ -198,6 +204,7 @@ class EventEmitter(object):
         """
         def _off_any(func):
             self.__remove_listener(self.__tree, func)
+            self.__cache.clear()
 
             return func
 
@@ -212,6 +219,7 @@ class EventEmitter(object):
         """
         del self.__tree
         self.__tree = self.__new_branch()
+        self.__cache.clear()
 
     def listeners(self, event):
         """
@@ -247,16 +255,18 @@ class EventEmitter(object):
 
         return [l.func for l in listeners]
 
-    def emit(self, event, *args, **kwargs):
+    def __resolve(self, event):
         """
-        Emits an event. All functions of events that match *event* are invoked
-        with *args* and *kwargs* in the exact order of their registration.
-        Wildcards might be applied.
+        Returns the listeners of all events that match *event*, in the exact
+        order of their registration, as a tuple *(calls, counted)*. When
+        *counted* is *False*, no listener has a ttl, and *calls* holds the
+        registered functions themselves. Otherwise, *calls* holds the
+        *Listener* instances. Wildcards might be applied.
         """
         parts = event.split(self.delimiter)
 
         if self.__CBKEY in parts:
-            return
+            return (), False
 
         listeners = self.__tree[self.__CBKEY][:]
 
@@ -280,7 +290,29 @@ class EventEmitter(object):
 
         listeners.sort(key=lambda l: l.time)
 
-        remove = [l for l in listeners if not l(*args, **kwargs)]
+        if any(l.ttl >= 0 for l in listeners):
+            return tuple(listeners), True
+
+        return tuple(l.func for l in listeners), False
+
+    def emit(self, event, *args, **kwargs):
+        """
+        Emits an event. All functions of events that match *event* are invoked
+        with *args* and *kwargs* in the exact order of their registration.
+        Wildcards might be applied. The matching listeners are resolved once
+        per event, until listeners are next registered or removed.
+        """
+        try:
+            calls, counted = self.__cache[event]
+        except KeyError:
+            calls, counted = self.__cache[event] = self.__resolve(event)
+
+        if not counted:
+            for func in calls:
+                func(*args, **kwargs)
+            return
+
+        remove = [l for l in calls if not l(*args, **kwargs)]
 
         for l in remove:
             self.off(l.event, func=l.func)
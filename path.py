@@ -17,8 +17,14 @@ Path-finding logic for navigating a grid with obstacles
 #              \\ "
 #               '=='
 
+import copy
+import heapq
+from array import array
+from collections.abc import Mapping
 from queue import Queue
 
+from modules.matrix import AXIAL_DELTAS, get_adjacent_cells
+
 __author__ = "Benjamin Martin and Brae Webb"
 __copyright__ = "Copyright 2018, The University of Queensland"
 __license__ = "MIT"
@@ -196,3 +202,548 @@ class Path:
 
                 if next_ == destination:
                     yield source
+
+
+def _get_first_deltas(deltas):
+    """(tuple<int>) Returns the index in 'deltas' of the delta that is first iterated from a set of
+    deltas, for every bitmask of 'deltas', where the set is built by adding deltas in order
+
+    Parameters:
+        deltas (tuple<tuple<int, int>, ...>): The deltas, in order
+    """
+    firsts = [-1]
+    for mask in range(1, 1 << len(deltas)):
+        included = set()
+        for i, delta in enumerate(deltas):
+            if mask >> i & 1:
+                included.add(delta)
+        firsts.append(deltas.index(next(iter(included))))
+
+    return tuple(firsts)
+
+
+class _GridDeltas(Mapping):  # pylint: disable=too-many-ancestors
+    """Read-only view of the best deltas of a GridPath, as a dict of Path.deltas would be"""
+
+    def __init__(self, path):
+        """
+        Parameters:
+            path (GridPath): The path to view
+        """
+        self._path = path
+
+    def __getitem__(self, cell):
+        path = self._path
+        index = path.get_index(cell)
+        if index is None or not path._directions[index]:  # pylint: disable=protected-access
+            raise KeyError(cell)
+        return path.get_deltas_at(index)
+
+    def __contains__(self, cell):
+        # pylint: disable=protected-access
+        path = self._path
+        if cell in path._resolved:
+            return True
+
+        column, row = cell
+        width = path._width
+        return -1 <= column < width - 1 and -1 <= row < path._height - 1 \
+            and path._directions[(row + 1) * width + column + 1] != 0
+
+    def __iter__(self):
+        path = self._path
+        get_cell = path.get_cell
+        directions = path._directions  # pylint: disable=protected-access
+        end = path._end_index  # pylint: disable=protected-access
+
+        for index in path.get_search_order():
+            if index != end and directions[index]:
+                yield get_cell(index)
+        yield path.end
+
+    def __len__(self):
+        return len(self._path._directions) - self._path._directions.count(0)  # pylint: disable=protected-access
+
+
+class GridPath(Path):
+    """Path across a rectangular grid of cells, searched over a flat integer index
+
+    Cells are indexed in a grid padded by a border of one cell, so that start & end points
+    may be placed just off the grid. Blocked cells are held in a bitmap, and the search
+    produces the distance to the end and a bitmask of best deltas for every cell in one
+    breadth-first pass. The results are the same as Path's, including the iteration order of
+    deltas and which delta is preferred when several are best.
+    """
+    # Directions are encoded in the direction grid as 1 + their index in DIRECTIONS,
+    # with 0 for cells that have no delta
+    DIRECTIONS = AXIAL_DELTAS
+    # Delta index for every bitmask of DIRECTIONS, as next(iter(deltas[cell])) would return
+    FIRST_DIRECTIONS = _get_first_deltas(AXIAL_DELTAS)
+    DELTA_SETS = tuple(frozenset(delta for i, delta in enumerate(AXIAL_DELTAS) if mask >> i & 1)
+                       for mask in range(1 << len(AXIAL_DELTAS)))
+    # Translation table from a bitmask of best deltas to its code in the direction grid
+    _DIRECTION_CODES = bytes(first + 1 for first in FIRST_DIRECTIONS).ljust(256, b'\0')
+    # Index of the opposite of each direction
+    OPPOSITES = tuple(AXIAL_DELTAS.index((-dc, -dr)) for dc, dr in AXIAL_DELTAS)
+
+    def __init__(self, start, end, size, blocked=()):
+        """Initialize a path from a starting point to a finishing point
+
+        Parameters:
+            start (tuple<int, int>): The starting position
+            end (tuple<int, int>): The end position
+            size (tuple<int, int>): The number of (column, row) cells in the grid
+            blocked (iter<tuple<int, int>>): The positions of cells that cannot be travelled through,
+                                             excluding start & end
+        """
+        columns, rows = size
+        self._width = width = columns + 2
+        self._height = rows + 2
+
+        # bitmap of blocked cells, with the border blocked to all but the start & end
+        cells = bytearray([1]) * width + (bytearray([1]) + bytearray(columns) + bytearray([1])) * rows \
+            + bytearray([1]) * width
+        for column, row in blocked:
+            if 0 <= column < columns and 0 <= row < rows:
+                cells[(row + 1) * width + column + 1] = 1
+
+        self._size = size
+        for point in (start, end):
+            if self.get_index(point) is None:
+                raise ValueError(f"{point} is not on, or adjacent to, the grid")
+            cells[self.get_index(point)] = 0
+
+        self._blocked = cells
+        self._offsets = tuple(row * width + column for column, row in self.DIRECTIONS)
+        self._start_index = self.get_index(start)
+        self._end_index = self.get_index(end)
+
+        self._neighbours = self._get_neighbour_offsets()
+        self._terminals = {index: self._get_neighbour_offsets(index) for index in (self._start_index, self._end_index)}
+
+        # best deltas of cells that have been looked up, without a previous delta
+        self._resolved = {}
+        self._cut_cells = None
+
+        super().__init__(start, end, self._get_neighbours)
+        self._generate_directions()
+
+        self.deltas = _GridDeltas(self)
+
+    def get_index(self, cell):
+        """(int) Returns the index of 'cell' in the padded grid, else None if it is not covered
+
+        Parameters:
+            cell (tuple<int, int>): The (column, row) position of the cell
+        """
+        column, row = cell
+        if -1 <= column < self._width - 1 and -1 <= row < self._height - 1:
+            return (row + 1) * self._width + column + 1
+        return None
+
+    def get_cell(self, index):
+        """(tuple<int, int>) Returns the (column, row) position of the cell at 'index' in the padded grid"""
+        row, column = divmod(index, self._width)
+        return column - 1, row - 1
+
+    def get_search_order(self):
+        """(array<int>) Returns the indices of the cells that can reach the end, in the order that the
+        search found them
+
+        For a repaired path, this is the order of increasing distance to the end, which may differ from
+        the order a full search would find cells of equal distance
+        """
+        if self._order is None:
+            distances = self._distances
+            self._order = array('i', sorted((index for index, distance in enumerate(distances) if distance >= 0),
+                                            key=distances.__getitem__))
+        return self._order
+
+    def get_distance(self, cell):
+        """(int) Returns the number of steps from 'cell' to the end, else None if it cannot reach the end
+
+        Parameters:
+            cell (tuple<int, int>): The (column, row) position of the cell
+        """
+        index = self.get_index(cell)
+        if index is None or self._distances[index] < 0:
+            return None
+        return self._distances[index]
+
+    def get_deltas_at(self, index):
+        """(frozenset<tuple<int, int>>) Returns the best deltas for the cell at 'index' in the padded grid"""
+        direction = self._best.get(index)
+        if direction is not None:
+            return self.DELTA_SETS[1 << direction]
+        return self.DELTA_SETS[self._masks[index]]
+
+    def _get_neighbours(self, cell, from_=True):  # pylint: disable=unused-argument
+        """Yields all the unblocked positions neighbouring cell
+
+        Parameters:
+            cell (tuple<int, int>): The cell to check for neighbours
+            from_ (bool): *not used in this implementation*
+        """
+        for neighbour in get_adjacent_cells(cell):
+            index = self.get_index(neighbour)
+            if index is not None and not self._blocked[index]:
+                yield neighbour
+
+    def _get_neighbour_offsets(self, index=None):
+        """(tuple<tuple<int, int>, ...>) Returns (direction, offset) pairs for the neighbours of a cell,
+        where direction is the delta from the neighbour back to the cell
+
+        Parameters:
+            index (int): The index of a start or end cell, whose neighbours are checked by position,
+                         since neighbouring indices of cells on the border may wrap around onto the
+                         opposite side of the padded grid, else None for a cell within the grid
+        """
+        pairs = []
+        for (dc, dr), offset in zip(self.DIRECTIONS, self._offsets):
+            if index is not None:
+                column, row = self.get_cell(index)
+                if self.get_index((column + dc, row + dr)) is None:
+                    continue
+            pairs.append((self.OPPOSITES[self.DIRECTIONS.index((dc, dr))], offset))
+
+        return tuple(pairs)
+
+    def _search(self):
+        """Searches outwards from the end to find the distance & best deltas to the end from every cell
+
+        Returns:
+            tuple<array<int>, bytearray, array<int>>: (distances, masks, order) triple, where:
+                - distances: the number of steps to the end from each cell, else -1 if it is unreachable
+                - masks: the bitmask of best directions for each cell
+                - order: the indices of reachable cells, in the order that they were found
+        """
+        blocked = self._blocked
+        end = self._end_index
+
+        neighbours = self._neighbours
+        terminals = self._terminals
+
+        distances = array('i', [-1]) * len(blocked)
+        masks = bytearray(len(blocked))
+        order = array('i', [end])
+        distances[end] = 0
+
+        head = 0
+        while head < len(order):
+            to = order[head]
+            head += 1
+            distance = distances[to] + 1
+
+            for direction, offset in terminals.get(to, neighbours):
+                from_ = to + offset
+                if blocked[from_]:
+                    continue
+
+                from_distance = distances[from_]
+                if from_distance < 0:
+                    distances[from_] = distance
+                    masks[from_] = 1 << direction
+                    order.append(from_)
+                elif from_distance == distance:
+                    masks[from_] |= 1 << direction
+
+        return distances, masks, order
+
+    def _generate(self):
+        """Calculate the best path to travel through the path"""
+        self._distances, self._masks, self._order = self._search()
+
+        # ensure the start point can be reached from the end point
+        if self._distances[self._start_index] < 0:
+            raise KeyError("Cannot reach end from start")
+
+        self._best = self._find_best_path()
+
+    def _find_best_path(self):
+        """(dict<int: int>) Returns the direction to follow from each cell on the best path, by index,
+        to overwrite the best deltas of those cells"""
+        best = {}
+        index = self._start_index
+        previous = None
+        while index != self._end_index:
+            mask = self._masks[index]
+            if previous is None or not mask >> previous & 1:
+                previous = self.FIRST_DIRECTIONS[mask]
+            best[index] = previous
+            index += self._offsets[previous]
+
+        best[self._end_index] = previous
+
+        return best
+
+    def _generate_directions(self):
+        """Builds the dense direction grid from the best deltas"""
+        self._directions = directions = array('b', self._masks.translate(self._DIRECTION_CODES))
+
+        for index, direction in self._best.items():
+            directions[index] = direction + 1
+
+    def get_cut_cells(self):
+        """(frozenset<tuple<int, int>>) Returns the cells which, if blocked, would disconnect the start from
+        the end, i.e. the articulation points separating the start & end"""
+        if self._cut_cells is None:
+            self._cut_cells = frozenset(self.get_cell(index) for index in self._find_cut_indices())
+        return self._cut_cells
+
+    def _find_cut_indices(self):
+        """(list<int>) Returns the indices of the articulation points separating the start & end
+
+        A depth-first search from the start finds the low-link of each cell. A cell on the search
+        tree's path to the end separates the start & end iff no cell below it on that path has an
+        edge back above it.
+        """
+        blocked = self._blocked
+        neighbours = self._neighbours
+        terminals = self._terminals
+        start = self._start_index
+
+        discovery = array('i', [-1]) * len(blocked)
+        low = array('i', [0]) * len(blocked)
+        parents = array('i', [-1]) * len(blocked)
+
+        discovery[start] = 0
+        count = 1
+        stack = [(start, iter(terminals.get(start, neighbours)))]
+
+        while stack:
+            cell, remaining = stack[-1]
+            for _, offset in remaining:
+                neighbour = cell + offset
+                if blocked[neighbour]:
+                    continue
+
+                if discovery[neighbour] < 0:
+                    discovery[neighbour] = low[neighbour] = count
+                    count += 1
+                    parents[neighbour] = cell
+                    stack.append((neighbour, iter(terminals.get(neighbour, neighbours))))
+                    break
+
+                if neighbour != parents[cell] and discovery[neighbour] < low[cell]:
+                    low[cell] = discovery[neighbour]
+            else:
+                stack.pop()
+                parent = parents[cell]
+                if parent >= 0 and low[cell] < low[parent]:
+                    low[parent] = low[cell]
+
+        cuts = []
+        child = self._end_index
+        cell = parents[child]
+        while cell != start:
+            if low[child] >= discovery[cell]:
+                cuts.append(cell)
+            child, cell = cell, parents[cell]
+
+        return cuts
+
+    def with_blocked(self, cell):
+        """(GridPath) Returns a copy of this path with 'cell' blocked, repairing only the cells whose
+        distance to the end increases
+
+        Cells that are off the grid, already blocked, or are the start or end are unaffected
+
+        Parameters:
+            cell (tuple<int, int>): The (column, row) position of the cell to block
+
+        Raises:
+            KeyError: If the end cannot be reached from the start with the cell blocked
+        """
+        index = self.get_index(cell)
+        if index is None or self._blocked[index] or index in self._terminals:
+            return self
+
+        path = self._copy()
+        path._blocked[index] = 1
+
+        distances = path._distances
+        masks = path._masks
+        if distances[index] < 0:
+            return path
+
+        # cells whose every best delta leads through a lost cell must increase in distance
+        lost = [index]
+        for lost_index in lost:
+            distance = distances[lost_index] + 1
+            for back, offset in path._terminals.get(lost_index, path._neighbours):
+                neighbour = lost_index + offset
+                if distances[neighbour] == distance and masks[neighbour]:
+                    masks[neighbour] &= ~(1 << back)
+                    if not masks[neighbour]:
+                        lost.append(neighbour)
+
+        for lost_index in lost:
+            distances[lost_index] = -1
+
+        # search inward from the cells bordering the lost cells, nearest first
+        blocked = path._blocked
+        boundary = []
+        for lost_index in lost[1:]:
+            best = -1
+            for _, offset in path._get_neighbour_directions(lost_index):
+                distance = distances[lost_index + offset]
+                if distance >= 0 and not blocked[lost_index + offset] and (best < 0 or distance < best):
+                    best = distance
+            if best >= 0:
+                heapq.heappush(boundary, (best + 1, lost_index))
+
+        while boundary:
+            distance, lost_index = heapq.heappop(boundary)
+            if 0 <= distances[lost_index] <= distance:
+                continue
+            distances[lost_index] = distance
+
+            for _, offset in path._get_neighbour_directions(lost_index):
+                neighbour = lost_index + offset
+                if not blocked[neighbour] and (distances[neighbour] < 0 or distances[neighbour] > distance + 1):
+                    heapq.heappush(boundary, (distance + 1, neighbour))
+
+        path._update_cells(lost)
+
+        return path
+
+    def with_unblocked(self, cell):
+        """(GridPath) Returns a copy of this path with 'cell' unblocked, repairing only the cells whose
+        distance to the end decreases
+
+        Cells that are off the grid or are not blocked are unaffected
+
+        Parameters:
+            cell (tuple<int, int>): The (column, row) position of the cell to unblock
+        """
+        index = self.get_index(cell)
+        columns, rows = self._size
+        if index is None or not self._blocked[index] or not (0 <= cell[0] < columns and 0 <= cell[1] < rows):
+            return self
+
+        path = self._copy()
+        path._blocked[index] = 0
+
+        distances = path._distances
+        blocked = path._blocked
+
+        # the cell can be reached in one more step than its nearest reachable neighbour
+        for _, offset in path._get_neighbour_directions(index):
+            distance = distances[index + offset] + 1
+            if distance > 0 and not blocked[index + offset] and (distances[index] < 0 or distance < distances[index]):
+                distances[index] = distance
+
+        changed = [index]
+        if distances[index] >= 0:
+            for changed_index in changed:
+                distance = distances[changed_index] + 1
+                for _, offset in path._get_neighbour_directions(changed_index):
+                    neighbour = changed_index + offset
+                    if not blocked[neighbour] and (distances[neighbour] < 0 or distances[neighbour] > distance):
+                        distances[neighbour] = distance
+                        changed.append(neighbour)
+
+        path._update_cells(changed)
+
+        return path
+
+    def _copy(self):
+        """(GridPath) Returns a copy of this path, which can be repaired without affecting this path"""
+        path = copy.copy(self)
+        path._blocked = bytearray(self._blocked)
+        path._distances = array('i', self._distances)
+        path._masks = bytearray(self._masks)
+        path._directions = array('b', self._directions)
+        path._best = dict(self._best)
+        path._resolved = {}
+        path._cut_cells = None
+        path._order = None
+        path.deltas = _GridDeltas(path)
+
+        return path
+
+    def _get_neighbour_directions(self, index):
+        """(tuple<tuple<int, int>, ...>) Returns (direction, offset) pairs for the neighbours of the cell
+        at 'index', where direction is the delta from the cell to the neighbour"""
+        return tuple((self.OPPOSITES[back], offset) for back, offset in self._terminals.get(index, self._neighbours))
+
+    def _update_cells(self, changed):
+        """Recalculates the best deltas of cells, after the distances of 'changed' cells have been updated
+
+        Parameters:
+            changed (list<int>): The indices of cells whose distance to the end has changed
+
+        Raises:
+            KeyError: If the end cannot be reached from the start
+        """
+        if self._distances[self._start_index] < 0:
+            raise KeyError("Cannot reach end from start")
+
+        distances = self._distances
+        masks = self._masks
+        directions = self._directions
+        codes = self._DIRECTION_CODES
+
+        # a change in distance affects the best deltas of the changed cells and their neighbours
+        cells = set(changed)
+        for index in changed:
+            cells.update(index + offset for _, offset in self._get_neighbour_directions(index))
+
+        for index in cells:
+            distance = distances[index]
+            mask = 0
+            if distance > 0 and not self._blocked[index]:
+                for direction, offset in self._get_neighbour_directions(index):
+                    if distances[index + offset] == distance - 1 and not self._blocked[index + offset]:
+                        mask |= 1 << direction
+            else:
+                distances[index] = -1 if self._blocked[index] else distance
+            masks[index] = mask
+            directions[index] = codes[mask]
+
+        # the best path may have changed anywhere along its length
+        for index in self._best:
+            directions[index] = codes[masks[index]]
+
+        self._best = self._find_best_path()
+        for index, direction in self._best.items():
+            directions[index] = direction + 1
+
+    def get_best_delta(self, cell, previous=None):
+        """(tuple<int, int>) Returns change in (column, row) position to reach next point on path
+
+        Parameters:
+            cell (tuple<int, int>): Current point on the path
+            previous (tuple<int, int>): Previous point on the path
+        """
+        if not previous:
+            delta = self._resolved.get(cell)
+            if delta is not None:
+                return delta
+
+        column, row = cell
+        width = self._width
+        if -1 <= column < width - 1 and -1 <= row < self._height - 1:
+            index = (row + 1) * width + column + 1
+            direction = self._directions[index]
+            if direction:
+                if previous and index not in self._best and previous in self.DELTA_SETS[self._masks[index]]:
+                    return previous
+
+                delta = self._resolved[cell] = self.DIRECTIONS[direction - 1]
+                return delta
+
+        raise KeyError(cell)
+
+    def get_sources(self, destination):
+        """Yields the cell(s) that flow into destination
+
+        Parameters:
+            destination (tuple<int, int>): The destination cell
+        """
+        column, row = destination
+        for dc, dr in self.DIRECTIONS:
+            source = column - dc, row - dr
+            index = self.get_index(source)
+            if index is not None and self._directions[index] and (dc, dr) in self.get_deltas_at(index):
+                yield source
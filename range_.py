@@ -14,6 +14,21 @@ class AbstractRange:
         """(bool) Returns True iff 'point' exists within this range (from origin)"""
         raise NotImplementedError("contains must be implemented by a subclass")
 
+    def contains_many(self, points):
+        """(list<bool>) Returns, for each point in 'points', True iff it exists within this range
+        (from origin)
+
+        Parameters:
+            points (iter<tuple<num, num>>): The (x, y) points to check
+        """
+        contains = self.contains
+        return [contains(point) for point in points]
+
+    def get_extent(self):
+        """(float) Returns the furthest distance a contained point can be from the origin along
+        either axis, else None if unknown"""
+        return None
+
 
 class CircularRange(AbstractRange):
     """Circular-shaped area range"""
@@ -29,6 +44,17 @@ class CircularRange(AbstractRange):
         """(bool) Returns True iff 'point' exists within this range (from origin)"""
         return vector_length(point) <= self.radius
 
+    def contains_many(self, points):
+        """(list<bool>) Returns, for each point in 'points', True iff it exists within this range
+        (from origin)"""
+        radius = self.radius
+        return [(x ** 2 + y ** 2) ** .5 <= radius for x, y in points]
+
+    def get_extent(self):
+        """(float) Returns the furthest distance a contained point can be from the origin along
+        either axis"""
+        return self.radius
+
 
 class PlusRange(AbstractRange):
     """Plus-shaped area range"""
@@ -59,6 +85,20 @@ class PlusRange(AbstractRange):
 
         return (-inn < x < inn and -out < y < out) or (-out < x < out and -inn < y < inn)
 
+    def contains_many(self, points):
+        """(list<bool>) Returns, for each point in 'points', True iff it exists within this range
+        (from origin)"""
+        inn = self.inner_radius
+        out = self.outer_radius
+
+        return [(-inn < x < inn and -out < y < out) or (-out < x < out and -inn < y < inn)
+                for x, y in points]
+
+    def get_extent(self):
+        """(float) Returns the furthest distance a contained point can be from the origin along
+        either axis"""
+        return max(self.inner_radius, self.outer_radius)
+
 
 class DonutRange(AbstractRange):
     """Donut shape area"""
@@ -75,3 +115,15 @@ class DonutRange(AbstractRange):
     def contains(self, point):
         """(bool) Returns True iff 'point' exists within this range (from origin)"""
         return self.inner_radius <= vector_length(point) <= self.outer_radius
+
+    def contains_many(self, points):
+        """(list<bool>) Returns, for each point in 'points', True iff it exists within this range
+        (from origin)"""
+        inner, outer = self.inner_radius, self.outer_radius
+        return [inner <= (x ** 2 + y ** 2) ** .5 <= outer for x, y in points]
+
+    def get_extent(self):
+        """(float) Returns the furthest distance a contained point can be from the origin along
+        either axis"""
+        return self.outer_radius
+
@@ -0,0 +1,189 @@
+"""
+Encoding of game state into compact, versioned binary snapshots
+
+Snapshots consist of a header, identifying the format & its version, followed by a
+zlib-compressed marshal payload. Objects are encoded by class & state, with classes referenced
+by "module:name" strings, and enemies referenced by integer ids, so that enemies shared between
+towers, obstacles & the game are restored as the same objects.
+"""
+
+import importlib
+import marshal
+import struct
+import zlib
+
+from core import get_attributes, set_attributes
+from enemy import AbstractEnemy
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2018, The University of Queensland"
+__license__ = "MIT"
+__version__ = "1.1.0"
+
+MAGIC = b'TDSS'
+VERSION = 6
+
+_HEADER = struct.Struct('<4sH')
+
+# Tags identifying how an encoded value is decoded
+_TUPLE = 't'
+_LIST = 'l'
+_SET = 's'
+_DICT = 'd'
+_ENEMY = 'e'
+_CLASS = 'c'
+_OBJECT = 'o'
+
+
+def pack(payload):
+    """(bytes) Returns a snapshot of 'payload', which must be encodable by marshal"""
+    return _HEADER.pack(MAGIC, VERSION) + zlib.compress(marshal.dumps(payload), 1)
+
+
+def unpack(blob):
+    """Returns the payload of a snapshot
+
+    Raises:
+        ValueError: If 'blob' is not a snapshot, or is of an unsupported version
+    """
+    if len(blob) < _HEADER.size:
+        raise ValueError("Snapshot is truncated")
+
+    magic, version = _HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("Data is not a snapshot")
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version {version} (expected {VERSION})")
+
+    return marshal.loads(zlib.decompress(blob[_HEADER.size:]))
+
+
+def get_class_reference(cls):
+    """(str) Returns the "module:name" reference to 'cls'"""
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def resolve_class_reference(reference):
+    """(type) Returns the class referenced by a "module:name" reference"""
+    module, name = reference.split(':')
+
+    cls = importlib.import_module(module)
+    for part in name.split('.'):
+        cls = getattr(cls, part)
+
+    return cls
+
+
+def get_state(obj):
+    """(dict) Returns the state of 'obj', as would be pickled, including the values of its slots"""
+    getstate = getattr(type(obj), '__getstate__', None)
+    if getstate is None or getstate is getattr(object, '__getstate__', None):
+        return get_attributes(obj)
+    return getstate(obj) or {}
+
+
+class StateEncoder:
+    """Encodes values into a form that can be packed, assigning ids to the enemies they reference"""
+
+    def __init__(self):
+        self._enemies = []
+        self._enemy_ids = {}
+
+    def encode(self, value):
+        """Returns 'value' encoded
+
+        Raises:
+            TypeError: If 'value' contains a value that cannot be encoded
+        """
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, tuple):
+            return (_TUPLE,) + tuple(self.encode(item) for item in value)
+        if isinstance(value, list):
+            return _LIST, [self.encode(item) for item in value]
+        if isinstance(value, (set, frozenset)):
+            return _SET, [self.encode(item) for item in value]
+        if isinstance(value, dict):
+            return _DICT, [(self.encode(key), self.encode(item)) for key, item in value.items()]
+        if isinstance(value, AbstractEnemy):
+            return _ENEMY, self.reference(value)
+        if isinstance(value, type):
+            return _CLASS, get_class_reference(value)
+        if not (hasattr(value, '__dict__') or hasattr(value, '__slots__')):
+            raise TypeError(f"Cannot encode {value!r}")
+
+        return _OBJECT, get_class_reference(type(value)), self.encode(get_state(value))
+
+    def reference(self, enemy):
+        """(int) Returns the id of 'enemy'"""
+        id_ = self._enemy_ids.get(enemy)
+        if id_ is None:
+            id_ = self._enemy_ids[enemy] = len(self._enemies)
+            self._enemies.append(enemy)
+        return id_
+
+    def encode_enemies(self):
+        """(list) Returns the class & state of every enemy referenced, in order of id
+
+        Must be called after all other values have been encoded
+        """
+        enemies = []
+
+        # encoding an enemy's state may reference further enemies
+        while len(enemies) < len(self._enemies):
+            enemy = self._enemies[len(enemies)]
+            enemies.append((get_class_reference(type(enemy)), self.encode(get_state(enemy))))
+
+        return enemies
+
+
+class StateDecoder:
+    """Decodes values encoded by a StateEncoder"""
+
+    def __init__(self, enemies):
+        """
+        Parameters:
+            enemies (list): The encoded enemies, as returned by StateEncoder.encode_enemies
+        """
+        classes = {}
+        self._enemies = []
+
+        # create every enemy before decoding any state, since states may reference enemies
+        for reference, _ in enemies:
+            cls = classes.get(reference)
+            if cls is None:
+                cls = classes[reference] = resolve_class_reference(reference)
+            self._enemies.append(cls.__new__(cls))
+
+        for enemy, (_, state) in zip(self._enemies, enemies):
+            enemy.__setstate__(self.decode(state))
+
+    def decode(self, value):
+        """Returns the value that 'value' was encoded from"""
+        if not isinstance(value, tuple):
+            return value
+
+        tag = value[0]
+        if tag == _TUPLE:
+            return tuple(self.decode(item) for item in value[1:])
+        if tag == _LIST:
+            return [self.decode(item) for item in value[1]]
+        if tag == _SET:
+            return {self.decode(item) for item in value[1]}
+        if tag == _DICT:
+            return {self.decode(key): self.decode(item) for key, item in value[1]}
+        if tag == _ENEMY:
+            return self._enemies[value[1]]
+        if tag == _CLASS:
+            return resolve_class_reference(value[1])
+        if tag == _OBJECT:
+            cls = resolve_class_reference(value[1])
+            obj = cls.__new__(cls)
+            state = self.decode(value[2])
+            if hasattr(obj, '__setstate__'):
+                obj.__setstate__(state)
+            else:
+                set_attributes(obj, state)
+            return obj
+
+        raise ValueError(f"Unknown tag {tag!r} in snapshot")
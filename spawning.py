@@ -0,0 +1,164 @@
+"""
+Scheduling of enemy spawns from many concurrent waves
+
+Waves are consumed lazily: each wave in progress has a single entry in a binary heap, keyed by the
+absolute time-step of its next spawn. Queueing a wave & spawning an enemy cost O(log w), for w
+waves in progress, & the next spawn is found in O(1), regardless of how many enemies remain.
+
+Waves that can be iterated more than once (e.g. lists or SubWaves, but not generators) are kept
+as the source of their handle, so a wave in progress can be re-created from its source & the
+number of enemies already spawned, without expanding the rest of the wave (which may be endless).
+"""
+
+import heapq
+from itertools import count, islice
+from operator import itemgetter
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2018, The University of Queensland"
+__license__ = "MIT"
+__version__ = "1.1.0"
+
+
+class Wave:
+    """Handle to a wave queued in a SpawnScheduler, for querying its progress or cancelling it"""
+
+    def __init__(self, total=None, spawned=0, source=None, offset=0):
+        """
+        Parameters:
+            total (int): The number of enemies in the wave, else None if unknown
+            spawned (int): The number of enemies already spawned
+            source (iter<tuple<int, *>>): The (step, spawn) pairs of the whole wave, else None if
+                                          the wave can only be iterated once
+            offset (int): The time-step the wave's steps are relative to
+        """
+        self.total = total
+        self.spawned = spawned
+        self.source = source
+        self.offset = offset
+        self.done = False  # True iff every enemy has spawned, or the wave was cancelled
+        self.cancelled = False
+
+    def __repr__(self):
+        return (f"{self.__class__.__name__}(spawned={self.spawned}, total={self.total}, done={self.done}, "
+                f"cancelled={self.cancelled})")
+
+    def get_pending(self):
+        """(int) Returns the number of enemies yet to spawn, else None if unknown"""
+        if self.done:
+            return 0
+        if self.total is None:
+            return None
+        return self.total - self.spawned
+
+
+class SpawnScheduler:
+    """Schedules the spawning of enemies from many concurrent waves, by absolute time-step"""
+
+    def __init__(self):
+        # heap of (step, sequence, spawn, spawns, offset, wave) for the next spawn of each wave in progress,
+        # where sequence numbers waves in the order they were queued, & spawns is an iterator over the
+        # remainder of the wave, with steps relative to offset
+        self._heap = []
+        self._sequence = count()
+        self._pending = 0  # The number of enemies yet to spawn from waves of known size
+
+    def get_wave_count(self):
+        """(int) Returns the number of waves in progress, which is 0 iff no enemies remain to spawn"""
+        return len(self._heap)
+
+    def queue(self, spawns, offset=0, spawned=0):
+        """Queues a wave of (step, spawn) pairs, which must be in ascending order of step
+
+        The size of the wave is known iff 'spawns' supports len. The wave can be re-created
+        (see Wave.source) iff 'spawns' can be iterated more than once.
+
+        Parameters:
+            spawns (iter<tuple<int, *>>): The wave to queue
+            offset (int): The time-step the wave's steps are relative to
+            spawned (int): The number of enemies of the wave already spawned, which are skipped,
+                           if it is being resumed
+
+        Returns:
+            Wave: A handle to the wave
+        """
+        iterator = iter(spawns)
+        source = spawns if iterator is not spawns else None
+
+        total = len(spawns) if hasattr(spawns, '__len__') else None
+        wave = Wave(total, spawned, source, offset)
+        if total is not None:
+            self._pending += total - spawned
+
+        if spawned:
+            # skip the enemies already spawned, without keeping them
+            next(islice(iterator, spawned, spawned), None)
+
+        self._queue_next(iterator, offset, wave, next(self._sequence))
+
+        return wave
+
+    def _queue_next(self, spawns, offset, wave, sequence):
+        """Queues the next spawn from the remainder of a wave, else marks the wave as done"""
+        for step, spawn in spawns:
+            heapq.heappush(self._heap, (step + offset, sequence, spawn, spawns, offset, wave))
+            return
+
+        # in case the wave was shorter than its reported size
+        self._pending -= wave.get_pending() or 0
+        wave.done = True
+
+    def peek(self):
+        """(int) Returns the time-step of the next spawn, else None if no waves are in progress"""
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, step):
+        """Yields every spawn due at or before 'step', in order of time-step, then of the order their
+        waves were queued, then of their order within their wave
+
+        Parameters:
+            step (int): The current time-step
+
+        Yield:
+            *: Each spawn that is due
+        """
+        heap = self._heap
+        while heap and heap[0][0] <= step:
+            _, sequence, spawn, spawns, offset, wave = heapq.heappop(heap)
+            wave.spawned += 1
+            if wave.total is not None:
+                self._pending -= 1
+            self._queue_next(spawns, offset, wave, sequence)
+
+            yield spawn
+
+    def cancel(self, wave):
+        """Cancels the remaining spawns of a wave
+
+        Parameters:
+            wave (Wave): The handle to the wave, as returned by queue
+        """
+        if wave.done:
+            return
+
+        self._heap = [entry for entry in self._heap if entry[5] is not wave]
+        heapq.heapify(self._heap)
+
+        self._pending -= wave.get_pending() or 0
+        wave.done = wave.cancelled = True
+
+    def clear(self):
+        """Cancels every wave in progress"""
+        for entry in self._heap:
+            entry[5].done = entry[5].cancelled = True
+        self._heap = []
+        self._pending = 0
+
+    def get_waves(self):
+        """(list<Wave>) Returns the handles of the waves in progress, in the order they were queued,
+        so re-queueing them in this order keeps the order of simultaneous spawns"""
+        return [entry[5] for entry in sorted(self._heap, key=itemgetter(1))]
+
+    def get_pending(self):
+        """(int) Returns the number of enemies yet to spawn from waves of known size"""
+        return self._pending
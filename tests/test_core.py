@@ -0,0 +1,138 @@
+"""
+Tests of the spatial queries of UnitManager
+
+Run from the repository root:
+    python -m unittest tests.test_core
+"""
+
+import random
+import unittest
+
+from core import Unit, UnitManager
+from utilities import clip_segment
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2018, The University of Queensland"
+__license__ = "MIT"
+
+GRID = (240, 200)
+CELL_SIZE = 40
+
+
+class Block(Unit):
+    """Unit of any size"""
+    __slots__ = ('position',)
+
+
+def create_units(rng, count):
+    """(list<Block>) Returns 'count' units of random sizes, at random positions on the grid"""
+    units = []
+    for _ in range(count):
+        grid_size = rng.choice(((.2, .2), (.5, .3), (1, 1), (2.5, .4)))
+        units.append(Block((rng.randrange(GRID[0]), rng.randrange(GRID[1])), grid_size, CELL_SIZE))
+    return units
+
+
+def segment_hits_box(start, end, box, thickness):
+    """(bool) Returns True iff the segment from 'start' to 'end' lies within 'thickness' of 'box'"""
+    (left, top), (right, bottom) = box
+    return clip_segment(start, end, (left - thickness, top - thickness), (right + thickness, bottom + thickness)) \
+        is not None
+
+
+class TestClipSegment(unittest.TestCase):
+
+    def test_cases(self):
+        box = (0, 0), (10, 10)
+
+        self.assertEqual(clip_segment((-5, 5), (15, 5), *box), (.25, .75))
+        self.assertEqual(clip_segment((2, 2), (8, 8), *box), (0, 1))
+        self.assertEqual(clip_segment((5, 20), (5, -20), *box), (.25, .5))
+        self.assertEqual(clip_segment((10, -5), (10, 5), *box), (.5, 1))  # along an edge
+        self.assertIsNone(clip_segment((11, 0), (11, 10), *box))
+        self.assertIsNone(clip_segment((-5, 5), (-1, 5), *box))
+        self.assertIsNone(clip_segment((-10, 5), (5, 20), *box))  # passes the corner
+
+    def test_against_sampling(self):
+        rng = random.Random(23)
+        box = (-3, 2), (7, 9)
+
+        for _ in range(300):
+            start = rng.uniform(-20, 20), rng.uniform(-20, 20)
+            end = rng.uniform(-20, 20), rng.uniform(-20, 20)
+            clipped = clip_segment(start, end, *box)
+
+            for i in range(101):
+                t = i / 100
+                x, y = start[0] + t * (end[0] - start[0]), start[1] + t * (end[1] - start[1])
+                inside = -3 <= x <= 7 and 2 <= y <= 9
+                if inside:
+                    self.assertIsNotNone(clipped)
+                    self.assertTrue(clipped[0] - 1e-9 <= t <= clipped[1] + 1e-9)
+                elif clipped is not None:
+                    self.assertFalse(clipped[0] + 1e-9 < t < clipped[1] - 1e-9)
+
+
+class TestQuerySegment(unittest.TestCase):
+    """Segment queries must return every unit whose bounding box could be within reach of the segment"""
+
+    def assert_candidates(self, index, units, start, end, thickness):
+        candidates = index.query_segment(start, end, thickness)
+        found = [unit for unit, _ in candidates]
+
+        self.assertEqual(len(found), len(set(found)))
+        for unit, ((left, top), (right, bottom)) in ((unit, unit.get_bounding_box()) for unit in units):
+            if segment_hits_box(start, end, ((left, top), (right, bottom)), thickness):
+                self.assertIn(unit, found, (start, end, thickness))
+
+        for unit, box in candidates:
+            (left, top), (right, bottom) = unit.get_bounding_box()
+            self.assertEqual(box, (left, top, right, bottom))
+
+    def test_random_segments(self):
+        rng = random.Random(23)
+        units = create_units(rng, 150)
+        index = UnitManager(GRID, cell_size=CELL_SIZE)
+        for unit in units:
+            index.add_unit(unit)
+
+        for _ in range(200):
+            start = rng.uniform(-50, GRID[0] + 50), rng.uniform(-50, GRID[1] + 50)
+            if rng.random() < .5:
+                # short, as for projectiles
+                end = start[0] + rng.uniform(-15, 15), start[1] + rng.uniform(-15, 15)
+            else:
+                end = rng.uniform(-50, GRID[0] + 50), rng.uniform(-50, GRID[1] + 50)
+
+            self.assert_candidates(index, units, start, end, rng.choice((0, 0, 5, 30)))
+
+    def test_moved_units(self):
+        """Boxes follow units as they move"""
+        rng = random.Random(24)
+        units = create_units(rng, 60)
+        index = UnitManager(GRID, cell_size=CELL_SIZE)
+        for unit in units:
+            index.add_unit(unit)
+
+        for _ in range(20):
+            for unit in units:
+                x, y = unit.position
+                unit.position = min(max(x + rng.randint(-30, 30), 0), GRID[0] - 1), \
+                    min(max(y + rng.randint(-30, 30), 0), GRID[1] - 1)
+                index.update_unit(unit)
+
+            start = rng.uniform(0, GRID[0]), rng.uniform(0, GRID[1])
+            end = rng.uniform(0, GRID[0]), rng.uniform(0, GRID[1])
+            self.assert_candidates(index, units, start, end, 0)
+
+    def test_outside_grid(self):
+        index = UnitManager(GRID, cell_size=CELL_SIZE)
+        unit = Block((20, 20), (.5, .5), CELL_SIZE)
+        index.add_unit(unit)
+
+        self.assertEqual(index.query_segment((-100, -100), (-50, -60)), [])
+        self.assertEqual([found for found, _ in index.query_segment((-100, 20), (500, 20))], [unit])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,237 @@
+"""
+Tests of the status effects applied to enemies
+
+Run from the repository root:
+    python -m unittest tests.test_effects
+"""
+
+import random
+import unittest
+
+from effects import EffectManager, Slow, StatusEffect
+from enemy import SimpleEnemy
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2018, The University of Queensland"
+__license__ = "MIT"
+
+SPEED = 1 / 12
+
+
+class Chill(StatusEffect):
+    """Effect of another class, which stacks with Slow"""
+    name = "Chill"
+
+    def __init__(self, speed_multiplier):
+        self.speed_multiplier = speed_multiplier
+
+
+class Reference:
+    """Brute force model of EffectManager, scanning every effect each time-step"""
+
+    def __init__(self):
+        self.time = 0
+        self.effects = {}  # (source, enemy): (effect, end)
+
+    def apply(self, source, enemy, effect, duration):
+        if effect.applies_to(enemy):
+            self.effects[source, enemy] = effect, self.time + duration
+
+    def advance(self, step):
+        self.time = step
+        self.effects = {key: value for key, value in self.effects.items() if value[1] >= step}
+
+    def remove_enemy(self, enemy):
+        self.effects = {key: value for key, value in self.effects.items() if key[1] is not enemy}
+
+    def remove_source(self, source):
+        self.effects = {key: value for key, value in self.effects.items() if key[0] is not source}
+
+    def get_speed(self, enemy):
+        """(float) Returns the expected grid speed of 'enemy'"""
+        multipliers = {}
+        for (_, affected), (effect, _) in self.effects.items():
+            if affected is enemy:
+                kind = type(effect)
+                multipliers[kind] = min(multipliers.get(kind, 1), effect.speed_multiplier)
+
+        speed = SPEED
+        for multiplier in multipliers.values():
+            speed *= multiplier
+        return speed
+
+
+def create_enemy(immune=False):
+    """(SimpleEnemy) Returns an enemy at the default speed"""
+    enemy = SimpleEnemy(grid_speed=SPEED)
+    enemy.immune_slow = immune
+    return enemy
+
+
+class TestEffectManager(unittest.TestCase):
+
+    def setUp(self):
+        self.effects = EffectManager()
+        self.enemy = create_enemy()
+
+    def assert_speed(self, enemy, multiplier):
+        self.assertAlmostEqual(enemy.grid_speed, SPEED * multiplier)
+        self.assertEqual(enemy.if_slowed, multiplier < 1)
+
+    def test_expiry(self):
+        """Effects last until the end of their final time-step"""
+        self.assertTrue(self.effects.apply('tower', self.enemy, Slow(.5), 10))
+        self.assert_speed(self.enemy, .5)
+
+        self.effects.advance(10)
+        self.assert_speed(self.enemy, .5)
+        self.assertEqual(len(self.effects), 1)
+
+        self.effects.advance(11)
+        self.assert_speed(self.enemy, 1)
+        self.assertEqual(len(self.effects), 0)
+
+    def test_reapply_extends(self):
+        """Re-applying the same effect extends it, rescheduling its expiry lazily"""
+        slow = Slow(.5)
+        self.effects.apply('tower', self.enemy, slow, 10)
+
+        for step in range(1, 30):
+            self.effects.advance(step)
+            self.effects.apply('tower', self.enemy, slow, 10)
+
+        # a single entry is kept for the pair, however often it is re-applied
+        self.assertEqual(len(self.effects._expiries), 1)
+        self.assertEqual(self.effects.get_effects(), [('tower', self.enemy, slow, 39)])
+
+        self.effects.advance(39)
+        self.assert_speed(self.enemy, .5)
+        self.effects.advance(40)
+        self.assert_speed(self.enemy, 1)
+        self.assertEqual(self.effects._expiries, [])
+
+    def test_replace(self):
+        """A source's new effect replaces its previous one, along with its end"""
+        self.effects.apply('tower', self.enemy, Slow(.5), 20)
+        self.effects.advance(5)
+        self.effects.apply('tower', self.enemy, Slow(.8), 2)
+        self.assert_speed(self.enemy, .8)
+
+        self.effects.advance(8)
+        self.assert_speed(self.enemy, 1)
+        self.assertEqual(len(self.effects), 0)
+
+        # the entry for the replaced effect is stale, & skipped
+        self.effects.advance(21)
+        self.assertEqual(self.effects._expiries, [])
+        self.assertEqual(self.effects._scheduled, {})
+
+    def test_strongest(self):
+        """Only the strongest effect of each class applies, & classes stack"""
+        self.effects.apply('weak', self.enemy, Slow(.8), 20)
+        self.effects.apply('strong', self.enemy, Slow(.4), 10)
+        self.assert_speed(self.enemy, .4)
+
+        self.effects.apply('chill', self.enemy, Chill(.5), 5)
+        self.assert_speed(self.enemy, .2)
+
+        self.effects.advance(6)
+        self.assert_speed(self.enemy, .4)
+        self.effects.advance(11)
+        self.assert_speed(self.enemy, .8)
+        self.effects.advance(21)
+        self.assert_speed(self.enemy, 1)
+
+    def test_immune(self):
+        immune = create_enemy(immune=True)
+
+        self.assertFalse(self.effects.apply('tower', immune, Slow(.5), 10))
+        self.assert_speed(immune, 1)
+        self.assertEqual(len(self.effects), 0)
+
+        self.assertTrue(self.effects.apply('tower', immune, Chill(.5), 10))
+        self.assert_speed(immune, .5)
+
+    def test_remove(self):
+        other = create_enemy()
+        for enemy in (self.enemy, other):
+            self.effects.apply('a', enemy, Slow(.5), 10)
+            self.effects.apply('b', enemy, Chill(.5), 10)
+
+        self.effects.remove_enemy(self.enemy)
+        self.assert_speed(self.enemy, 1)
+        self.assert_speed(other, .25)
+
+        self.effects.remove_source('a')
+        self.assert_speed(other, .5)
+        self.assertEqual(self.effects.get_effects(), [('b', other, self.effects.get_effects()[0][2], 10)])
+
+        # stale expiries of removed effects are skipped
+        self.effects.advance(11)
+        self.assertEqual(self.effects._expiries, [])
+
+    def test_clear(self):
+        other = create_enemy()
+        self.effects.apply('a', self.enemy, Slow(.5), 10)
+        self.effects.apply('b', other, Chill(.5), 10)
+
+        self.effects.clear()
+        self.assert_speed(self.enemy, 1)
+        self.assert_speed(other, 1)
+        self.assertEqual(len(self.effects), 0)
+        self.assertEqual(self.effects._expiries, [])
+
+    def test_base_speed(self):
+        """Speeds are restored exactly, however many effects come & go"""
+        self.effects.apply('a', self.enemy, Slow(1 / 3), 3)
+        self.assertEqual(self.effects.get_base_speed(self.enemy), SPEED)
+
+        for step in range(1, 50):
+            self.effects.advance(step)
+            self.effects.apply(step % 4, self.enemy, Slow(1 / (step % 7 + 1.5)), step % 5)
+
+        self.effects.advance(100)
+        self.assertEqual(self.enemy.grid_speed, SPEED)
+        self.assertFalse(self.enemy.if_slowed)
+
+    def test_against_reference(self):
+        rng = random.Random(25)
+        sources = ['a', 'b', 'c', 'd']
+        slows = [Slow(.5), Slow(.7), Chill(.6)]
+
+        for _ in range(20):
+            effects = EffectManager()
+            reference = Reference()
+            enemies = [create_enemy(immune=rng.random() < .2) for _ in range(6)]
+
+            for step in range(200):
+                effects.advance(step)
+                reference.advance(step)
+
+                for _ in range(rng.randint(0, 4)):
+                    args = rng.choice(sources), rng.choice(enemies), rng.choice(slows), rng.randint(0, 15)
+                    effects.apply(*args)
+                    reference.apply(*args)
+
+                roll = rng.random()
+                if roll < .02:
+                    source = rng.choice(sources)
+                    effects.remove_source(source)
+                    reference.remove_source(source)
+                elif roll < .04:
+                    enemy = rng.choice(enemies)
+                    effects.remove_enemy(enemy)
+                    reference.remove_enemy(enemy)
+
+                self.assertEqual(len(effects), len(reference.effects))
+                self.assertEqual({(source, enemy): (effect, end) for source, enemy, effect, end
+                                  in effects.get_effects()}, reference.effects)
+                for enemy in enemies:
+                    self.assertAlmostEqual(enemy.grid_speed, reference.get_speed(enemy))
+
+            effects.advance(1000)
+            self.assertTrue(all(enemy.grid_speed == SPEED for enemy in enemies))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Tests that the model runs headless, without tkinter or pygame
+
+Run from the repository root:
+    python -m unittest tests.test_headless
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+from levels import MyLevel
+from model import TowerGame
+from tower import MissileTower
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2018, The University of Queensland"
+__license__ = "MIT"
+
+# blocks the GUI & audio modules, imports the model & runs a wave
+HEADLESS_SCRIPT = """
+import sys
+sys.modules['tkinter'] = sys.modules['pygame'] = None
+
+import core, enemy, level, levels, model, path, snapshot, spawning, tower, utilities
+
+game = model.TowerGame()
+game.place((2, 2), tower.MissileTower)
+game.queue_wave(levels.MyLevel().get_wave(3))
+game.run_until(limit=2000)
+"""
+
+
+class RecordingSink:
+    """Sound sink that records the names of the sounds played"""
+
+    def __init__(self):
+        self.sounds = []
+
+    def play_sound(self, name):
+        self.sounds.append(name)
+
+
+class TestHeadless(unittest.TestCase):
+
+    def test_import_without_gui(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        process = subprocess.run([sys.executable, '-c', HEADLESS_SCRIPT], cwd=root, capture_output=True, text=True)
+        self.assertEqual(process.returncode, 0, process.stderr)
+
+    def test_sound_sink(self):
+        sink = RecordingSink()
+        game = TowerGame(sound_sink=sink)
+        self.assertTrue(game.place((2, 2), MissileTower))
+        game.queue_wave(MyLevel().get_wave(3))
+        game.run(300)
+
+        self.assertEqual(set(sink.sounds), {'missile'})
+
+    def test_silent_without_sink(self):
+        game = TowerGame()
+        self.assertTrue(game.place((2, 2), MissileTower))
+        game.queue_wave(MyLevel().get_wave(3))
+        game.run(300)
+
+
+if __name__ == '__main__':
+    unittest.main()
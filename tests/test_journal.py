@@ -0,0 +1,189 @@
+"""
+Tests of the change journal of TowerGame
+
+Run from the repository root:
+    python -m unittest tests.test_journal
+"""
+
+import unittest
+
+from levels import EnergyTower, MyLevel
+from model import ChangeJournal, TowerGame
+from tower import IceTower, MissileTower, PulseTower, SimpleTower
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2018, The University of Queensland"
+__license__ = "MIT"
+
+LAYOUT = (
+    ((1, 0), SimpleTower),
+    ((2, 2), MissileTower),
+    ((3, 0), PulseTower),
+    ((4, 2), IceTower),
+    ((1, 3), EnergyTower),
+    ((3, 4), SimpleTower),
+)
+
+
+def get_states(game):
+    """(dict<str: dict<Unit: tuple>>) Returns the state of every unit of each kind in 'game'"""
+    return {
+        'towers': {tower: (tower.position, tower.rotation, tower.level) for tower in game.towers.values()},
+        'enemies': {enemy: (enemy.position, enemy.health) for enemy in game.enemies},
+        'obstacles': {obstacle: obstacle.position for obstacle in game.obstacles},
+    }
+
+
+class TestChangeJournal(unittest.TestCase):
+    """Diffs are compacted as changes are reported, & folded together by changes_since"""
+
+    def test_compaction(self):
+        journal = ChangeJournal()
+        a, b, c = object(), object(), object()
+
+        journal.add('enemies', a)
+        journal.change('enemies', 'moved', a)  # changes to added units are implied
+        journal.add('enemies', b)
+        journal.remove('enemies', b)  # added & removed within the diff
+        journal.record()
+
+        changes = journal.changes_since(0)
+        self.assertEqual((changes.revision, changes.added, changes.removed, changes.moved), (1, {a}, set(), set()))
+
+        journal.change('enemies', 'moved', a)
+        journal.change('enemies', 'damaged', a)
+        journal.record()
+        journal.remove('enemies', a)
+        journal.add('obstacles', c)
+        journal.record()
+
+        changes = journal.changes_since(1)
+        self.assertEqual((changes.revision, changes.added, changes.removed), (3, {c}, {a}))
+        self.assertEqual((changes.moved, changes.damaged), (set(), set()))
+        self.assertEqual(changes.kinds, {'enemies', 'obstacles'})
+
+        # a unit added within the range of diffs is only added
+        changes = journal.changes_since(0)
+        self.assertEqual((changes.added, changes.removed), ({c}, set()))
+
+    def test_reuse(self):
+        """A unit removed & added again appears in both removed & added"""
+        journal = ChangeJournal()
+        unit = object()
+
+        journal.add('obstacles', unit)
+        journal.record()
+        journal.remove('obstacles', unit)
+        journal.record()
+        journal.add('obstacles', unit)
+        journal.change('obstacles', 'moved', unit)
+        journal.record()
+
+        changes = journal.changes_since(1)
+        self.assertEqual((changes.removed, changes.added, changes.moved), ({unit}, {unit}, set()))
+
+    def test_empty_diffs_not_recorded(self):
+        journal = ChangeJournal()
+        journal.record()
+        self.assertEqual(journal.revision, 0)
+        self.assertFalse(journal.changes_since(0))
+
+    def test_limit(self):
+        journal = ChangeJournal(limit=2)
+        for _ in range(3):
+            journal.add('towers', object())
+            journal.record()
+
+        self.assertIsNone(journal.changes_since(0))
+        self.assertEqual(len(journal.changes_since(1).added), 2)
+
+
+class TestGameJournal(unittest.TestCase):
+    """A consumer applying each diff must see the same units, in the same states, as the game"""
+
+    def assert_replay(self, game, view, revision):
+        """(int) Applies the changes to 'view' since 'revision', asserting it matches 'game', & returns
+        the revision of the changes"""
+        changes = game.changes_since(revision)
+        self.assertIsNotNone(changes)
+
+        states = get_states(game)
+        changed = changes.moved | changes.rotated | changes.upgraded | changes.damaged
+
+        for kind, units in states.items():
+            for unit in changes.removed:
+                view[kind].pop(unit, None)
+            for unit in changes.added & units.keys():
+                view[kind][unit] = units[unit]
+
+            self.assertEqual(view[kind].keys(), units.keys(), kind)
+            for unit, state in units.items():
+                if view[kind][unit] != state:
+                    self.assertIn(unit, changed | changes.added, (kind, state))
+                    view[kind][unit] = state
+
+        return changes.revision
+
+    def test_replay(self):
+        game = TowerGame()
+        for cell, tower in LAYOUT:
+            game.place(cell, tower)
+        game.queue_wave(MyLevel().get_wave(5))
+
+        game.enable_journal(limit=64)
+        view = {kind: {} for kind in ('towers', 'enemies', 'obstacles')}
+        revision = self.assert_replay(game, view, 0)
+
+        for step in range(1200):
+            if step == 300:
+                game.remove((3, 4))
+            elif step == 310:
+                game.place((3, 4), PulseTower)
+            elif step == 500:
+                tower = game.towers[(1, 0)]
+                tower.level += 1
+                game.mark_upgraded(tower)
+                game.record_changes()
+            elif step == 700:
+                game.queue_wave(MyLevel().get_wave(9), clear=True)
+
+            game.step()
+
+            # check every few steps, so diffs are folded together
+            if step % 5 == 0:
+                revision = self.assert_replay(game, view, revision)
+
+        self.assert_replay(game, view, revision)
+
+    def test_reset_and_restore(self):
+        game = TowerGame()
+        for cell, tower in LAYOUT:
+            game.place(cell, tower)
+        game.queue_wave(MyLevel().get_wave(5))
+        game.run(120)
+        blob = game.snapshot()
+
+        game.enable_journal()
+        view = {kind: {} for kind in ('towers', 'enemies', 'obstacles')}
+        revision = self.assert_replay(game, view, 0)
+
+        game.run(100)
+        game.restore(blob)
+        revision = self.assert_replay(game, view, revision)
+
+        game.reset()
+        self.assert_replay(game, view, revision)
+
+    def test_idle(self):
+        """An idle board creates no revisions"""
+        game = TowerGame()
+        game.place((1, 0), SimpleTower)
+        game.enable_journal()
+        revision = game.journal.revision
+
+        game.run(200)
+        self.assertEqual(game.journal.revision, revision)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Tests of TowerGame's updates
+
+Run from the repository root:
+    python -m unittest tests.test_model
+"""
+
+import unittest
+
+from enemy import SimpleEnemy
+from level import EnemySpawn
+from model import TowerGame
+from tower import SimpleTower
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2018, The University of Queensland"
+__license__ = "MIT"
+
+
+class CountingGame(TowerGame):
+    """Game that counts the updates of its towers, by overriding a phase of its updates"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tower_updates = 0
+
+    def _step_towers(self):
+        self.tower_updates += 1
+        super()._step_towers()
+
+
+class TestPhases(unittest.TestCase):
+    """Each update performs the game's phases as methods, so subclasses can override them"""
+
+    def create_game(self):
+        """(CountingGame) Returns a game with a tower placed"""
+        game = CountingGame()
+        self.assertTrue(game.place((1, 0), SimpleTower))
+        return game
+
+    def test_override_without_stats(self):
+        game = self.create_game()
+        game.run(20)
+
+        # the game is updated every second time-step
+        self.assertEqual(game.tower_updates, 10)
+
+    def test_override_with_stats(self):
+        game = self.create_game()
+        game.enable_stats()
+        game.run(20)
+
+        self.assertEqual(game.tower_updates, 10)
+        self.assertEqual(game.stats()['towers']['calls'], 10)
+
+        game.disable_stats()
+        game.run(20)
+        self.assertEqual(game.tower_updates, 20)
+
+
+class TestRunUntil(unittest.TestCase):
+    """Running a batch of steps must emit the same events as stepping the game"""
+
+    def create_game(self):
+        """(TowerGame, list<tuple<str, int>>) Returns a game in which enemies alternately die &
+        escape, & a list of the (event name, number of enemies) of its enemy events"""
+        game = TowerGame()
+        for cell in ((1, 0), (3, 0)):
+            self.assertTrue(game.place(cell, SimpleTower))
+
+        game.queue_wave([(step, EnemySpawn(SimpleEnemy, kwargs={'health': health}))
+                         for step, health in ((0, 10 ** 9), (150, 1), (300, 10 ** 9), (450, 1))])
+
+        events = []
+        for event in ("enemy_death", "enemy_escape"):
+            game.on(event, lambda enemies, event=event: enemies and events.append((event, len(enemies))))
+
+        return game, events
+
+    def test_events_in_step_order(self):
+        game, events = self.create_game()
+        while game.step():
+            pass
+
+        batched_game, batched_events = self.create_game()
+        result = batched_game.run_until()
+
+        self.assertEqual(events, [("enemy_death", 1), ("enemy_escape", 1)] * 2)
+        self.assertEqual(batched_events, events)
+        self.assertEqual((result.kills, result.escapes), (2, 2))
+
+
+class TestPlacement(unittest.TestCase):
+    """Placement legality must agree with searching for a path with the tower placed"""
+
+    def test_attempt_placement(self):
+        game = TowerGame()
+        for cell in ((1, 0), (1, 1), (1, 2), (3, 5), (3, 4)):
+            self.assertTrue(game.place(cell, SimpleTower))
+
+        columns, rows = game.grid.cells
+        for cell in [(column, row) for column in range(columns) for row in range(rows)]:
+            try:
+                expected = cell not in game.towers, game.generate_path(cell)
+            except KeyError:
+                expected = False, game.path
+            if not expected[0]:
+                expected = False, game.path
+
+            legal, path = game.attempt_placement(game.grid.cell_to_pixel_centre(cell))
+            self.assertEqual(legal, expected[0], cell)
+            self.assertEqual(list(path.get_best_path()), list(expected[1].get_best_path()), cell)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+Tests that GridPath finds, & repairs, the same paths as the generic Path search
+
+Run from the repository root:
+    python -m unittest tests.test_path
+"""
+
+import random
+import unittest
+
+from modules.matrix import AXIAL_DELTAS, get_adjacent_cells
+from path import GridPath, Path
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2018, The University of Queensland"
+__license__ = "MIT"
+
+SIZE = (12, 9)
+START = (-1, 4)
+END = (12, 4)
+
+
+def create_reference_path(blocked, size=SIZE, start=START, end=END):
+    """(Path) Returns the path found by the generic search, as TowerGame originally generated it"""
+    columns, rows = size
+
+    def get_neighbours(cell, from_=True):  # pylint: disable=unused-argument
+        for node in get_adjacent_cells(cell):
+            if (0 <= node[0] < columns and 0 <= node[1] < rows and node not in blocked) \
+                    or node == start or node == end:
+                yield node
+
+    return Path(start, end, get_neighbours)
+
+
+def generate_blocked(rng, size=SIZE, start=START, end=END, density=.3):
+    """(set<tuple<int, int>>) Returns random blocked cells that leave a path from 'start' to 'end'"""
+    columns, rows = size
+    blocked = set()
+
+    for cell in rng.sample([(c, r) for c in range(columns) for r in range(rows)], int(columns * rows * density)):
+        try:
+            GridPath(start, end, size, blocked | {cell})
+        except KeyError:
+            continue
+        blocked.add(cell)
+
+    return blocked
+
+
+class TestGridPath(unittest.TestCase):
+    """GridPath's direction grid must give the same deltas as Path"""
+
+    def assert_same_path(self, path, reference):
+        """Asserts that 'path' gives the same best delta as 'reference' for every cell, from every previous delta"""
+        self.assertEqual(set(path.deltas), set(reference.deltas))
+        self.assertEqual(list(path.get_best_path()), list(reference.get_best_path()))
+
+        for cell in reference.deltas:
+            if cell == reference.end:
+                continue
+
+            self.assertEqual(path.get_best_delta(cell), reference.get_best_delta(cell), cell)
+            for previous in AXIAL_DELTAS:
+                self.assertEqual(path.get_best_delta(cell, previous), reference.get_best_delta(cell, previous),
+                                 (cell, previous))
+
+    def test_best_delta_of_every_cell(self):
+        rng = random.Random(6)
+
+        for _ in range(20):
+            blocked = generate_blocked(rng)
+            self.assert_same_path(GridPath(START, END, SIZE, blocked), create_reference_path(blocked))
+
+    def test_unreachable(self):
+        blocked = {(0, row) for row in range(SIZE[1])}
+        self.assertRaises(KeyError, GridPath, START, END, SIZE, blocked)
+
+
+class TestPathRepair(unittest.TestCase):
+    """Paths repaired by with_blocked & with_unblocked must match paths searched from scratch"""
+
+    def assert_repaired(self, path, blocked):
+        """Asserts that 'path' matches the paths searched from scratch with 'blocked' cells"""
+        fresh = GridPath(START, END, SIZE, blocked)
+        TestGridPath.assert_same_path(self, path, create_reference_path(blocked))
+
+        columns, rows = SIZE
+        for cell in [(column, row) for column in range(columns) for row in range(rows)] + [START, END]:
+            self.assertEqual(path.get_distance(cell), fresh.get_distance(cell), cell)
+
+    def test_random_placements(self):
+        rng = random.Random(8)
+        cells = [(column, row) for column in range(SIZE[0]) for row in range(SIZE[1])]
+
+        for _ in range(5):
+            blocked = set()
+            path = GridPath(START, END, SIZE)
+
+            for _ in range(60):
+                cell = rng.choice(cells)
+
+                if cell in blocked:
+                    blocked.discard(cell)
+                    path = path.with_unblocked(cell)
+                else:
+                    try:
+                        repaired = path.with_blocked(cell)
+                    except KeyError:
+                        # the path is left as it was
+                        self.assertRaises(KeyError, GridPath, START, END, SIZE, blocked | {cell})
+                        self.assert_repaired(path, blocked)
+                        continue
+
+                    blocked.add(cell)
+                    path = repaired
+
+                self.assert_repaired(path, blocked)
+
+    def test_unaffected_cells(self):
+        path = GridPath(START, END, SIZE, {(3, 3)})
+
+        self.assertIs(path.with_blocked((3, 3)), path)
+        self.assertIs(path.with_blocked(START), path)
+        self.assertIs(path.with_blocked((50, 50)), path)
+        self.assertIs(path.with_unblocked((4, 4)), path)
+        self.assertIs(path.with_unblocked(END), path)
+
+
+class TestCutCells(unittest.TestCase):
+    """A cell is a cut cell iff blocking it would disconnect the start from the end"""
+
+    def assert_cut_cells(self, blocked):
+        """Asserts that the cut cells of the path with 'blocked' cells are those that disconnect it"""
+        path = GridPath(START, END, SIZE, blocked)
+
+        disconnecting = set()
+        for column in range(SIZE[0]):
+            for row in range(SIZE[1]):
+                cell = column, row
+                if cell in blocked:
+                    continue
+                try:
+                    GridPath(START, END, SIZE, blocked | {cell})
+                except KeyError:
+                    disconnecting.add(cell)
+
+        self.assertEqual(path.get_cut_cells(), disconnecting)
+
+    def test_open_grid(self):
+        self.assert_cut_cells(set())
+
+    def test_corridor(self):
+        # a wall with a single gap, which must be passed through along its row
+        blocked = {(5, row) for row in range(SIZE[1]) if row != 2}
+        self.assert_cut_cells(blocked)
+        self.assertTrue({(4, 2), (5, 2), (6, 2)} <= GridPath(START, END, SIZE, blocked).get_cut_cells())
+
+    def test_random_grids(self):
+        rng = random.Random(9)
+        for density in (.2, .4, .6):
+            for _ in range(5):
+                self.assert_cut_cells(generate_blocked(rng, density=density))
+
+    def test_repaired_paths(self):
+        rng = random.Random(10)
+        blocked = generate_blocked(rng)
+        path = GridPath(START, END, SIZE, blocked)
+
+        for cell in sorted(blocked)[:10]:
+            blocked.discard(cell)
+            path = path.with_unblocked(cell)
+            self.assertEqual(path.get_cut_cells(), GridPath(START, END, SIZE, blocked).get_cut_cells())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Tests that restoring a snapshot of a game reproduces the game exactly
+
+Run from the repository root:
+    python -m unittest tests.test_snapshot
+"""
+
+import unittest
+
+from levels import EnergyTower, MyLevel
+from model import TowerGame
+from tower import IceTower, MissileTower, PulseTower, SimpleTower
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2018, The University of Queensland"
+__license__ = "MIT"
+
+# a tower of every type, placed along the path of the default grid
+LAYOUT = (
+    ((1, 0), SimpleTower),
+    ((2, 2), MissileTower),
+    ((3, 0), PulseTower),
+    ((4, 2), IceTower),
+    ((1, 3), EnergyTower),
+    ((3, 4), SimpleTower),
+)
+
+WAVE = 5
+
+
+def get_index_order(units, index):
+    """(tuple<list<int>, list<int>>) Returns the order 'units' are found in the buckets & cells of 'index',
+    as indices into 'units'"""
+    positions = {unit: i for i, unit in enumerate(units)}
+    return tuple([positions[unit] for unit in order] for order in index.get_order())
+
+
+def describe(game):
+    """(tuple) Returns a description of the state of 'game' that any divergence would change"""
+    return (
+        game._current_step,
+        [(cell, tower.rotation, tower.cool_down.current) for cell, tower in game.towers.items()],
+        [(type(enemy).__name__, enemy.position, enemy.health, enemy.grid_speed) for enemy in game.enemies],
+        [(type(obstacle).__name__, obstacle.position) for obstacle in game.obstacles],
+        [wave.spawned for wave in game.spawn_scheduler.get_waves()],
+        get_index_order(game.enemies, game._data.enemies),
+        get_index_order(game.obstacles, game._data.obstacles),
+    )
+
+
+class TestRestore(unittest.TestCase):
+    """Restoring a snapshot then stepping must match the game the snapshot was taken of"""
+
+    def create_game(self):
+        """(TowerGame) Returns a game with every type of tower, & a wave of MyLevel queued"""
+        game = TowerGame()
+        for cell, tower in LAYOUT:
+            self.assertTrue(game.place(cell, tower), cell)
+
+        game.queue_wave(MyLevel().get_wave(WAVE))
+        return game
+
+    def assert_same_steps(self, game, restored, steps):
+        """Steps both games, asserting their states match after each step"""
+        self.assertEqual(describe(game), describe(restored))
+
+        for step in range(steps):
+            game.step()
+            restored.step()
+            self.assertEqual(describe(game), describe(restored), f"diverged {step + 1} steps after restoring")
+
+    def test_restore_mid_wave(self):
+        """Restoring into a new game at several points during a wave"""
+        game = self.create_game()
+
+        for _ in range(7):
+            game.run(29)
+            restored = TowerGame()
+            restored.restore(game.snapshot())
+            self.assertTrue(restored.enemies or restored.spawn_scheduler.get_pending())
+
+            # continue the original from the same point, so the next restore is mid-wave again
+            blob = game.snapshot()
+            self.assert_same_steps(game, restored, 150)
+            game.restore(blob)
+
+    def test_restore_in_place(self):
+        """Restoring a game to an earlier snapshot of itself"""
+        game = self.create_game()
+        game.run(100)
+        blob = game.snapshot()
+
+        other = self.create_game()
+        other.run(100)
+        game.run(250)
+        game.restore(blob)
+
+        self.assert_same_steps(other, game, 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
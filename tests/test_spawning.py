@@ -0,0 +1,172 @@
+"""
+Tests of the lazy scheduling of enemy spawns
+
+Run from the repository root:
+    python -m unittest tests.test_spawning
+"""
+
+import random
+import unittest
+
+from enemy import SimpleEnemy
+from level import AbstractLevel, EnemySpawn, RepeatingWave
+from model import TowerGame
+from spawning import SpawnScheduler
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2018, The University of Queensland"
+__license__ = "MIT"
+
+
+class CountingEnemy(SimpleEnemy):
+    """Enemy that counts the number of instances constructed"""
+    constructed = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        CountingEnemy.constructed += 1
+
+
+class TestLazyWaves(unittest.TestCase):
+    """Waves are consumed one spawn at a time, as spawns become due"""
+
+    def test_generator_consumed_as_due(self):
+        consumed = []
+
+        def generate():
+            for step in range(0, 100, 10):
+                consumed.append(step)
+                yield step, step
+
+        scheduler = SpawnScheduler()
+        wave = scheduler.queue(generate())
+
+        # only the next spawn is taken from the wave
+        self.assertEqual(consumed, [0])
+        self.assertIsNone(wave.total)
+
+        self.assertEqual(list(scheduler.pop_due(25)), [0, 10, 20])
+        self.assertEqual(consumed, [0, 10, 20, 30])
+        self.assertEqual(scheduler.peek(), 30)
+
+    def test_endless_wave(self):
+        scheduler = SpawnScheduler()
+        wave = scheduler.queue(RepeatingWave([(0, 'a'), (3, 'b')], 5), offset=100)
+
+        self.assertEqual(list(scheduler.pop_due(112)), ['a', 'b', 'a', 'b', 'a'])
+        self.assertEqual(wave.spawned, 5)
+        self.assertFalse(wave.done)
+        self.assertIsNone(wave.get_pending())
+
+    def test_resume(self):
+        """A wave re-created from its source & progress continues where it left off"""
+        spawns = RepeatingWave([(0, 'a'), (2, 'b'), (3, 'c')], 4)
+
+        scheduler = SpawnScheduler()
+        wave = scheduler.queue(spawns, offset=7)
+        list(scheduler.pop_due(12))
+        spawned = wave.spawned
+        expected = list(scheduler.pop_due(40))
+
+        resumed = SpawnScheduler()
+        resumed.queue(wave.source, wave.offset, spawned=spawned)
+        self.assertEqual(list(resumed.pop_due(40)), expected)
+
+    def test_enemies_constructed_when_spawned(self):
+        game = TowerGame()
+        before = CountingEnemy.constructed
+
+        wave = AbstractLevel.generate_sub_waves([(100, 10, CountingEnemy, (), None),
+                                                 (100, 10, CountingEnemy, (), None)])
+        self.assertEqual(len(wave), 20)
+        game.queue_wave(wave)
+        self.assertEqual(CountingEnemy.constructed, before)
+
+        game.run(60)
+        self.assertEqual(CountingEnemy.constructed - before, len(game.enemies))
+        self.assertLess(len(game.enemies), 20)
+
+        game.run(400)
+        self.assertEqual(CountingEnemy.constructed - before, 20)
+
+    def test_spawn_shared(self):
+        """A single EnemySpawn creates a new enemy each time it is spawned"""
+        spawn = EnemySpawn(SimpleEnemy, kwargs={'health': 7})
+        first, second = spawn.create(), spawn.create()
+
+        self.assertIsNot(first, second)
+        self.assertEqual((first.health, second.health), (7, 7))
+
+
+class TestSpawnScheduler(unittest.TestCase):
+    """Spawns from concurrent waves are due in order of time-step, then of the order waves were queued"""
+
+    def test_order_matches_merge(self):
+        rng = random.Random(22)
+        scheduler = SpawnScheduler()
+        expected = []
+
+        for wave_id in range(30):
+            offset = rng.randrange(50)
+            steps = sorted(rng.randrange(100) for _ in range(rng.randrange(20)))
+            wave = [(step, (wave_id, i)) for i, step in enumerate(steps)]
+            scheduler.queue(wave, offset)
+            expected.extend((step + offset, wave_id, i) for step, (_, i) in wave)
+
+        expected.sort()
+        self.assertEqual(scheduler.get_pending(), len(expected))
+
+        spawned = []
+        for step in range(0, 200, 7):
+            for wave_id, i in scheduler.pop_due(step):
+                spawned.append((wave_id, i))
+            self.assertEqual(scheduler.get_pending(), sum(1 for due, _, _ in expected if due > step))
+
+        self.assertEqual(spawned, [(wave_id, i) for _, wave_id, i in expected])
+        self.assertEqual(scheduler.get_wave_count(), 0)
+        self.assertIsNone(scheduler.peek())
+
+    def test_cancel(self):
+        scheduler = SpawnScheduler()
+        first = scheduler.queue([(0, 'a'), (10, 'a')])
+        second = scheduler.queue([(5, 'b'), (15, 'b')])
+        endless = scheduler.queue(RepeatingWave([(0, 'c')], 10), offset=2)
+
+        self.assertEqual(list(scheduler.pop_due(5)), ['a', 'c', 'b'])
+        self.assertEqual(scheduler.get_pending(), 2)
+        self.assertEqual(scheduler.get_waves(), [first, second, endless])
+
+        scheduler.cancel(second)
+        self.assertTrue(second.done and second.cancelled)
+        self.assertEqual(second.get_pending(), 0)
+        self.assertEqual(scheduler.get_pending(), 1)
+        self.assertEqual(scheduler.get_wave_count(), 2)
+
+        scheduler.cancel(second)
+        self.assertEqual(scheduler.get_pending(), 1)
+
+        self.assertEqual(list(scheduler.pop_due(20)), ['a', 'c'])
+        self.assertTrue(first.done and not first.cancelled)
+        self.assertEqual(scheduler.get_waves(), [endless])
+
+        scheduler.clear()
+        self.assertTrue(endless.cancelled)
+        self.assertEqual((scheduler.get_wave_count(), scheduler.get_pending()), (0, 0))
+
+    def test_game_waves(self):
+        game = TowerGame()
+        spawn = EnemySpawn(SimpleEnemy)
+
+        first = game.queue_wave([(step, spawn) for step in range(0, 40, 4)])
+        second = game.queue_wave([(step, spawn) for step in range(0, 40, 8)])
+        game.run(20)
+        game.cancel_wave(second)
+
+        self.assertEqual(second.spawned, 3)
+        game.run(40)
+        self.assertEqual(len(game.enemies), first.total + 3)
+        self.assertEqual(game.spawn_scheduler.get_wave_count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Tests of the retained drawing of units in the game view
+
+Run from the repository root:
+    python -m unittest tests.test_view
+"""
+
+import os
+import tkinter as tk
+import unittest
+
+from advanced_view import EnemyView
+from enemy import SimpleEnemy
+from view import GameView, RetainedCanvas
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2018, The University of Queensland"
+__license__ = "MIT"
+
+CELL_SIZE = 40
+
+
+class RecordingCanvas:
+    """Stand-in for a tk.Canvas that records the items that exist on it"""
+
+    def __init__(self):
+        self.items = {}  # id: [kind, coords, options]
+        self._next_id = 1
+
+    def __getattr__(self, name):
+        if not name.startswith('create_'):
+            raise AttributeError(name)
+        return lambda *coords, **options: self._create(name[len('create_'):], coords, options)
+
+    def _create(self, kind, coords, options):
+        id_ = self._next_id
+        self._next_id += 1
+        self.items[id_] = [kind, coords, options]
+        return id_
+
+    def coords(self, id_, *coords):
+        self.items[id_][1] = coords
+
+    def itemconfigure(self, id_, **options):
+        self.items[id_][2].update(options)
+
+    def delete(self, *ids):
+        for id_ in ids:
+            del self.items[id_]
+
+    def tag_raise(self, tag):
+        pass
+
+
+def create_enemies(count):
+    """(list<SimpleEnemy>) Returns 'count' enemies at distinct positions"""
+    enemies = []
+    for i in range(count):
+        enemy = SimpleEnemy()
+        enemy.set_cell_size(CELL_SIZE)
+        enemy.position = (20 + 10 * i, 20)
+        enemies.append(enemy)
+    return enemies
+
+
+class TestRetainedCanvas(unittest.TestCase):
+
+    def test_items_reused_between_draws(self):
+        canvas = RecordingCanvas()
+        retained = RetainedCanvas(canvas)
+        enemies = create_enemies(3)
+
+        retained.draw(enemies, EnemyView.draw)
+        ids = set(canvas.items)
+
+        enemies[0].position = (100, 100)
+        self.assertFalse(retained.draw(enemies, EnemyView.draw))
+        self.assertEqual(set(canvas.items), ids)
+
+    def test_items_recycled(self):
+        canvas = RecordingCanvas()
+        retained = RetainedCanvas(canvas)
+        enemies = create_enemies(3)
+
+        retained.draw(enemies, EnemyView.draw)
+        retained.draw(enemies[:1], EnemyView.draw)
+        hidden = [id_ for id_, (_, _, options) in canvas.items.items() if options['state'] == 'hidden']
+        self.assertEqual(len(hidden), 4)
+
+        # new units take hidden items, rather than creating more
+        retained.draw(create_enemies(3), EnemyView.draw)
+        self.assertEqual(len(canvas.items), 6 + 2)
+
+    def test_clear(self):
+        canvas = RecordingCanvas()
+        retained = RetainedCanvas(canvas)
+        enemies = create_enemies(3)
+
+        retained.draw(enemies, EnemyView.draw)
+        retained.draw(enemies[:1], EnemyView.draw)
+        retained.clear()
+        self.assertEqual(canvas.items, {})
+
+        # nothing is reused once cleared
+        retained.draw(enemies, EnemyView.draw)
+        self.assertEqual(len(canvas.items), 6)
+
+
+@unittest.skipUnless(os.environ.get('DISPLAY') or os.name == 'nt', "requires a display")
+class TestGameView(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tk.Tk()
+        self.view = GameView(self.root, size=(6, 6), cell_size=CELL_SIZE)
+
+    def tearDown(self):
+        self.root.destroy()
+
+    def test_clear_units(self):
+        self.view.draw_enemies(create_enemies(3))
+        self.assertEqual(len(self.view.find_withtag('enemy')), 6)
+
+        self.view.clear_units()
+        self.assertEqual(self.view.find_withtag('enemy'), ())
+
+
+if __name__ == '__main__':
+    unittest.main()
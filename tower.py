@@ -5,22 +5,21 @@ All towers should inherit from AbstractTower (either directly or from one of its
 """
 
 import math
+from array import array
 from typing import Union
 
-from core import Unit, Point2D, UnitManager
+from core import Unit, Point2D, UnitManager, get_attributes, set_attributes
+from effects import Slow
 from enemy import AbstractEnemy
 from range_ import AbstractRange, CircularRange, PlusRange, DonutRange
 from utilities import Countdown, euclidean_distance, rotate_toward, angle_between, polar_to_rectangular, \
-    rectangles_intersect
-from soundhandler import SoundHandler
+    clip_segment
 
 __author__ = "Benjamin Martin"
 __copyright__ = "Copyright 2018, The University of Queensland"
 __license__ = "MIT"
 __version__ = "1.1.1"
 
-# sound effect for misslie
-soundhandler = SoundHandler()
 
 class AbstractTower(Unit):
     """Abstract representation for a tower"""
@@ -37,6 +36,8 @@ class AbstractTower(Unit):
 
     range: AbstractRange
 
+    target_limit = 0  # The number of targets needed each step, or 0 for every enemy in range
+
     def __init__(self, cell_size: int, grid_size=(.9, .9), rotation=math.pi * .25, base_damage=1, level: int = 1):
         super().__init__(None, grid_size, cell_size)
 
@@ -72,19 +73,46 @@ class AbstractTower(Unit):
         
         Parameters:
             enemies (UnitManager): All enemies in the game
-            
+            limit (int): The maximum number of enemies to yield, or 0 for no limit
+
         Note:
-            For efficiency, method could be extended to first convert to potentially
-            valid buckets, and only search those rather than iterating through every enemy.
+            Only buckets that this tower's range can reach are searched, nearest first, and
+            each bucket is checked against the range in a single batch.
+            Ranges of unknown extent fall back to searching every bucket.
         """
+        extent = self.range.get_extent()
+
+        if extent is None:
+            buckets = [enemies.get_closish(self.position)]
+        else:
+            buckets = enemies.get_buckets_in_radius(self.position, extent * self.cell_size)
 
         count = 0
-        for enemy in enemies.get_closish(self.position):
-            if self.is_position_in_range(enemy.position):
+        for bucket in buckets:
+            if not bucket:
+                continue
+
+            for enemy in self.units_in_range_batch(bucket):
                 yield enemy
                 count += 1
                 if limit == count:
-                    break
+                    return
+
+    def units_in_range_batch(self, units):
+        """(list<Unit>) Returns the units in 'units' that are in-range of this tower, in order
+
+        Parameters:
+            units (iter<Unit>): The candidate units to check
+        """
+        units = list(units)
+
+        x, y = self.position
+        cell_size = self.cell_size
+
+        offsets = [((unit_x - x) / cell_size, (unit_y - y) / cell_size)
+                   for unit_x, unit_y in (unit.position for unit in units)]
+
+        return [unit for unit, in_range in zip(units, self.range.contains_many(offsets)) if in_range]
 
     def get_unit_in_range(self, units) -> Union[AbstractEnemy, None]:
         """(AbstractEnemy) Returns an enemy that is in-range of this tower, else None if no
@@ -96,7 +124,35 @@ class AbstractTower(Unit):
 
         return None
 
-    def _get_target(self, units) -> Union[AbstractEnemy, None]:
+    def get_targets(self, data, limit=0):
+        """(list<AbstractEnemy>) Returns the enemies that are in-range of this tower, using the
+        targets found for this tower in the current step if possible
+
+        Targets found for the current step are limited to this tower's target_limit.
+        The result must not be modified.
+
+        Parameters:
+            data (GameData): The game data this tower is being stepped with
+            limit (int): The maximum number of enemies to return, or 0 for no limit
+        """
+        targets = data.targets.get(self) if data.targets is not None else None
+
+        if targets is None:
+            return list(self.get_units_in_range(data.enemies, limit=limit))
+
+        return targets[:limit] if limit else targets
+
+    def get_target(self, data) -> Union[AbstractEnemy, None]:
+        """(AbstractEnemy) Returns an enemy that is in-range of this tower, else None if no
+        such enemy is in range
+
+        Parameters:
+            data (GameData): The game data this tower is being stepped with
+        """
+        targets = self.get_targets(data, limit=1)
+        return targets[0] if targets else None
+
+    def _get_target(self, data) -> Union[AbstractEnemy, None]:
         """Returns previous target, else selects new one if previous is invalid
         
         Invalid target is one of:
@@ -111,7 +167,7 @@ class AbstractTower(Unit):
         if self._target is None \
                 or self._target.is_dead() \
                 or not self.is_position_in_range(self._target.position):
-            self._target = self.get_unit_in_range(units)
+            self._target = self.get_target(data)
 
         return self._target
 
@@ -127,6 +183,8 @@ class SimpleTower(AbstractTower):
     base_cost = 20
     level_cost = 15
 
+    target_limit = 1
+
     rotation_threshold = (1 / 6) * math.pi
 
     def __init__(self, cell_size: int, grid_size=(.9, .9), rotation=math.pi * .25, base_damage=1, level: int = 1):
@@ -136,7 +194,7 @@ class SimpleTower(AbstractTower):
         """Rotates toward 'target' and attacks if possible"""
         self.cool_down.step()
 
-        target = self.get_unit_in_range(data.enemies)
+        target = self.get_target(data)
 
         if target is None:
             return
@@ -150,8 +208,19 @@ class SimpleTower(AbstractTower):
 
 
 class AbstractObstacle(Unit):
-    """An obstacle created by a tower"""
-    speed = None
+    """An obstacle created by a tower
+
+    Obstacles are short-lived, so rather than being constructed directly, they should be acquired
+    from their class' pool, & released back to it once removed from the game
+
+    Subclasses with __slots__ declare slots for position, speed, rotation & damage, unless they
+    store them elsewhere (e.g. missiles, in a MissileTable, through properties)
+    """
+    __slots__ = ('grid_speed',)
+
+    sound = None  # name of the sound effect to play when the obstacle is created, if any
+
+    pool_size = 256  # The maximum number of released obstacles kept for reuse, per class
 
     def __init__(self, position, grid_size, cell_size, grid_speed: Union[int, float] = 0, rotation=0, damage=0):
         self.grid_speed = grid_speed
@@ -166,6 +235,45 @@ class AbstractObstacle(Unit):
         super().set_cell_size(cell_size)
         self.speed = cell_size * self.grid_speed
 
+    @classmethod
+    def acquire(cls, *args, **kwargs):
+        """(AbstractObstacle) Returns a new obstacle of this class, reusing a released one if possible
+
+        Parameters are as for the constructor
+        """
+        pool = cls.__dict__.get('_pool')
+        if not pool:
+            return cls(*args, **kwargs)
+
+        obstacle = pool.pop()
+        obstacle._reinit(*args, **kwargs)
+        return obstacle
+
+    def _reinit(self, *args, **kwargs):
+        """Re-initialises this released obstacle for reuse by acquire, as if constructed with the same parameters
+
+        Subclasses that keep state for reuse (see reset) override this to reinitialise all other state
+        """
+        self.__init__(*args, **kwargs)
+
+    def release(self):
+        """Releases this obstacle to its class' pool, once it has been removed from the game
+
+        The obstacle must not be used again, as it may be reused by acquire. A reused obstacle keeps
+        its identity, so its reuse is journaled as a removal followed by an addition (see model.Changes)
+        """
+        cls = type(self)
+        pool = cls.__dict__.get('_pool')
+        if pool is None:
+            pool = cls._pool = []
+
+        if len(pool) < self.pool_size:
+            self.reset()
+            pool.append(self)
+
+    def reset(self):
+        """Drops any references to other units held by this obstacle, before it is pooled"""
+
     def step(self, units):
         """Performs a time step for this obstacle
         
@@ -181,23 +289,124 @@ class AbstractObstacle(Unit):
 
 
 class Missile(AbstractObstacle):
-    """A simple projectile fired from a MissileTower"""
+    """A simple projectile fired from a MissileTower
+
+    While in play, a missile's state may be stored in a row of a MissileTable, which steps many
+    missiles at once, and the missile acts as a handle to that row. Otherwise, state is stored
+    on the missile itself.
+    """
     name = "Missile"
     colour = '#F5F0E5'  # Eburnean
+    sound = 'missile'
+
+    __slots__ = ('target', '_table', '_row', '_position', '_rotation', '_speed', '_damage')
 
     rotation_threshold = (1 / 3) * math.pi
 
     def __init__(self, position, cell_size, target: AbstractEnemy, size=.2,
                  rotation: Union[int, float] = 0, grid_speed=.1, damage=10):
+        self._table = None  # The MissileTable storing this missile's state, else None
+        self._row = None  # The row of _table storing this missile's state
+
         super().__init__(position, (size, 0), cell_size, grid_speed=grid_speed, rotation=rotation, damage=damage)
         self.target = target
-        
-        soundhandler.play_sound('missile')
+
+    # state that is stored in a row of a MissileTable while in play
+    _TABLE_FIELDS = ('position', 'rotation', 'speed', 'damage')
+
+    def __getstate__(self):
+        """(dict) Returns the state of this missile, detached from any MissileTable"""
+        state = get_attributes(self)
+        state.pop('_table', None)
+        state.pop('_row', None)
+
+        for name in self._TABLE_FIELDS:
+            state['_' + name] = getattr(self, name)
+
+        return state
+
+    def __setstate__(self, state):
+        """Sets the state of this missile, which is detached from any MissileTable, to 'state'"""
+        self._table = self._row = None
+        set_attributes(self, state)
+
+    @property
+    def position(self):
+        """(tuple<num, num>) The (x, y) pixel position of this missile"""
+        table = self._table
+        if table is None:
+            return self._position
+
+        row = self._row
+        return table.x[row], table.y[row]
+
+    @position.setter
+    def position(self, position):
+        table = self._table
+        if table is None:
+            self._position = position
+            return
+
+        row = self._row
+        table.x[row], table.y[row] = position
+
+    @property
+    def rotation(self):
+        """(float) The angle this missile is travelling at, in radians"""
+        table = self._table
+        if table is None:
+            return self._rotation
+        return table.rotation[self._row]
+
+    @rotation.setter
+    def rotation(self, rotation):
+        table = self._table
+        if table is None:
+            self._rotation = rotation
+        else:
+            table.rotation[self._row] = rotation
+
+    @property
+    def speed(self):
+        """(float) The number of pixels this missile travels each step"""
+        table = self._table
+        if table is None:
+            return self._speed
+        return table.speed[self._row]
+
+    @speed.setter
+    def speed(self, speed):
+        table = self._table
+        if table is None:
+            self._speed = speed
+        else:
+            table.speed[self._row] = speed
+
+    @property
+    def damage(self):
+        """(num) The damage this missile inflicts on its target"""
+        table = self._table
+        if table is None:
+            return self._damage
+        return table.damage[self._row]
+
+    @damage.setter
+    def damage(self, damage):
+        table = self._table
+        if table is None:
+            self._damage = damage
+        else:
+            table.damage[self._row] = damage
+
+    def reset(self):
+        """Drops the target of this missile, before it is pooled"""
+        self.target = None
 
     def step(self, units):
         """Performs a time step for this missile
 
-        Moves towards target and damages if collision occurs
+        Moves towards target and damages if collision occurs, including if the missile passes
+        through the target during the step
         If target is dead, this missile expires
 
         Parameters:
@@ -223,12 +432,189 @@ class Missile(AbstractObstacle):
         self.rotation = rotate_toward(self.rotation, angle, self.rotation_threshold)
 
         dx, dy = polar_to_rectangular(self.speed, self.rotation)
-        x, y = self.position
+        x, y = old_position = self.position
         self.position = x + dx, y + dy
 
+        # fast missiles may pass through their target between steps
+        if clip_segment(old_position, self.position, *self.target.get_bounding_box()) is not None:
+            self.target.damage(self.damage, 'explosive')
+            return False, None
+
         return True, None
 
 
+class MissileTable:
+    """Struct-of-arrays storage for the state of missiles in play, which steps missiles in bulk
+
+    Each missile added to the table occupies a row across a number of contiguous, typed columns:
+        x, y (float64): The pixel position of the missile
+        rotation (float64): The angle the missile is travelling at, in radians
+        speed (float64): The number of pixels the missile travels each step
+        damage (float64): The damage the missile inflicts on its target
+
+    Targets are kept on the missiles themselves. Rows are kept dense; only the first len(table)
+    rows of each column are in use.
+    """
+    COLUMNS = (
+        ('x', 'd'),
+        ('y', 'd'),
+        ('rotation', 'd'),
+        ('speed', 'd'),
+        ('damage', 'd'),
+    )
+
+    def __init__(self, capacity=64):
+        """Constructor
+
+        Parameters:
+            capacity (int): The number of rows to initially allocate
+        """
+        self._size = 0
+        self._capacity = capacity
+
+        for name, typecode in self.COLUMNS:
+            setattr(self, name, array(typecode, [0]) * capacity)
+
+        self.missiles = []  # The missile occupying each row
+
+    def __len__(self):
+        """(int) Returns the number of missiles in this table"""
+        return self._size
+
+    def __contains__(self, obstacle):
+        """(bool) Returns True iff 'obstacle' is a missile in this table"""
+        return getattr(obstacle, '_table', None) is self
+
+    def _grow(self):
+        """Doubles the number of allocated rows"""
+        extra = self._capacity
+
+        for name, typecode in self.COLUMNS:
+            getattr(self, name).extend(array(typecode, [0]) * extra)
+
+        self._capacity += extra
+
+    @staticmethod
+    def supports(obstacle):
+        """(bool) Returns True iff 'obstacle' can be stepped by a MissileTable
+
+        Only missiles that are stepped as by Missile.step are supported, so subclasses that
+        override step are left to be stepped individually
+        """
+        return isinstance(obstacle, Missile) and type(obstacle).step is Missile.step
+
+    def add(self, missile: Missile):
+        """Moves the state of 'missile' into a new row, making 'missile' a handle to it
+
+        Precondition:
+            'missile' is supported (see supports) & is not already in a table
+        """
+        # pylint: disable=protected-access
+        if self._size == self._capacity:
+            self._grow()
+
+        row = self._size
+
+        self.x[row], self.y[row] = missile.position
+        self.rotation[row] = missile.rotation
+        self.speed[row] = missile.speed
+        self.damage[row] = missile.damage
+
+        self.missiles.append(missile)
+        self._size += 1
+
+        missile._table = self
+        missile._row = row
+
+    def remove(self, missile: Missile):
+        """Moves the state of 'missile' out of this table, back onto 'missile'
+
+        The last row is moved into the row that is vacated.
+
+        Raises:
+            ValueError if 'missile' is not in this table
+        """
+        # pylint: disable=protected-access
+        if missile._table is not self:
+            raise ValueError(f"{missile} is not in this table")
+
+        row = missile._row
+        position, rotation, speed, damage = missile.position, missile.rotation, missile.speed, missile.damage
+
+        missile._table = missile._row = None
+        missile.position, missile.rotation, missile.speed, missile.damage = position, rotation, speed, damage
+
+        last = self._size - 1
+        if row != last:
+            for name, _ in self.COLUMNS:
+                column = getattr(self, name)
+                column[row] = column[last]
+
+            moved = self.missiles[row] = self.missiles[last]
+            moved._row = row
+
+        self.missiles.pop()
+        self._size -= 1
+
+    def clear(self):
+        """Removes every missile from this table"""
+        while self.missiles:
+            self.remove(self.missiles[-1])
+
+    def step(self, missiles):
+        """Performs a time step for each of 'missiles', in order, exactly as Missile.step would
+
+        Parameters:
+            missiles (list<Missile>): Missiles in this table to step
+
+        Return:
+            list<bool>: For each missile, True if it should persist in the game (else will be removed)
+        """
+        # pylint: disable=protected-access
+        xs, ys, rotations, speeds, damages = self.x, self.y, self.rotation, self.speed, self.damage
+        atan2, cos, sin, pi = math.atan2, math.cos, math.sin, math.pi
+        tau = 2 * pi
+
+        persists = []
+        for missile in missiles:
+            target = missile.target
+            if target.is_dead():
+                persists.append(False)
+                continue
+
+            row = missile._row
+            x, y = xs[row], ys[row]
+            target_x, target_y = target.position
+            speed = speeds[row]
+
+            if ((x - target_x) ** 2 + (y - target_y) ** 2) ** .5 <= speed:
+                target.damage(damages[row], 'explosive')
+                persists.append(False)
+                continue
+
+            # rotate toward target (as rotate_toward) and move
+            angle = atan2(target_y - y, target_x - x)
+            rotation = rotations[row]
+            delta_angle = ((angle - rotation + pi) % tau) - pi
+
+            threshold = type(missile).rotation_threshold
+            if abs(delta_angle) > threshold:
+                angle = rotation + threshold if delta_angle > 0 else rotation - threshold
+
+            rotations[row] = angle
+            xs[row] = new_x = x + speed * cos(angle)
+            ys[row] = new_y = y + speed * sin(angle)
+
+            if clip_segment((x, y), (new_x, new_y), *target.get_bounding_box()) is not None:
+                target.damage(damages[row], 'explosive')
+                persists.append(False)
+                continue
+
+            persists.append(True)
+
+        return persists
+
+
 class MissileTower(SimpleTower):
     """A tower that fires missiles that track a target"""
     name = 'Missile Tower'
@@ -248,30 +634,11 @@ class MissileTower(SimpleTower):
 
         self._target: AbstractEnemy = None
 
-    def _get_target(self, units) -> Union[AbstractEnemy, None]:
-        """Returns previous target, else selects new one if previous is invalid
-        
-        Invalid target is one of:
-            - dead
-            - out-of-range
-        
-        Return:
-            AbstractEnemy: Returns previous target, unless it is non-existent or invalid (see above),
-                           Otherwise, selects & returns new target if a valid one can be found,
-                           Otherwise, returns None
-        """
-        if self._target is None \
-                or self._target.is_dead() \
-                or not self.is_position_in_range(self._target.position):
-            self._target = self.get_unit_in_range(units)
-
-        return self._target
-
     def step(self, units):
         """Rotates toward 'target' and fires missile if possible"""
         self.cool_down.step()
 
-        target = self._get_target(units.enemies)
+        target = self._get_target(units)
 
         if target is None:
             return None
@@ -288,8 +655,8 @@ class MissileTower(SimpleTower):
         self.cool_down.start()
 
         # Spawn missile on tower
-        missile = Missile(self.position, self.cell_size, target, rotation=self.rotation,
-                          damage=self.get_damage(), grid_speed=.3)
+        missile = Missile.acquire(self.position, self.cell_size, target, rotation=self.rotation,
+                                  damage=self.get_damage(), grid_speed=.3)
 
         # Move missile to outer edge of tower
         radius = self.grid_size[0] / 2
@@ -311,20 +678,33 @@ class Pulse(AbstractObstacle):
 
     DIRECTIONS = [NORTH, EAST, SOUTH, WEST]
 
+    __slots__ = ('position', 'speed', 'rotation', 'damage', 'direction', '_damaged', '_hit_count')
+
     def __init__(self, position, cell_size, direction, size=.04,
                  rotation: Union[int, float] = 0, grid_speed=.15, damage=50, hits=20):
+        self._damaged = set()
+        self._reinit(position, cell_size, direction, size=size, rotation=rotation, grid_speed=grid_speed,
+                     damage=damage, hits=hits)
+
+    def _reinit(self, position, cell_size, direction, size=.04,
+                rotation: Union[int, float] = 0, grid_speed=.15, damage=50, hits=20):
+        """Initialises all state of this pulse but its set of damaged enemies, which is kept (emptied by
+        reset) while this pulse is pooled"""
         super().__init__(position, (size, 0), cell_size, grid_speed=grid_speed, rotation=rotation, damage=damage)
 
         self.direction = direction
-        self._damaged = set()
         self._hit_count = hits
 
+    def reset(self):
+        """Forgets the enemies damaged by this pulse, before it is pooled"""
+        self._damaged.clear()
+
     def step(self, units):
         """Performs a time step for this pulse
 
         Moves according to direction, damaging any enemies that are collided with along the way
         If hits is non-zero, this pulse expires if it has the number of enemies hit is at least 'hits',
-        else continues until off the grid
+        else continues until off the grid, where it expires regardless
 
         Parameters:
             units.enemies (UnitManager): The unit manager to select targets from
@@ -334,41 +714,32 @@ class Pulse(AbstractObstacle):
                 - persist (bool): True if the obstacle should persist in the game (else will be removed)
                 - new_obstacles (list[AbstractObstacle]): A list of new obstacles to add to the game, or None
         """
-        dx, dy = tuple(self.speed * i for i in self.direction)
+        direction_x, direction_y = self.direction
+        dx, dy = self.speed * direction_x, self.speed * direction_y
 
-        x, y = old_position = self.position
-        self.position = new_position = x + dx, y + dy
+        x1, y1 = old_position = self.position
+        x2, y2 = self.position = new_position = x1 + dx, y1 + dy
 
-        try:
-            old_bucket = units.enemies.get_bucket_for_position(old_position)
-            new_bucket = units.enemies.get_bucket_for_position(self.position)
-        except IndexError:
-            return False, None
+        # pulses travel along an axis, so their path is its own bounding box
+        left, right = min(x1, x2), max(x1, x2)
+        top, bottom = min(y1, y2), max(y1, y2)
 
-        for enemy in old_bucket.union(new_bucket):
-            if enemy in self._damaged:
+        damaged = self._damaged
+        for enemy, (enemy_left, enemy_top, enemy_right, enemy_bottom) in \
+                units.enemies.query_segment(old_position, new_position):
+            if enemy in damaged:
                 continue
 
-            x1, y1 = old_position
-            x2, y2 = new_position
-
-            if x2 < x1:
-                x1, x2 = x2, x1
-
-            if y2 < y1:
-                y1, y2 = y2, y1
+            if left > enemy_right or right < enemy_left or top > enemy_bottom or bottom < enemy_top:
+                continue
 
-            tl1, br1 = (x1, y1), (x2, y2)
-            tl2, br2 = enemy.get_bounding_box()
+            enemy.damage(self.damage, 'pulse')
+            damaged.add(enemy)
 
-            if rectangles_intersect(tl1, br1, tl2, br2):
-                enemy.damage(self.damage, 'pulse')
-                self._damaged.add(enemy)
+            if self._hit_count and len(damaged) >= self._hit_count:
+                return False, None
 
-                if self._hit_count and len(self._damaged) >= self._hit_count:
-                    return False, None
-
-        return True, None
+        return units.grid.is_pixel_valid(new_position), None
 
 
 class PulseTower(AbstractTower):
@@ -383,6 +754,8 @@ class PulseTower(AbstractTower):
 
     range = PlusRange(0.5, 1.5)
 
+    target_limit = 1
+
     def step(self, units):
         """Fires pulses"""
         self.cool_down.step()
@@ -390,7 +763,7 @@ class PulseTower(AbstractTower):
         if not self.cool_down.is_done():
             return None
 
-        target = self.get_unit_in_range(units.enemies)
+        target = self.get_target(units)
 
         if target is None:
             return None
@@ -400,7 +773,7 @@ class PulseTower(AbstractTower):
         pulses = []
 
         for direction in Pulse.DIRECTIONS:
-            pulse = Pulse(self.position, self.cell_size, direction)
+            pulse = Pulse.acquire(self.position, self.cell_size, direction)
             pulse.move_by(Point2D(*direction) * (.4 * self.cell_size))
             pulses.append(pulse)
 
@@ -417,37 +790,21 @@ class IceTower(AbstractTower):
     base_cost = 30
     level_cost = 15
 
+    target_limit = 50
+
+    slow = Slow(.5)  # Slows don't stack, so enemies in range of many ice towers are slowed only once
+    slow_duration = 2  # The number of time-steps a slow lasts for, re-applied every update while in range
+
     def __init__(self, cell_size: int, grid_size=(.8, .8), rotation=math.pi * .25, base_damage=0, level: int = 1):
         super().__init__(cell_size, grid_size, rotation, base_damage, level)
-        self._entered = []
 
     def step(self, data):
-        self.cool_down.step()
+        """Slows the enemies in range, until shortly after they leave it
 
-        target = self.get_units_in_range(data.enemies, limit = 50)
-
-        if target is None:
-            return
+        Parameters:
+            data.effects (EffectManager): The manager to apply the slow through
+        """
+        self.cool_down.step()
 
-        # if target in range but not in entered[list], slow it down and keep track on who has been in the range.
-        # if the enemy is slowed, its if_slowed value will be alter to be True
-        # because too many ice tower will eventually stop the enemy by doing so, we can make sure it will be slowed only once
-        # if the target is already in range, it won't be slowed
-        for t in target:
-            if t not in self._entered:
-                # check if enemy is already slowed or it it immune to ice
-                if not t.if_slowed and not t.immune_slow:
-                    t.grid_speed *=0.5
-                    t.if_slowed = True
-                self._entered.append(t)
-            else:
-                pass
-        try:
-            # if first target in the list is out of range or die, pop it
-            if not self.is_position_in_range(self._entered[0].position) or self._entered[0].is_dead():
-                if self._entered[0].if_slowed:
-                    self._entered[0].grid_speed /= 0.5
-                    self._entered[0].if_slowed = False
-                    self._entered.pop(0)
-        except(IndexError):
-            pass
+        for enemy in self.get_targets(data, limit=self.target_limit):
+            data.effects.apply(self, enemy, self.slow, self.slow_duration)
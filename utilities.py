@@ -3,10 +3,12 @@ General & Geometric Utilities
 """
 
 import math
-import tkinter as tk
-from typing import Union, Tuple
+from typing import Union, Tuple, TYPE_CHECKING
 from inspect import getmembers, isfunction
 
+if TYPE_CHECKING:
+    import tkinter as tk
+
 __author__ = "Benjamin Martin and Brae Webb"
 __copyright__ = "Copyright 2018, The University of Queensland"
 __license__ = "MIT"
@@ -71,6 +73,38 @@ def rectangles_intersect(top_left1: Point2D_T, bottom_right1: Point2D_T,
     return not (left1 > right2 or right1 < left2 or top1 > bottom2 or bottom1 < top)
 
 
+def clip_segment(start: Point2D_T, end: Point2D_T,
+                 top_left: Point2D_T, bottom_right: Point2D_T) -> Union[Tuple[float, float], None]:
+    """(tuple<float, float>) Returns the range (t0, t1) of the parameter t, in [0, 1], for which the
+    point start + t * (end - start) lies within a rectangle (inclusive of its edges), else None if
+    the segment from 'start' to 'end' doesn't intersect the rectangle
+
+    Parameters:
+        start (tuple<num, num>): The start position of the segment
+        end (tuple<num, num>): The end position of the segment
+        top_left (tuple<num, num>): The top-left corner position of the rectangle
+        bottom_right (tuple<num, num>): The bottom-right corner position of the rectangle
+    """
+    t0, t1 = 0., 1.
+
+    # narrow the range of t by each axis in turn (Liang-Barsky)
+    for origin, delta, low, high in zip(start, (end[0] - start[0], end[1] - start[1]), top_left, bottom_right):
+        if delta == 0:
+            if origin < low or origin > high:
+                return None
+            continue
+
+        near, far = (low - origin) / delta, (high - origin) / delta
+        if near > far:
+            near, far = far, near
+
+        t0, t1 = max(t0, near), min(t1, far)
+        if t0 > t1:
+            return None
+
+    return t0, t1
+
+
 def rotate_point(point, angle):
     """(float, float) Returns result of rotating 'point' by 'angle' radians
     
@@ -155,7 +189,7 @@ class Stepper:
     Can be stopped/paused
     """
 
-    def __init__(self, master: Union[tk.Widget, tk.Tk], delay: int = 30):
+    def __init__(self, master: Union['tk.Widget', 'tk.Tk'], delay: int = 30):
         """Constructor
         
         Parameters:
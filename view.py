@@ -9,6 +9,155 @@ __copyright__ = "Copyright 2018, The University of Queensland"
 __license__ = "MIT"
 __version__ = "1.1.0"
 
+# Tags of the layers of units, from bottom to top
+LAYERS = ('enemy', 'tower', 'shadow', 'obstacle')
+
+
+def _flatten(values):
+    """(tuple) Returns the values in nested tuples/lists of coordinates, as a flat tuple"""
+    flat = []
+    for value in values:
+        if isinstance(value, (tuple, list)):
+            flat.extend(_flatten(value))
+        else:
+            flat.append(value)
+    return tuple(flat)
+
+
+class RetainedCanvas:
+    """Canvas that draws units by updating the items drawn for them previously, rather than creating new items
+
+    View draw methods are given this in place of a canvas. Each item a draw method creates for a
+    unit is matched, in order, with the item it created for that unit last time: its coordinates &
+    options are only updated if they've changed. Items left over when units stop being drawn are
+    hidden & recycled, rather than deleted.
+
+    Other methods are passed through to the canvas.
+    """
+
+    def __init__(self, canvas):
+        """
+        Parameters:
+            canvas (tk.Canvas): The canvas to draw on
+        """
+        self._canvas = canvas
+
+        # unit: [[kind, id, coords, options], ...] of the items drawn for each unit
+        self._items = {}
+        # (kind, option names): ids of hidden items available for reuse
+        self._free = {}
+
+        self._unit_items = None  # items drawn for the unit being drawn
+        self._index = 0  # number of items drawn for the unit being drawn
+        self._restack = False  # True iff the unit being drawn has recycled items, which may be stacked out of order
+        self._new = False  # True iff any new or recycled items have been drawn
+
+    def __getattr__(self, name):
+        if name.startswith('create_'):
+            kind = name[len('create_'):]
+            return lambda *args, **kwargs: self._create(kind, args, kwargs)
+        return getattr(self._canvas, name)
+
+    def draw(self, units, draw):
+        """Draws units, recycling the items of any units that are no longer drawn
+
+        Parameters:
+            units (iter<Unit>): The units to draw
+            draw (callable(canvas, unit)): Draws a unit on a canvas
+
+        Returns:
+            bool: True iff any new items were drawn, in which case the stacking of layers may need restoring
+        """
+        canvas = self._canvas
+        previous = self._items
+        self._items = items = {}
+        self._new = False
+
+        for unit in units:
+            self._unit_items = items[unit] = previous.pop(unit, [])
+            self._index = 0
+            self._restack = False
+
+            draw(self, unit)
+
+            self._release(self._unit_items[self._index:])
+            del self._unit_items[self._index:]
+
+            # keep the unit's items stacked in the order they were drawn
+            if self._restack:
+                for item in self._unit_items:
+                    canvas.tag_raise(item[1])
+
+        for unit_items in previous.values():
+            self._release(unit_items)
+
+        self._unit_items = None
+
+        return self._new
+
+    def _create(self, kind, args, options):
+        """(int) Draws an item for the unit being drawn, as canvas.create_<kind>(*args, **options) would"""
+        canvas = self._canvas
+        coords = _flatten(args)
+        options.setdefault('state', 'normal')
+
+        unit_items = self._unit_items
+        index = self._index
+        self._index += 1
+
+        if index < len(unit_items):
+            item = unit_items[index]
+            if item[0] == kind and item[3].keys() == options.keys():
+                _, id_, old_coords, old_options = item
+                if coords != old_coords:
+                    canvas.coords(id_, *coords)
+                    item[2] = coords
+                if options != old_options:
+                    canvas.itemconfigure(id_, **{name: value for name, value in options.items()
+                                                 if old_options.get(name) != value})
+                    item[3] = options
+                return id_
+
+            self._release([item])
+
+        free = self._free.get((kind, frozenset(options)))
+        if free:
+            id_ = free.pop()
+            canvas.coords(id_, *coords)
+            canvas.itemconfigure(id_, **options)
+            self._restack = True
+        else:
+            id_ = getattr(canvas, 'create_' + kind)(*coords, **options)
+
+        item = [kind, id_, coords, options]
+        if index < len(unit_items):
+            unit_items[index] = item
+            self._restack = True
+        else:
+            unit_items.append(item)
+        self._new = True
+
+        return id_
+
+    def _release(self, items):
+        """Hides items, making them available for reuse"""
+        for kind, id_, _, options in items:
+            self._canvas.itemconfigure(id_, state='hidden')
+            options['state'] = 'hidden'
+            self._free.setdefault((kind, frozenset(options)), []).append(id_)
+
+    def clear(self):
+        """Deletes every item"""
+        for unit_items in self._items.values():
+            for _, id_, _, _ in unit_items:
+                self._canvas.delete(id_)
+        for ids in self._free.values():
+            for id_ in ids:
+                self._canvas.delete(id_)
+
+        self._items.clear()
+        self._free.clear()
+
 
 class GameView(tk.Canvas):
     """Game view which displays the user interface for the Towers game"""
@@ -45,6 +194,27 @@ class GameView(tk.Canvas):
         self.enemy_view_class = enemy_view_class
         self.obstacle_view_class = obstacle_view_class
 
+        # items drawn for units in each layer, retained between draws
+        self._layers = {layer: RetainedCanvas(self) for layer in ('enemy', 'tower', 'obstacle')}
+
+    def _draw_layer(self, layer, units, draw):
+        """Draws units in a layer, updating the items drawn for them previously
+
+        Parameters:
+            layer (str): The tag of the layer's items
+            units (iter<Unit>): The units to draw
+            draw (callable(canvas, unit)): Draws a unit on a canvas
+        """
+        if self._layers[layer].draw(units, draw):
+            # new items are drawn on top, so restore the stacking of the layers above
+            for above in LAYERS[LAYERS.index(layer) + 1:]:
+                self.tag_raise(above)
+
+    def clear_units(self):
+        """Deletes the items drawn for all enemies, towers & obstacles"""
+        for layer in self._layers.values():
+            layer.clear()
+
     def draw_borders(self, borders, fill='old lace'):
         """
         Draws the border lines of the game view, after first removing any existing
@@ -61,40 +231,32 @@ class GameView(tk.Canvas):
 
     def draw_enemies(self, enemies):
         """
-        Draws all enemies, after first removing any existing
+        Draws all enemies, reusing the items drawn for them previously
 
         Parameters:
             enemies (list<AbstractEnemy>): A list of enemies to draw to the view.
         """
-        self.delete('enemy')
-        for enemy in enemies:
-            self.enemy_view_class.draw(self, enemy)
+        self._draw_layer('enemy', enemies, self.enemy_view_class.draw)
 
     def draw_towers(self, towers):
         """
-        Draws all towers, after first removing any existing
+        Draws all towers, reusing the items drawn for them previously
 
         Parameters:
             towers (dict{tuple(int, int), AbstractTower}):
                 Towers to draw to the view.
                 dict contains a mapping of cell position to tower.
         """
-        self.delete('tower')
-        for tower in towers.values():
-            self.tower_view_class.draw(self, tower)
-
-        self.tag_raise('shadow')
+        self._draw_layer('tower', towers.values(), self.tower_view_class.draw)
 
     def draw_obstacles(self, obstacles):
         """
-        Draws all obstacles, after first removing any existing
+        Draws all obstacles, reusing the items drawn for them previously
 
         Parameters:
             obstacles (list<Unit>): A list of obstacles to draw to the view.
         """
-        self.delete('obstacle')
-        for obstacle in obstacles:
-            self.obstacle_view_class.draw(self, obstacle)
+        self._draw_layer('obstacle', obstacles, self.obstacle_view_class.draw)
 
     def draw_path(self, coordinates):
         """